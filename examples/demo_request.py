@@ -4,23 +4,65 @@
     uv run uvicorn vision_analysis_pro.web.api.main:app --reload
 
 使用方法：
-    python examples/demo_request.py <image_path>
+    python examples/demo_request.py [<image_path> ...] [--batch-size N]
 
 示例：
     python examples/demo_request.py test_image.jpg
+    python examples/demo_request.py a.jpg b.jpg c.jpg  # 多图并发请求
+    python examples/demo_request.py a.jpg b.jpg c.jpg --batch-size 8  # 批量接口
 """
 
-import base64
+import argparse
+import asyncio
+import atexit
 import sys
+from contextlib import ExitStack
 from pathlib import Path
+from typing import Any
 
 import cv2
 import httpx
 import numpy as np
 
+try:
+    # pybase64 基于 libbase64 的 SIMD 解码器，大图可视化数据解码快数倍
+    import pybase64 as base64
+except ImportError:
+    import base64
 
-def create_test_image(output_path: str = "test_image.jpg") -> None:
-    """创建一个简单的测试图片"""
+try:
+    # orjson 直接解析响应字节，避免 stdlib json 逐字符扫描巨大的可视化字符串
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+DEFAULT_API_URL = "http://127.0.0.1:8000/api/v1/inference/image"
+DEFAULT_BATCH_API_URL = "http://127.0.0.1:8000/api/v1/inference/images"
+
+# 服务端可视化结果固定使用的 Data URI 前缀
+DATA_URI_PREFIX = "data:image/jpeg;base64,"
+
+# 分块解码的 base64 字符数（须为 4 的倍数，约对应 48 KiB 二进制数据）
+DECODE_CHUNK_CHARS = 64 * 1024
+
+# base64 文本中可能出现的空白字符（str.split() 默认去除的常见字符）
+BASE64_WHITESPACE = (" ", "\n", "\r", "\t")
+
+# 多图请求时同时在途的请求上限
+DEFAULT_CONCURRENCY = 16
+
+
+def create_test_image(output_path: str | None = None) -> bytes:
+    """创建一个简单的测试图片
+
+    图像直接在内存中编码为 JPEG，可直接上传而无需写盘再读回。
+
+    Args:
+        output_path: 可选的保存路径；为 None 时不写入磁盘
+
+    Returns:
+        JPEG 编码后的图像字节
+    """
     # 创建 640x480 的灰色图像
     img = np.zeros((480, 640, 3), dtype=np.uint8)
     img[:] = (200, 200, 200)  # 浅灰色背景
@@ -32,64 +74,292 @@ def create_test_image(output_path: str = "test_image.jpg") -> None:
     # 绘制一个圆形（模拟锈蚀区域）
     cv2.circle(img, (500, 275), 50, (100, 100, 100), -1)
 
-    # 保存图像
-    cv2.imwrite(output_path, img)
-    print(f"✅ 测试图像已创建: {output_path}")
+    # 编码为 JPEG
+    success, encoded = cv2.imencode(".jpg", img)
+    if not success:
+        raise RuntimeError("测试图像编码失败")
+    image_bytes = encoded.tobytes()
+
+    if output_path is not None:
+        Path(output_path).write_bytes(image_bytes)
+        print(f"✅ 测试图像已创建: {output_path}")
+    else:
+        print("✅ 测试图像已在内存中创建")
+
+    return image_bytes
+
+
+def create_client(timeout: float = 30.0) -> httpx.Client:
+    """创建可在多次请求间复用的 HTTP 客户端"""
+    return httpx.Client(
+        timeout=timeout,
+        transport=httpx.HTTPTransport(retries=1),
+        limits=httpx.Limits(max_keepalive_connections=4),
+    )
+
+
+# 模块级共享客户端：多次调用复用同一连接，省去重复的 DNS/TCP/TLS 握手
+_CLIENT = create_client()
+atexit.register(_CLIENT.close)
+
+
+def _status_error(response: httpx.Response) -> httpx.HTTPStatusError:
+    """构造 HTTP 状态错误（仅在失败路径调用，成功路径只做一次状态判断）"""
+    return httpx.HTTPStatusError(
+        f"HTTP {response.status_code}", request=response.request, response=response
+    )
+
+
+def _post_inference(url: str, files: Any, client: httpx.Client | None) -> dict:
+    """发送 multipart 推理请求并解析响应，失败时退出进程"""
+    try:
+        response = (client or _CLIENT).post(url, files=files)
+        if not response.is_success:
+            raise _status_error(response)
+        return json_loads(response.content)
+    except httpx.HTTPStatusError as e:
+        print(f"❌ HTTP 错误: {e.response.status_code}")
+        print(f"   详情: {e.response.text}")
+        sys.exit(1)
+    except httpx.RequestError as e:
+        print(f"❌ 请求错误: {e}")
+        print("   提示: 请确保 API 服务已启动")
+        sys.exit(1)
 
 
 def send_inference_request(
-    image_path: str,
-    api_url: str = "http://127.0.0.1:8000/api/v1/inference/image",
+    image: str | bytes,
+    api_url: str = DEFAULT_API_URL,
     visualize: bool = True,
+    client: httpx.Client | None = None,
+    filename: str = "test_image.jpg",
 ) -> dict:
     """发送推理请求到 API
 
+    传入路径时，文件以文件对象形式交给 httpx，multipart 请求体按 64 KiB
+    分块边读边发，不会先把整张图像读入内存；传入字节时直接上传。
+
+    Args:
+        image: 图像文件路径，或已编码的图像字节
+        api_url: API 端点 URL
+        visualize: 是否返回可视化结果
+        client: 可选的客户端；默认使用模块级共享客户端
+        filename: 上传字节时使用的文件名
+
+    Returns:
+        API 响应的 JSON 数据
+    """
+    url = f"{api_url}?visualize={str(visualize).lower()}"
+
+    if isinstance(image, bytes):
+        print(f"\n📤 发送推理请求: {filename}（内存图像）")
+        files = {"file": (filename, image, "image/jpeg")}
+        return _post_inference(url, files, client)
+
+    print(f"\n📤 发送推理请求: {image}")
+    with open(image, "rb") as f:
+        files = {"file": (Path(image).name, f, "image/jpeg")}
+        return _post_inference(url, files, client)
+
+
+def send_inference_batch(
+    image_paths: list[str],
+    api_url: str = DEFAULT_BATCH_API_URL,
+    visualize: bool = True,
+    client: httpx.Client | None = None,
+) -> list[dict]:
+    """在一个 multipart 请求中批量上传多张图像
+
+    多个文件共用一次请求往返，由批量推理接口逐文件返回结果。
+
     Args:
+        image_paths: 图像文件路径列表
+        api_url: 批量推理 API 端点 URL
+        visualize: 是否返回可视化结果
+        client: 可选的客户端；默认使用模块级共享客户端
+
+    Returns:
+        与 image_paths 顺序一致的逐文件响应数据
+    """
+    print(f"\n📤 发送批量推理请求: {len(image_paths)} 个文件")
+    url = f"{api_url}?visualize={str(visualize).lower()}"
+
+    with ExitStack() as stack:
+        files = [
+            (
+                "files",
+                (Path(path).name, stack.enter_context(open(path, "rb")), "image/jpeg"),
+            )
+            for path in image_paths
+        ]
+        data = _post_inference(url, files, client)
+
+    return data["files"]
+
+
+async def send_inference_request_async(
+    client: httpx.AsyncClient,
+    image_path: str,
+    api_url: str = DEFAULT_API_URL,
+    visualize: bool = True,
+) -> dict:
+    """异步发送单个推理请求
+
+    Args:
+        client: 共享的异步 HTTP 客户端
         image_path: 图像文件路径
         api_url: API 端点 URL
         visualize: 是否返回可视化结果
 
     Returns:
         API 响应的 JSON 数据
+
+    Raises:
+        httpx.HTTPStatusError: 服务端返回错误状态码
+        httpx.RequestError: 网络请求失败
     """
-    print(f"\n📤 发送推理请求: {image_path}")
+    image_bytes = await asyncio.to_thread(Path(image_path).read_bytes)
+    files = {"file": (Path(image_path).name, image_bytes, "image/jpeg")}
+    response = await client.post(
+        api_url, params={"visualize": str(visualize).lower()}, files=files
+    )
+    if not response.is_success:
+        raise _status_error(response)
+    return json_loads(response.content)
+
+
+def fetch_inference_with_visualization(
+    image: str | bytes,
+    api_url: str = DEFAULT_API_URL,
+    filename: str = "test_image.jpg",
+    client: httpx.Client | None = None,
+) -> tuple[dict, str | bytes | None]:
+    """一次请求同时获取检测结果与二进制可视化图像
+
+    以 ``format=binary`` 请求，响应体直接是 JPEG 字节，避免 base64 膨胀与解码；
+    检测结果从 ``X-Inference-Result`` 响应头解析。若服务端返回 JSON（不支持
+    ``format=binary``，或检测结果超出响应头上限），回退为其中的 Data URI；仅当旧版服务端未返回该响应头时，
+    才补发一次 ``visualize=false`` 请求获取 JSON。
 
-    with open(image_path, "rb") as f:
-        files = {"file": (Path(image_path).name, f, "image/jpeg")}
-        url = f"{api_url}?visualize={str(visualize).lower()}"
+    Args:
+        image: 图像文件路径，或已编码的图像字节
+        api_url: API 端点 URL
+        filename: 上传字节时使用的文件名
+        client: 可选的客户端；默认使用模块级共享客户端
 
-        try:
-            response = httpx.post(url, files=files, timeout=30.0)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            print(f"❌ HTTP 错误: {e.response.status_code}")
-            print(f"   详情: {e.response.text}")
-            sys.exit(1)
-        except httpx.RequestError as e:
-            print(f"❌ 请求错误: {e}")
-            print("   提示: 请确保 API 服务已启动")
-            sys.exit(1)
+    Returns:
+        (检测结果 JSON, 可视化 JPEG 字节或 Data URI；无检测结果时为 None)
+
+    Raises:
+        httpx.HTTPStatusError: 服务端返回错误状态码
+        httpx.RequestError: 网络请求失败
+    """
+    if isinstance(image, str):
+        filename = Path(image).name
+        image = Path(image).read_bytes()
+    files = {"file": (filename, image, "image/jpeg")}
+    client = client or _CLIENT
+
+    response = client.post(
+        api_url, params={"visualize": "true", "format": "binary"}, files=files
+    )
+    if not response.is_success:
+        raise _status_error(response)
+
+    if not response.headers.get("content-type", "").startswith("image/"):
+        data = json_loads(response.content)
+        return data, data.get("visualization")
+
+    header = response.headers.get("X-Inference-Result")
+    if header is not None:
+        data = json_loads(header)
+    else:
+        json_response = client.post(api_url, params={"visualize": "false"}, files=files)
+        if not json_response.is_success:
+            raise _status_error(json_response)
+        data = json_loads(json_response.content)
+    if not data["detections"]:
+        return data, None
+    return data, response.content
+
+
+async def send_inference_requests(
+    image_paths: list[str],
+    api_url: str = DEFAULT_API_URL,
+    visualize: bool = True,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: float = 30.0,
+) -> list[dict | None]:
+    """并发发送多个推理请求
+
+    所有请求共享同一个连接池，并用信号量限制同时在途的请求数。
+
+    Args:
+        image_paths: 图像文件路径列表
+        api_url: API 端点 URL
+        visualize: 是否返回可视化结果
+        concurrency: 最大并发请求数
+        timeout: 单个请求超时时间（秒）
+
+    Returns:
+        与 image_paths 一一对应的响应数据，失败的请求为 None
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+
+        async def _bounded(image_path: str) -> dict | None:
+            async with semaphore:
+                print(f"\n📤 发送推理请求: {image_path}")
+                try:
+                    return await send_inference_request_async(
+                        client, image_path, api_url, visualize
+                    )
+                except httpx.HTTPStatusError as e:
+                    print(f"❌ {image_path} HTTP 错误: {e.response.status_code}")
+                except httpx.RequestError as e:
+                    print(f"❌ {image_path} 请求错误: {e}")
+                return None
+
+        return await asyncio.gather(*(_bounded(path) for path in image_paths))
 
 
 def save_visualization(
-    base64_data_uri: str, output_path: str = "output_visualization.jpg"
+    visualization: str | bytes, output_path: str = "output_visualization.jpg"
 ) -> None:
-    """从 base64 Data URI 保存可视化图像
+    """保存可视化图像
 
     Args:
-        base64_data_uri: base64 编码的 Data URI（如 "data:image/jpeg;base64,..."）
+        visualization: JPEG 原始字节（format=binary 响应），
+            或 base64 编码的 Data URI（如 "data:image/jpeg;base64,..."）
         output_path: 输出文件路径
     """
-    # 提取 base64 数据部分
-    if "base64," in base64_data_uri:
-        base64_data = base64_data_uri.split("base64,")[1]
+    if isinstance(visualization, bytes):
+        Path(output_path).write_bytes(visualization)
+        print(f"✅ 可视化图像已保存: {output_path}")
+        return
+
+    base64_data_uri = visualization
+    # 定位 base64 数据部分，不复制整段字符串；常见前缀只需比较开头几个字符
+    if base64_data_uri.startswith(DATA_URI_PREFIX):
+        start = len(DATA_URI_PREFIX)
     else:
-        base64_data = base64_data_uri
-
-    # 解码并保存
-    img_bytes = base64.b64decode(base64_data)
-    Path(output_path).write_bytes(img_bytes)
+        marker = base64_data_uri.find("base64,")
+        start = marker + 7 if marker >= 0 else 0
+
+    # 分块边界需对齐到 4 个有效 base64 字符：含换行等空白（如 MIME 折行）时先整体去除，
+    # 服务端输出不含空白，常见路径不产生额外拷贝
+    if any(ws in base64_data_uri for ws in BASE64_WHITESPACE):
+        base64_data_uri = "".join(base64_data_uri[start:].split())
+        start = 0
+
+    # 分块解码并直接写入文件，峰值内存仅为单个分块大小；
+    # 严格校验字符集，非法字符直接报错而不是静默错位解码
+    with open(output_path, "wb") as f:
+        for offset in range(start, len(base64_data_uri), DECODE_CHUNK_CHARS):
+            chunk = base64_data_uri[offset : offset + DECODE_CHUNK_CHARS]
+            f.write(base64.b64decode(chunk, validate=True))
     print(f"✅ 可视化图像已保存: {output_path}")
 
 
@@ -108,38 +378,88 @@ def print_detection_results(data: dict) -> None:
         )
 
 
+def parse_args() -> argparse.Namespace:
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="Vision Analysis Pro 推理 API 演示")
+    parser.add_argument(
+        "images",
+        nargs="*",
+        help="图像文件路径；不提供时在内存中生成测试图像",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=0,
+        help="每个批量请求包含的图像数；0 表示逐张并发请求（默认: 0）",
+    )
+    return parser.parse_args()
+
+
 def main() -> None:
     """主函数"""
+    args = parse_args()
+
     print("=" * 60)
     print("  Vision Analysis Pro - Demo 演示脚本")
     print("=" * 60)
 
-    # 获取图像路径
-    if len(sys.argv) > 1:
-        image_path = sys.argv[1]
-    else:
-        # 如果没有提供路径，创建测试图像
-        image_path = "test_image.jpg"
-        if not Path(image_path).exists():
-            create_test_image(image_path)
+    # 获取图像路径；未提供时在内存中生成测试图像直接上传
+    image_paths: list[str] = args.images
 
     # 验证文件存在
-    if not Path(image_path).exists():
-        print(f"❌ 错误: 文件不存在: {image_path}")
-        print("\n使用方法: python examples/demo_request.py <image_path>")
-        sys.exit(1)
-
-    # 发送推理请求（带可视化）
-    data = send_inference_request(image_path, visualize=True)
-
-    # 打印检测结果
-    print_detection_results(data)
+    for image_path in image_paths:
+        if not Path(image_path).exists():
+            print(f"❌ 错误: 文件不存在: {image_path}")
+            print("\n使用方法: python examples/demo_request.py <image_path> ...")
+            sys.exit(1)
 
-    # 保存可视化图像
-    if data.get("visualization"):
-        save_visualization(data["visualization"], "output_visualization.jpg")
+    # 发送推理请求（带可视化）；单图时一次请求获取检测结果与二进制可视化，
+    # 多图时批量或并发发送
+    if len(image_paths) <= 1:
+        image = image_paths[0] if image_paths else create_test_image()
+        print(f"\n📤 发送推理请求: {image_paths[0] if image_paths else '内存测试图像'}")
+        try:
+            results = [fetch_inference_with_visualization(image)]
+        except httpx.HTTPStatusError as e:
+            print(f"❌ HTTP 错误: {e.response.status_code}")
+            print(f"   详情: {e.response.text}")
+            sys.exit(1)
+        except httpx.RequestError as e:
+            print(f"❌ 请求错误: {e}")
+            print("   提示: 请确保 API 服务已启动")
+            sys.exit(1)
+        output_paths = ["output_visualization.jpg"]
     else:
-        print("\n⚠️  未返回可视化数据（可能检测结果为空）")
+        if args.batch_size > 0:
+            responses: list[dict | None] = []
+            for start in range(0, len(image_paths), args.batch_size):
+                batch = image_paths[start : start + args.batch_size]
+                responses.extend(send_inference_batch(batch, visualize=True))
+        else:
+            responses = asyncio.run(
+                send_inference_requests(image_paths, visualize=True)
+            )
+        results = [
+            (data, data.get("visualization")) if data is not None else None
+            for data in responses
+        ]
+        output_paths = [
+            f"output_visualization_{Path(path).stem}.jpg" for path in image_paths
+        ]
+
+    for result, output_path in zip(results, output_paths, strict=True):
+        if result is None:
+            continue
+        data, visualization = result
+
+        # 打印检测结果
+        print_detection_results(data)
+
+        # 保存可视化图像
+        if visualization:
+            save_visualization(visualization, output_path)
+        else:
+            print("\n⚠️  未返回可视化数据（可能检测结果为空）")
 
     print("\n" + "=" * 60)
     print("✨ Demo 完成！")
@@ -18,7 +18,8 @@
 
 import argparse
 import gc
-import statistics
+import os
+import sys
 import time
 from pathlib import Path
 from typing import Any
@@ -128,6 +129,28 @@ def parse_args() -> argparse.Namespace:
         help="输出报告文件路径（可选）",
     )
 
+    parser.add_argument(
+        "--pre-resize",
+        action="store_true",
+        help="计时前将测试图像预先 letterbox 到 --imgsz，"
+        "使结果更接近纯推理耗时（默认测量含预处理的端到端耗时）",
+    )
+
+    parser.add_argument(
+        "--pin-cpu",
+        type=int,
+        default=None,
+        help="将进程绑定到指定 CPU 核心以减少调度迁移带来的抖动"
+        "（仅 Linux；会让结果偏向单核性能，默认不绑定）",
+    )
+
+    parser.add_argument(
+        "--realtime",
+        action="store_true",
+        help="尝试使用 SCHED_FIFO 实时调度以减少抢占"
+        "（仅 Linux，需要 CAP_SYS_NICE；失败时保持默认调度）",
+    )
+
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -137,6 +160,36 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def pin_process(cpu: int | None, realtime: bool = False) -> set[int] | None:
+    """绑定 CPU 核心并可选切换实时调度
+
+    Args:
+        cpu: 要绑定的 CPU 编号，None 表示不绑定
+        realtime: 是否尝试 SCHED_FIFO 实时调度
+
+    Returns:
+        当前进程的 CPU 亲和性集合；平台不支持时返回 None
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        if cpu is not None or realtime:
+            print("  ⚠️  当前平台不支持 CPU 绑定/实时调度，已忽略")
+        return None
+
+    if cpu is not None:
+        try:
+            os.sched_setaffinity(0, {cpu})
+        except OSError as e:
+            print(f"  ⚠️  绑定 CPU {cpu} 失败: {e}")
+
+    if realtime:
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(50))
+        except (OSError, AttributeError) as e:
+            print(f"  ⚠️  切换 SCHED_FIFO 失败，保持默认调度: {e}")
+
+    return os.sched_getaffinity(0)
+
+
 def create_synthetic_image(height: int = 480, width: int = 640) -> np.ndarray:
     """创建合成测试图像
 
@@ -158,23 +211,6 @@ def create_synthetic_image(height: int = 480, width: int = 640) -> np.ndarray:
     return img
 
 
-def percentile(data: list[float], p: float) -> float:
-    """计算百分位数
-
-    Args:
-        data: 数据列表
-        p: 百分位（0-100）
-
-    Returns:
-        百分位值
-    """
-    sorted_data = sorted(data)
-    k = (len(sorted_data) - 1) * p / 100
-    f = int(k)
-    c = f + 1 if f + 1 < len(sorted_data) else f
-    return sorted_data[f] + (k - f) * (sorted_data[c] - sorted_data[f])
-
-
 def benchmark_engine(
     engine: Any,
     image: np.ndarray,
@@ -198,7 +234,12 @@ def benchmark_engine(
     Returns:
         性能指标字典
     """
-    latencies: list[float] = []
+    latencies_ns = np.empty(iterations, dtype=np.int64)
+
+    # 确保输入为 C 连续缓冲区，并在计时前读遍所有内存页，
+    # 避免首轮迭代承担缺页开销而拉高尾延迟
+    image = np.ascontiguousarray(image)
+    image.sum()
 
     # 预热
     if verbose:
@@ -210,52 +251,85 @@ def benchmark_engine(
     if verbose:
         print("完成")
 
-    # 强制垃圾回收
+    # 强制垃圾回收，并冻结预热后仍存活的对象（模型权重等），
+    # 使其不再参与后续分代回收
     gc.collect()
+    gc.freeze()
 
     # 正式测试
     if verbose:
         print(f"  测试中 ({iterations} 次)...", end=" ", flush=True)
 
-    for i in range(iterations):
-        start = time.perf_counter()
-        detections = engine.predict(image, conf=conf, iou=iou)
-        end = time.perf_counter()
+    # 测量期间关闭循环垃圾回收，避免回收停顿随机落入某次迭代
+    gc.disable()
+    try:
+        for i in range(iterations):
+            start = time.perf_counter_ns()
+            detections = engine.predict(image, conf=conf, iou=iou)
+            end = time.perf_counter_ns()
 
-        latency_ms = (end - start) * 1000
-        latencies.append(latency_ms)
+            latencies_ns[i] = end - start
 
-        if verbose and (i + 1) % 10 == 0:
-            print(f"{i + 1}", end=" ", flush=True)
+            if verbose and (i + 1) % 10 == 0:
+                print(f"{i + 1}", end=" ", flush=True)
+    finally:
+        gc.enable()
+        gc.unfreeze()
 
     if verbose:
         print("完成")
 
-    # 计算统计指标
-    avg_latency = statistics.mean(latencies)
-    std_latency = statistics.stdev(latencies) if len(latencies) > 1 else 0
-    min_latency = min(latencies)
-    max_latency = max(latencies)
-    p50 = percentile(latencies, 50)
-    p95 = percentile(latencies, 95)
-    p99 = percentile(latencies, 99)
-    fps = 1000 / avg_latency if avg_latency > 0 else 0
+    # 计时全程保持整数纳秒，统计前一次性换算为毫秒
+    latencies = latencies_ns.astype(np.float64) * 1e-6
+
+    stats = summarize_latencies(latencies)
 
     return {
         "iterations": iterations,
+        **stats,
+        "num_detections": len(detections),
+        "latencies": latencies.tolist(),
+    }
+
+
+def summarize_latencies(latencies: np.ndarray) -> dict[str, float]:
+    """用 numpy 向量化归约计算延迟统计指标
+
+    Args:
+        latencies: 延迟数组（毫秒）
+
+    Returns:
+        平均值、标准差、极值、分位数与吞吐量
+    """
+    n = latencies.size
+    avg_latency = float(latencies.mean())
+    # 复用已算出的均值求样本方差，避免 std() 内部再次求均值；
+    # 点积在 BLAS 中完成平方与求和，且比 sum(x²)-n·mean² 数值上更稳定
+    if n > 1:
+        dev = latencies - avg_latency
+        std_latency = float(np.sqrt(dev @ dev / (n - 1)))
+    else:
+        std_latency = 0.0
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]).tolist()
+
+    return {
         "avg_latency_ms": avg_latency,
         "std_latency_ms": std_latency,
-        "min_latency_ms": min_latency,
-        "max_latency_ms": max_latency,
+        "min_latency_ms": float(latencies.min()),
+        "max_latency_ms": float(latencies.max()),
         "p50_latency_ms": p50,
         "p95_latency_ms": p95,
         "p99_latency_ms": p99,
-        "fps": fps,
-        "num_detections": len(detections),
-        "latencies": latencies,
+        "fps": 1000 / avg_latency if avg_latency > 0 else 0.0,
     }
 
 
+def write_lines(lines: list[str]) -> None:
+    """一次性写出多行文本，避免逐行 print 带来的多次写调用"""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
 def print_results(name: str, results: dict[str, Any]) -> None:
     """打印测试结果
 
@@ -263,17 +337,21 @@ def print_results(name: str, results: dict[str, Any]) -> None:
         name: 引擎名称
         results: 测试结果字典
     """
-    print(f"\n  📊 {name} 性能指标:")
-    print(f"     迭代次数:     {results['iterations']}")
-    print(f"     平均延迟:     {results['avg_latency_ms']:.2f} ms")
-    print(f"     标准差:       {results['std_latency_ms']:.2f} ms")
-    print(f"     最小延迟:     {results['min_latency_ms']:.2f} ms")
-    print(f"     最大延迟:     {results['max_latency_ms']:.2f} ms")
-    print(f"     P50 延迟:     {results['p50_latency_ms']:.2f} ms")
-    print(f"     P95 延迟:     {results['p95_latency_ms']:.2f} ms")
-    print(f"     P99 延迟:     {results['p99_latency_ms']:.2f} ms")
-    print(f"     吞吐量:       {results['fps']:.2f} FPS")
-    print(f"     检测数量:     {results['num_detections']}")
+    write_lines(
+        [
+            f"\n  📊 {name} 性能指标:",
+            f"     迭代次数:     {results['iterations']}",
+            f"     平均延迟:     {results['avg_latency_ms']:.2f} ms",
+            f"     标准差:       {results['std_latency_ms']:.2f} ms",
+            f"     最小延迟:     {results['min_latency_ms']:.2f} ms",
+            f"     最大延迟:     {results['max_latency_ms']:.2f} ms",
+            f"     P50 延迟:     {results['p50_latency_ms']:.2f} ms",
+            f"     P95 延迟:     {results['p95_latency_ms']:.2f} ms",
+            f"     P99 延迟:     {results['p99_latency_ms']:.2f} ms",
+            f"     吞吐量:       {results['fps']:.2f} FPS",
+            f"     检测数量:     {results['num_detections']}",
+        ]
+    )
 
 
 def print_comparison(
@@ -285,39 +363,35 @@ def print_comparison(
         yolo_results: YOLO 测试结果
         onnx_results: ONNX 测试结果
     """
-    print("\n" + "=" * 60)
-    print("📈 性能对比")
-    print("=" * 60)
-
     speedup = yolo_results["avg_latency_ms"] / onnx_results["avg_latency_ms"]
     fps_diff = onnx_results["fps"] - yolo_results["fps"]
 
-    print(f"\n  {'指标':<20} {'YOLO':>12} {'ONNX':>12} {'差异':>12}")
-    print(f"  {'-' * 56}")
-    print(
+    lines = [
+        "\n" + "=" * 60,
+        "📈 性能对比",
+        "=" * 60,
+        f"\n  {'指标':<20} {'YOLO':>12} {'ONNX':>12} {'差异':>12}",
+        f"  {'-' * 56}",
         f"  {'平均延迟 (ms)':<20} {yolo_results['avg_latency_ms']:>12.2f} "
         f"{onnx_results['avg_latency_ms']:>12.2f} "
-        f"{speedup:>11.2f}x"
-    )
-    print(
+        f"{speedup:>11.2f}x",
         f"  {'P95 延迟 (ms)':<20} {yolo_results['p95_latency_ms']:>12.2f} "
         f"{onnx_results['p95_latency_ms']:>12.2f} "
-        f"{yolo_results['p95_latency_ms'] / onnx_results['p95_latency_ms']:>11.2f}x"
-    )
-    print(
+        f"{yolo_results['p95_latency_ms'] / onnx_results['p95_latency_ms']:>11.2f}x",
         f"  {'吞吐量 (FPS)':<20} {yolo_results['fps']:>12.2f} "
         f"{onnx_results['fps']:>12.2f} "
-        f"{'+' if fps_diff > 0 else ''}{fps_diff:>10.2f}"
-    )
-
-    print(f"\n  🏆 ONNX 相对 YOLO 加速比: {speedup:.2f}x")
+        f"{'+' if fps_diff > 0 else ''}{fps_diff:>10.2f}",
+        f"\n  🏆 ONNX 相对 YOLO 加速比: {speedup:.2f}x",
+    ]
 
     if speedup > 1:
-        print(f"     ONNX 更快 {(speedup - 1) * 100:.1f}%")
+        lines.append(f"     ONNX 更快 {(speedup - 1) * 100:.1f}%")
     elif speedup < 1:
-        print(f"     YOLO 更快 {(1 - speedup) * 100:.1f}%")
+        lines.append(f"     YOLO 更快 {(1 - speedup) * 100:.1f}%")
     else:
-        print("     性能相当")
+        lines.append("     性能相当")
+
+    write_lines(lines)
 
 
 def save_report(
@@ -341,7 +415,13 @@ def save_report(
         f.write(f"- 迭代次数: {args.iterations}\n")
         f.write(f"- 预热次数: {args.warmup}\n")
         f.write(f"- 置信度阈值: {args.conf}\n")
-        f.write(f"- IoU 阈值: {args.iou}\n\n")
+        f.write(f"- IoU 阈值: {args.iou}\n")
+        f.write(f"- 测试模式: {'纯推理（预缩放）' if args.pre_resize else '端到端'}\n")
+        if args.pin_cpu is not None:
+            f.write(f"- CPU 绑定: {args.pin_cpu}\n")
+        if args.realtime:
+            f.write("- 调度策略: SCHED_FIFO\n")
+        f.write("\n")
 
         f.write("## 测试结果\n\n")
         f.write("| 引擎 | 平均延迟 (ms) | P95 (ms) | P99 (ms) | FPS |\n")
@@ -368,18 +448,27 @@ def main() -> None:
     """主函数"""
     args = parse_args()
 
-    print("=" * 60)
-    print("🚀 推理引擎性能基准测试")
-    print("=" * 60)
-
     # 打印配置
-    print("\n📋 测试配置:")
-    print(f"  测试引擎:   {args.engine}")
-    print(f"  图像尺寸:   {args.imgsz}")
-    print(f"  迭代次数:   {args.iterations}")
-    print(f"  预热次数:   {args.warmup}")
-    print(f"  置信度:     {args.conf}")
-    print(f"  IoU 阈值:   {args.iou}")
+    write_lines(
+        [
+            "=" * 60,
+            "🚀 推理引擎性能基准测试",
+            "=" * 60,
+            "\n📋 测试配置:",
+            f"  测试引擎:   {args.engine}",
+            f"  图像尺寸:   {args.imgsz}",
+            f"  迭代次数:   {args.iterations}",
+            f"  预热次数:   {args.warmup}",
+            f"  置信度:     {args.conf}",
+            f"  IoU 阈值:   {args.iou}",
+        ]
+    )
+
+    # 绑定 CPU / 实时调度（可选）
+    if args.pin_cpu is not None or args.realtime:
+        affinity = pin_process(args.pin_cpu, args.realtime)
+        if affinity is not None:
+            print(f"  CPU 亲和性: {sorted(affinity)}")
 
     # 加载或创建测试图像
     if args.image:
@@ -387,7 +476,12 @@ def main() -> None:
         if not image_path.exists():
             print(f"\n❌ 图像文件不存在: {args.image}")
             return
-        image = cv2.imread(str(image_path))
+        # 一次性读入整个文件再解码，避免 imread 经 stdio 小块读取
+        buf = np.fromfile(str(image_path), dtype=np.uint8)
+        image = cv2.imdecode(buf, cv2.IMREAD_COLOR)
+        if image is None:
+            print(f"\n❌ 无法解码图像: {args.image}")
+            return
         print(f"  测试图像:   {args.image} ({image.shape[1]}x{image.shape[0]})")
     else:
         h = args.imgsz[0] if len(args.imgsz) == 1 else args.imgsz[0]
@@ -395,6 +489,16 @@ def main() -> None:
         image = create_synthetic_image(h, w)
         print(f"  测试图像:   合成图像 ({w}x{h})")
 
+    # 预先缩放到模型输入尺寸，引擎内部的缩放退化为近似空操作
+    if args.pre_resize:
+        from vision_analysis_pro.core.preprocessing import ImageTransform
+
+        image, _ = ImageTransform.resize_with_padding(image, args.imgsz[0])
+        image = np.ascontiguousarray(image)
+        print(f"  测试模式:   纯推理（已预缩放至 {args.imgsz[0]}x{args.imgsz[0]}）")
+    else:
+        print("  测试模式:   端到端（含引擎内预处理）")
+
     results: dict[str, dict[str, Any]] = {}
 
     # 测试 YOLO 引擎
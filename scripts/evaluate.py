@@ -10,8 +10,6 @@
 import argparse
 from pathlib import Path
 
-from ultralytics import YOLO
-
 
 def parse_args() -> argparse.Namespace:
     """解析命令行参数"""
@@ -135,6 +133,10 @@ def main() -> None:
     print("🔍 开始评估...")
     print("=" * 60 + "\n")
 
+    # 延迟导入 ultralytics（会连带加载 torch 等重量级依赖），
+    # 使 --help 与参数/文件校验失败时可以立即返回
+    from ultralytics import YOLO
+
     # 加载模型
     model = YOLO(args.model)
 
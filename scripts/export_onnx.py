@@ -6,15 +6,49 @@
     python scripts/export_onnx.py
     python scripts/export_onnx.py --model runs/train/exp/weights/best.pt --output models/best.onnx
     python scripts/export_onnx.py --model yolov8n.pt --simplify --half
+    python scripts/export_onnx.py --int8 --calib-dir data/images/val
 
 导出后可使用 ONNX Runtime 进行推理。
 """
 
 import argparse
+import functools
+import json
+from collections.abc import Iterator
 from pathlib import Path
+from typing import Any
 
+import cv2
+import numpy as np
 from ultralytics import YOLO
 
+from vision_analysis_pro.core.inference.base import configure_kernel_caches
+from vision_analysis_pro.core.inference.onnx_engine import optimized_model_path
+
+# INT8 校准默认使用的图像目录与数量
+DEFAULT_CALIB_DIR = "data/images/val"
+DEFAULT_CALIB_SIZE = 100
+CALIB_SUFFIXES = {".jpg", ".jpeg", ".png"}
+
+# ONNX Runtime 版本 -> (支持的最高 opset, 支持的最高 IR 版本)
+# 参考 https://onnxruntime.ai/docs/reference/compatibility.html
+ORT_COMPAT: dict[tuple[int, int], tuple[int, int]] = {
+    (1, 20): (21, 10),
+    (1, 19): (21, 10),
+    (1, 18): (21, 10),
+    (1, 17): (20, 9),
+    (1, 16): (19, 9),
+    (1, 15): (19, 9),
+    (1, 14): (18, 8),
+    (1, 13): (17, 8),
+}
+
+# 支持的导出格式（Ultralytics format 名称）
+SUPPORTED_FORMATS = ("onnx", "engine", "openvino")
+
+# Ultralytics 动态导出时输入张量的符号维度名（NCHW 中的 N、H、W）
+FREE_DIM_NAMES = ("batch", "height", "width")
+
 
 def parse_args() -> argparse.Namespace:
     """解析命令行参数"""
@@ -34,6 +68,15 @@ def parse_args() -> argparse.Namespace:
 
   # 导出 FP16 半精度模型（需要 GPU）
   python scripts/export_onnx.py --half
+
+  # 同一进程内导出 ONNX、TensorRT engine 与 OpenVINO IR
+  python scripts/export_onnx.py --formats onnx,engine,openvino --device 0
+
+  # 导出 INT8 静态量化模型（使用验证集图像校准）
+  python scripts/export_onnx.py --int8 --calib-dir data/images/val
+
+  # 将预处理融合进模型图（GPU 部署时由执行提供者完成归一化与转置）
+  python scripts/export_onnx.py --embed-preprocess --device 0
         """,
     )
 
@@ -52,6 +95,13 @@ def parse_args() -> argparse.Namespace:
         help="输出 ONNX 模型路径（默认与输入同目录同名）",
     )
 
+    parser.add_argument(
+        "--formats",
+        type=str,
+        default="onnx",
+        help=f"逗号分隔的导出格式，可选 {','.join(SUPPORTED_FORMATS)}（默认 onnx）",
+    )
+
     # 导出参数
     parser.add_argument(
         "--imgsz",
@@ -74,12 +124,47 @@ def parse_args() -> argparse.Namespace:
         help="启用动态输入尺寸（batch, height, width）",
     )
 
+    parser.add_argument(
+        "--tile-size",
+        type=int,
+        nargs="+",
+        default=None,
+        help="动态导出时部署使用的固定工作尺寸，单值或 [height, width]；"
+        "写入预优化模型与 .shape.json",
+    )
+
     parser.add_argument(
         "--half",
         action="store_true",
         help="导出 FP16 半精度模型（需要 GPU 支持）",
     )
 
+    parser.add_argument(
+        "--int8",
+        action="store_true",
+        help="额外生成 INT8 静态量化模型（需安装 onnxruntime，忽略 --half）",
+    )
+
+    parser.add_argument(
+        "--embed-preprocess",
+        action="store_true",
+        help="将 BGR->RGB、归一化与 HWC->CHW 写入模型图，输入改为 NHWC uint8",
+    )
+
+    parser.add_argument(
+        "--calib-dir",
+        type=str,
+        default=DEFAULT_CALIB_DIR,
+        help=f"INT8 校准图像目录（默认 {DEFAULT_CALIB_DIR}）",
+    )
+
+    parser.add_argument(
+        "--calib-size",
+        type=int,
+        default=DEFAULT_CALIB_SIZE,
+        help=f"INT8 校准使用的图像数量（默认 {DEFAULT_CALIB_SIZE}）",
+    )
+
     parser.add_argument(
         "--simplify",
         action="store_true",
@@ -93,6 +178,13 @@ def parse_args() -> argparse.Namespace:
         help="ONNX opset 版本（默认 17）",
     )
 
+    parser.add_argument(
+        "--ir-version",
+        type=int,
+        default=None,
+        help="限制导出模型的 ONNX IR 版本（默认按已安装 onnxruntime 自动限制）",
+    )
+
     # 设备配置
     parser.add_argument(
         "--device",
@@ -101,6 +193,12 @@ def parse_args() -> argparse.Namespace:
         help="导出设备 (cpu, 0, cuda:0 等)",
     )
 
+    parser.add_argument(
+        "--no-optimize",
+        action="store_true",
+        help="跳过生成 ONNX Runtime 预优化模型 (.opt.onnx)",
+    )
+
     # 验证配置
     parser.add_argument(
         "--no-verify",
@@ -111,6 +209,194 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+@functools.lru_cache(maxsize=4)
+def _load_yolo(model_path: str, mtime_ns: int) -> YOLO:
+    """加载 YOLO 模型并在进程内缓存
+
+    以绝对路径 + 修改时间为键，同一进程内重复导出（如依次导出 FP32/FP16/INT8）
+    时复用已加载的模型，权重文件更新后自动重新加载。Ultralytics 导出时会
+    深拷贝模型，缓存的实例不会被导出过程修改。
+
+    加载后立即融合 Conv+BN：每次导出深拷贝的都是已融合的模型，
+    Exporter 内部的 fuse() 检测到已融合后直接跳过，多格式导出只融合一次。
+
+    Args:
+        model_path: 模型绝对路径
+        mtime_ns: 模型文件修改时间（纳秒），仅参与缓存键
+
+    Returns:
+        YOLO 模型实例
+    """
+    model = YOLO(model_path)
+    model.fuse()
+    return model
+
+
+def resolve_onnx_versions(
+    opset: int, ir_version: int | None = None
+) -> tuple[int, int | None]:
+    """按已安装的 onnxruntime 版本限制 opset 与 IR 版本
+
+    新版 onnx 默认写出的 opset/IR 版本可能高于部署端 onnxruntime 的支持范围，
+    导致模型无法加载。此处取两者交集，未安装或版本不在表内时不做限制。
+
+    Args:
+        opset: 请求的 opset 版本
+        ir_version: 请求的 IR 版本，None 则仅按 onnxruntime 限制
+
+    Returns:
+        (实际使用的 opset, 目标 IR 版本或 None)
+    """
+    try:
+        import onnxruntime as ort
+    except ImportError:
+        return opset, ir_version
+
+    major, minor = (int(part) for part in ort.__version__.split(".")[:2])
+    limits = ORT_COMPAT.get((major, minor))
+    if limits is None:
+        return opset, ir_version
+
+    max_opset, max_ir = limits
+    if opset > max_opset:
+        print(
+            f"⚠️  onnxruntime {ort.__version__} 最高支持 opset {max_opset}，"
+            f"已将 opset 从 {opset} 调整为 {max_opset}"
+        )
+        opset = max_opset
+    if ir_version is None or ir_version > max_ir:
+        ir_version = max_ir
+    return opset, ir_version
+
+
+def pin_ir_version(onnx_path: Path, ir_version: int) -> None:
+    """将模型的 IR 版本降至目标版本（已不高于目标时不修改文件）
+
+    Args:
+        onnx_path: ONNX 模型路径
+        ir_version: 目标 IR 版本
+    """
+    import onnx
+
+    model = onnx.load(str(onnx_path))
+    if model.ir_version <= ir_version:
+        return
+
+    print(f"⚠️  IR 版本从 {model.ir_version} 调整为 {ir_version}")
+    model.ir_version = ir_version
+    onnx.save(model, str(onnx_path))
+
+
+def _fold_channel_flip(graph: Any, input_name: str) -> bool:
+    """将 BGR->RGB 通道翻转折叠进首个卷积的权重
+
+    输入只被一个常量权重、group=1 的 Conv 使用时，把权重的输入通道轴逆序，
+    模型即可直接接收 BGR 输入，推理时不再需要单独的通道翻转算子。
+
+    Args:
+        graph: ONNX 计算图（原地修改）
+        input_name: 模型输入张量名
+
+    Returns:
+        是否完成折叠；不满足条件时图保持不变
+    """
+    from onnx import numpy_helper
+
+    consumers = [node for node in graph.node if input_name in node.input]
+    if len(consumers) != 1 or consumers[0].op_type != "Conv":
+        return False
+    conv = consumers[0]
+    if conv.input[0] != input_name or any(
+        attr.name == "group" and attr.i != 1 for attr in conv.attribute
+    ):
+        return False
+
+    # 权重须为常量且不被其他节点共享
+    weight_name = conv.input[1]
+    weight = next((i for i in graph.initializer if i.name == weight_name), None)
+    if weight is None or sum(weight_name in n.input for n in graph.node) != 1:
+        return False
+
+    array = numpy_helper.to_array(weight)
+    if array.ndim != 4 or array.shape[1] != 3:
+        return False
+    weight.CopyFrom(
+        numpy_helper.from_array(np.ascontiguousarray(array[:, ::-1]), weight_name)
+    )
+    return True
+
+
+def embed_preprocess(onnx_path: Path) -> None:
+    """将输入预处理写入模型图（原地修改）
+
+    原输入 (N, 3, H, W) 浮点张量替换为 letterbox 后的 (N, H, W, 3) uint8 BGR 图像，
+    并在图头部插入 Cast -> Div(255) -> Transpose(NHWC->NCHW)，
+    使这些逐像素运算与模型一同在执行提供者（如 CUDA）上完成，
+    主机端只需传输 1/4 大小的 uint8 数据。
+
+    BGR->RGB 优先折叠进首个卷积的权重（零运行时开销），
+    无法折叠时（如量化模型）再插入 Gather 翻转通道。
+
+    Args:
+        onnx_path: ONNX 模型路径
+    """
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+
+    model = onnx.load(str(onnx_path))
+    graph = model.graph
+    old_input = graph.input[0]
+    tensor_type = old_input.type.tensor_type
+    if tensor_type.elem_type == TensorProto.UINT8:
+        print("⚠️  模型输入已为 uint8，跳过预处理融合")
+        return
+
+    # (N, 3, H, W) -> (N, H, W, 3)，保留符号维度
+    n, c, h, w = tensor_type.shape.dim
+    dims = [d.dim_value if d.dim_value > 0 else d.dim_param for d in (n, h, w, c)]
+    name = old_input.name
+    raw_name = f"{name}_uint8"
+    new_input = helper.make_tensor_value_info(raw_name, TensorProto.UINT8, dims)
+
+    float_dtype = (
+        np.float16 if tensor_type.elem_type == TensorProto.FLOAT16 else np.float32
+    )
+    graph.initializer.append(
+        numpy_helper.from_array(np.array(255.0, dtype=float_dtype), f"{name}_scale")
+    )
+
+    nodes = []
+    cast_input = raw_name
+    if not _fold_channel_flip(graph, name):
+        graph.initializer.append(
+            numpy_helper.from_array(
+                np.array([2, 1, 0], dtype=np.int64), f"{name}_rgb_order"
+            )
+        )
+        nodes.append(
+            helper.make_node(
+                "Gather", [raw_name, f"{name}_rgb_order"], [f"{name}_rgb"], axis=3
+            )
+        )
+        cast_input = f"{name}_rgb"
+    nodes += [
+        helper.make_node(
+            "Cast", [cast_input], [f"{name}_cast"], to=tensor_type.elem_type
+        ),
+        helper.make_node("Div", [f"{name}_cast", f"{name}_scale"], [f"{name}_nhwc"]),
+        # 输出沿用原输入名，下游节点无需改动
+        helper.make_node("Transpose", [f"{name}_nhwc"], [name], perm=[0, 3, 1, 2]),
+    ]
+
+    graph.input.remove(old_input)
+    graph.input.insert(0, new_input)
+    for node in reversed(nodes):
+        graph.node.insert(0, node)
+
+    onnx.checker.check_model(model)
+    onnx.save(model, str(onnx_path))
+
+
 def export_onnx(
     model_path: str,
     output_path: str | None = None,
@@ -146,7 +432,7 @@ def export_onnx(
         raise FileNotFoundError(f"模型文件不存在: {model_path}")
 
     print(f"📦 加载模型: {model_path}")
-    model = YOLO(str(model_path))
+    model = _load_yolo(str(model_path.resolve()), model_path.stat().st_mtime_ns)
 
     print("🔄 开始导出 ONNX...")
 
@@ -179,6 +465,287 @@ def export_onnx(
     return export_path
 
 
+def export_extra_formats(
+    model_path: str,
+    formats: list[str],
+    imgsz: list[int] | None = None,
+    batch: int = 1,
+    dynamic: bool = False,
+    half: bool = False,
+    device: str = "cpu",
+) -> dict[str, Path]:
+    """在同一进程内导出其他后端格式（TensorRT engine、OpenVINO IR）
+
+    模型经 _load_yolo 缓存，与 ONNX 导出共用一次 .pt 加载。
+
+    Args:
+        model_path: 输入 PyTorch 模型路径
+        formats: 要导出的格式列表（engine / openvino）
+        imgsz: 输入图像尺寸
+        batch: 批次大小
+        dynamic: 是否启用动态尺寸
+        half: 是否使用 FP16（engine 在 GPU 上默认启用）
+        device: 导出设备
+
+    Returns:
+        格式到导出路径的映射
+    """
+    if not formats:
+        return {}
+    if imgsz is None:
+        imgsz = [640]
+
+    model_path = Path(model_path)
+    if not model_path.exists():
+        raise FileNotFoundError(f"模型文件不存在: {model_path}")
+    model = _load_yolo(str(model_path.resolve()), model_path.stat().st_mtime_ns)
+
+    exported = {}
+    for fmt in formats:
+        # TensorRT 仅在 GPU 上构建，FP16 可显著降低显存占用与延迟
+        fmt_half = half or (fmt == "engine" and device != "cpu")
+        print(f"\n🔄 开始导出 {fmt}（FP16: {fmt_half}）...")
+        export_path = model.export(
+            format=fmt,
+            imgsz=imgsz,
+            batch=batch,
+            dynamic=dynamic,
+            half=fmt_half,
+            device=device,
+        )
+        exported[fmt] = Path(export_path)
+        print(f"✅ 导出成功: {export_path}")
+
+    return exported
+
+
+class YoloCalibReader:
+    """INT8 静态量化的校准数据读取器
+
+    实现 onnxruntime.quantization.CalibrationDataReader 的接口（get_next），
+    预处理与 ONNXInferenceEngine 保持一致：letterbox 缩放、BGR->RGB、
+    CHW 排列并归一化到 [0, 1]，保证校准得到的激活范围与推理时一致。
+    """
+
+    def __init__(
+        self,
+        image_dir: str | Path,
+        input_name: str,
+        imgsz: list[int],
+        limit: int = DEFAULT_CALIB_SIZE,
+    ) -> None:
+        """初始化校准读取器
+
+        Args:
+            image_dir: 校准图像目录
+            input_name: 模型输入名称
+            imgsz: 输入图像尺寸，单值或 [height, width]
+            limit: 最多使用的图像数量
+        """
+        image_dir = Path(image_dir)
+        if not image_dir.is_dir():
+            raise FileNotFoundError(f"校准图像目录不存在: {image_dir}")
+
+        self.image_paths = sorted(
+            p for p in image_dir.iterdir() if p.suffix.lower() in CALIB_SUFFIXES
+        )[:limit]
+        if not self.image_paths:
+            raise FileNotFoundError(f"校准图像目录中没有图像: {image_dir}")
+
+        self.input_name = input_name
+        self.target_h = imgsz[0]
+        self.target_w = imgsz[-1]
+        self._iter = self._generate()
+
+    def _load(self, image_path: Path) -> np.ndarray | None:
+        """读取并预处理单张校准图像"""
+        image = cv2.imread(str(image_path))
+        if image is None:
+            return None
+
+        orig_h, orig_w = image.shape[:2]
+        scale = min(self.target_w / orig_w, self.target_h / orig_h)
+        new_w, new_h = int(orig_w * scale), int(orig_h * scale)
+        resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+        canvas = np.full((self.target_h, self.target_w, 3), 114, dtype=np.uint8)
+        pad_w = (self.target_w - new_w) // 2
+        pad_h = (self.target_h - new_h) // 2
+        canvas[pad_h : pad_h + new_h, pad_w : pad_w + new_w] = resized
+        canvas = cv2.cvtColor(canvas, cv2.COLOR_BGR2RGB)
+
+        blob = canvas.transpose(2, 0, 1)[np.newaxis].astype(np.float32) / 255.0
+        return np.ascontiguousarray(blob)
+
+    def _generate(self) -> Iterator[dict[str, np.ndarray]]:
+        for image_path in self.image_paths:
+            blob = self._load(image_path)
+            if blob is not None:
+                yield {self.input_name: blob}
+
+    def get_next(self) -> dict[str, np.ndarray] | None:
+        """返回下一批校准输入，耗尽时返回 None"""
+        return next(self._iter, None)
+
+    def rewind(self) -> None:
+        """重置读取位置"""
+        self._iter = self._generate()
+
+
+def slim_onnx(onnx_path: Path) -> bool:
+    """使用 onnxslim 原地简化 ONNX 模型（常量折叠、算子融合、消除冗余节点）
+
+    Args:
+        onnx_path: ONNX 模型路径
+
+    Returns:
+        是否完成简化（未安装 onnxslim 时返回 False）
+    """
+    try:
+        import onnx
+        import onnxslim
+    except ImportError:
+        print("  ⚠️  未安装 onnxslim，跳过模型简化")
+        print("     安装: uv add onnxslim")
+        return False
+
+    model = onnx.load(str(onnx_path))
+    nodes_before = len(model.graph.node)
+    slimmed = onnxslim.slim(model)
+    if slimmed is None:
+        return False
+
+    onnx.save(slimmed, str(onnx_path))
+    print(f"🪶 onnxslim 简化: {nodes_before} -> {len(slimmed.graph.node)} 个节点")
+    return True
+
+
+def quantize_int8(
+    onnx_path: Path,
+    calib_dir: str | Path = DEFAULT_CALIB_DIR,
+    imgsz: list[int] | None = None,
+    calib_size: int = DEFAULT_CALIB_SIZE,
+) -> Path:
+    """对导出的 FP32 ONNX 模型做 INT8 静态量化
+
+    使用 QDQ 格式、逐通道对称量化权重与激活；CPU 上可利用 VNNI 等
+    int8 点积指令，模型体积约为 FP32 的 1/4。
+
+    Args:
+        onnx_path: FP32 ONNX 模型路径
+        calib_dir: 校准图像目录
+        imgsz: 输入图像尺寸
+        calib_size: 校准图像数量
+
+    Returns:
+        INT8 模型路径（与输入同目录，文件名追加 .int8）
+    """
+    from onnxruntime import InferenceSession
+    from onnxruntime.quantization import QuantFormat, QuantType, quantize_static
+
+    if imgsz is None:
+        imgsz = [640]
+
+    # 在量化前简化 FP32 图：校准与量化作用于更少的节点；
+    # 不对量化结果再做简化，以免常量折叠把权重的 DequantizeLinear 折回 FP32
+    slim_onnx(onnx_path)
+
+    input_name = (
+        InferenceSession(str(onnx_path), providers=["CPUExecutionProvider"])
+        .get_inputs()[0]
+        .name
+    )
+    reader = YoloCalibReader(calib_dir, input_name, imgsz, limit=calib_size)
+    print(f"🧮 INT8 量化校准: {len(reader.image_paths)} 张图像 ({calib_dir})")
+
+    int8_path = onnx_path.with_suffix(".int8.onnx")
+    quantize_static(
+        str(onnx_path),
+        str(int8_path),
+        reader,
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+        reduce_range=False,
+    )
+    return int8_path
+
+
+def optimize_onnx(
+    onnx_path: Path,
+    device: str = "cpu",
+    input_shape: tuple[int | None, int, int] | None = None,
+) -> Path:
+    """生成 ONNX Runtime 预优化模型
+
+    以 ORT_ENABLE_ALL 级别创建一次会话，并通过 optimized_model_filepath
+    将图优化结果（常量折叠、算子融合等）写回磁盘。推理时加载该文件可
+    跳过大部分图优化，缩短 InferenceSession 初始化时间。
+
+    指定 input_shape 时，通过 add_free_dimension_override_by_name 将动态维度
+    （batch/height/width）固定为具体数值，优化器可据此完成形状推断，
+    写出的模型不再包含符号维度，部署端无需按形状重新编译内核。
+
+    ENABLE_ALL 级别的融合结果与执行提供者相关，输出文件按提供者命名
+    （如 best.cpu.opt.onnx、best.cuda.opt.onnx），与 ONNXInferenceEngine 的
+    优化缓存同名，部署时加载原模型即可直接复用，无需再次图优化。
+
+    Args:
+        onnx_path: ONNX 模型路径
+        device: 导出设备；非 cpu 时使用 CUDAExecutionProvider
+        input_shape: 固定的 (batch, height, width)，None 则保留原始维度；
+            某一维为 None 时保留该维度为动态
+
+    Returns:
+        预优化模型路径（与输入同目录，后缀为 .<provider>.opt.onnx）
+    """
+    import onnxruntime as ort
+
+    providers = ["CPUExecutionProvider"]
+    if device != "cpu":
+        providers.insert(0, "CUDAExecutionProvider")
+    opt_path = optimized_model_path(onnx_path, providers[0])
+
+    sess_options = ort.SessionOptions()
+    sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    sess_options.optimized_model_filepath = str(opt_path)
+
+    if input_shape is not None:
+        # 维度名称与 Ultralytics 动态导出时使用的符号名一致；
+        # 静态导出的模型没有这些符号维度，覆盖不产生影响
+        for dim_name, value in zip(FREE_DIM_NAMES, input_shape, strict=True):
+            if value is not None:
+                sess_options.add_free_dimension_override_by_name(dim_name, value)
+
+    # 会话仅用于触发图优化并写出优化后的模型
+    ort.InferenceSession(str(onnx_path), sess_options, providers=providers)
+    return opt_path
+
+
+def write_shape_sidecar(
+    onnx_path: Path,
+    input_shape: tuple[int, int, int] | None,
+    dynamic: bool,
+) -> Path:
+    """在模型旁写出输入尺寸记录 (.shape.json)，供加载端复用
+
+    Args:
+        onnx_path: ONNX 模型路径
+        input_shape: 固定的 (batch, height, width)，None 表示完全动态
+        dynamic: 导出时是否启用动态尺寸
+
+    Returns:
+        sidecar 文件路径
+    """
+    sidecar_path = onnx_path.with_suffix(".shape.json")
+    record = {"dynamic": dynamic, "input_shape": None}
+    if input_shape is not None:
+        record["input_shape"] = dict(zip(FREE_DIM_NAMES, input_shape, strict=True))
+    sidecar_path.write_text(json.dumps(record, indent=2) + "\n")
+    return sidecar_path
+
+
 def verify_onnx(onnx_path: Path) -> bool:
     """验证导出的 ONNX 模型
 
@@ -235,10 +802,104 @@ def verify_onnx(onnx_path: Path) -> bool:
         return False
 
 
+def run_onnx_pipeline(args: argparse.Namespace) -> tuple[Path, Path | None]:
+    """执行 ONNX 导出流水线：导出、验证、INT8 量化、尺寸记录与 ORT 预优化
+
+    Args:
+        args: 命令行参数
+
+    Returns:
+        (最终 ONNX 模型路径, 预优化模型路径或 None)
+    """
+    # 按部署端 onnxruntime 的支持范围确定 opset / IR 版本
+    opset, ir_version = resolve_onnx_versions(args.opset, args.ir_version)
+
+    # 执行导出
+    onnx_path = export_onnx(
+        model_path=args.model,
+        output_path=args.output,
+        imgsz=args.imgsz,
+        batch=args.batch,
+        dynamic=args.dynamic,
+        # INT8 量化以 FP32 模型为输入，不与 FP16 叠加
+        half=args.half and not args.int8,
+        simplify=args.simplify,
+        opset=opset,
+        device=args.device,
+    )
+
+    print(f"\n✅ 导出成功: {onnx_path}")
+
+    if ir_version is not None:
+        try:
+            pin_ir_version(onnx_path, ir_version)
+        except ImportError:
+            print("⚠️  未安装 onnx 库，无法调整 IR 版本")
+
+    # 验证模型
+    if not args.no_verify:
+        verify_onnx(onnx_path)
+
+    # INT8 静态量化
+    if args.int8:
+        int8_path = quantize_int8(
+            onnx_path,
+            calib_dir=args.calib_dir,
+            imgsz=args.imgsz,
+            calib_size=args.calib_size,
+        )
+        print(f"\n✅ INT8 量化完成: {int8_path}")
+        if not args.no_verify:
+            verify_onnx(int8_path)
+        onnx_path = int8_path
+
+    # 预处理融合放在量化之后：校准仍以 NCHW 浮点输入进行
+    if args.embed_preprocess:
+        try:
+            embed_preprocess(onnx_path)
+            print("\n🧩 已将预处理融合进模型图（输入: NHWC uint8 BGR）")
+        except ImportError:
+            print("⚠️  未安装 onnx 库，无法融合预处理")
+
+    # 部署时的固定输入尺寸：静态导出即导出尺寸，动态导出取 --tile-size
+    size = args.tile_size if args.dynamic else args.imgsz
+    input_shape = (args.batch, size[0], size[-1]) if size else None
+    sidecar_path = write_shape_sidecar(onnx_path, input_shape, args.dynamic)
+    print(f"\n📐 输入尺寸记录: {sidecar_path}")
+
+    # 预先执行 ORT 图优化并保存结果
+    opt_path = None
+    if not args.no_optimize:
+        # 动态导出保留 batch 维度，预优化模型作为引擎缓存加载时仍可动态合批
+        opt_shape = (
+            (None, *input_shape[1:]) if args.dynamic and input_shape else input_shape
+        )
+        try:
+            opt_path = optimize_onnx(
+                onnx_path, device=args.device, input_shape=opt_shape
+            )
+            print(f"\n⚡ 预优化模型: {opt_path}")
+        except ImportError:
+            print("\n⚠️  未安装 onnxruntime，跳过预优化模型生成")
+            print("     安装: uv add onnxruntime")
+
+    return onnx_path, opt_path
+
+
 def main() -> None:
     """主函数"""
     args = parse_args()
 
+    # GPU 内核编译缓存需在首次使用 CUDA 之前配置
+    configure_kernel_caches()
+
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    unknown = [f for f in formats if f not in SUPPORTED_FORMATS]
+    if not formats or unknown:
+        print(f"\n❌ 不支持的导出格式: {', '.join(unknown) or '(空)'}")
+        print(f"   可选: {', '.join(SUPPORTED_FORMATS)}")
+        raise SystemExit(1)
+
     print("=" * 60)
     print("🚀 YOLO 模型 ONNX 导出工具")
     print("=" * 60)
@@ -247,10 +908,15 @@ def main() -> None:
     print("\n📋 导出配置:")
     print(f"  输入模型:   {args.model}")
     print(f"  输出路径:   {args.output or '(自动生成)'}")
+    print(f"  导出格式:   {', '.join(formats)}")
     print(f"  图像尺寸:   {args.imgsz}")
     print(f"  批次大小:   {args.batch}")
     print(f"  动态尺寸:   {args.dynamic}")
-    print(f"  半精度:     {args.half}")
+    if args.dynamic and args.tile_size:
+        print(f"  工作尺寸:   {args.tile_size}")
+    print(f"  半精度:     {args.half and not args.int8}")
+    print(f"  INT8 量化:  {args.int8}")
+    print(f"  内嵌预处理: {args.embed_preprocess}")
     print(f"  简化模型:   {args.simplify}")
     print(f"  Opset:      {args.opset}")
     print(f"  导出设备:   {args.device}")
@@ -258,36 +924,43 @@ def main() -> None:
     print("\n" + "-" * 60)
 
     try:
-        # 执行导出
-        onnx_path = export_onnx(
+        onnx_path = opt_path = None
+        if "onnx" in formats:
+            onnx_path, opt_path = run_onnx_pipeline(args)
+
+        # 其他后端格式复用同一个已加载的模型
+        extra_paths = export_extra_formats(
             model_path=args.model,
-            output_path=args.output,
+            formats=[f for f in formats if f != "onnx"],
             imgsz=args.imgsz,
             batch=args.batch,
             dynamic=args.dynamic,
             half=args.half,
-            simplify=args.simplify,
-            opset=args.opset,
             device=args.device,
         )
 
-        print(f"\n✅ 导出成功: {onnx_path}")
-
-        # 验证模型
-        if not args.no_verify:
-            verify_onnx(onnx_path)
-
         print("\n" + "=" * 60)
-        print("🎉 ONNX 导出完成！")
+        print("🎉 模型导出完成！")
         print("=" * 60)
 
         # 使用提示
         print("\n📝 后续步骤:")
-        print("  1. 使用 ONNX Runtime 推理:")
-        print("     import onnxruntime as ort")
-        print(f"     session = ort.InferenceSession('{onnx_path}')")
-        print("\n  2. 或复制到 models/ 目录:")
-        print(f"     cp {onnx_path} models/best.onnx")
+        if onnx_path is not None:
+            print("  1. 使用 ONNX Runtime 推理:")
+            print("     import onnxruntime as ort")
+            print(f"     session = ort.InferenceSession('{onnx_path}')")
+            if opt_path is not None:
+                print(f"     # 或加载预优化模型以缩短初始化: {opt_path}")
+            print("\n  2. 或复制到 models/ 目录:")
+            print(f"     cp {onnx_path} models/best.onnx")
+        for fmt, path in extra_paths.items():
+            print(f"\n  - {fmt}: {path}")
+            if fmt == "openvino":
+                print("     加载时设置 CACHE_DIR 以缓存编译结果，例如:")
+                print(
+                    "     core.compile_model(model, 'CPU', "
+                    "{'CACHE_DIR': '~/.cache/openvino'})"
+                )
 
     except FileNotFoundError as e:
         print(f"\n❌ 错误: {e}")
@@ -4,7 +4,9 @@
 用于验证数据目录结构和 data.yaml 配置。
 """
 
-import random
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 
 import cv2
@@ -28,12 +30,26 @@ COLORS = {
     4: (255, 255, 0),  # corrosion: 青色
 }
 
+# 数据集切分（顺序参与派生每张图像的随机种子）
+SPLITS = ("train", "val", "test")
+
+# 固定随机种子确保可复现
+DEFAULT_SEED = 42
+
+# 归一化 bbox (cx, cy, w, h) 的采样范围
+_BOX_LOW = np.array([0.15, 0.15, 0.05, 0.05])
+_BOX_HIGH = np.array([0.85, 0.85, 0.25, 0.25])
+
+# 模块级随机数生成器（未显式传入 rng 时使用）
+_RNG = np.random.default_rng(DEFAULT_SEED)
+
 
 def create_synthetic_image(
     width: int = 640,
     height: int = 480,
     num_objects: int = 3,
     class_id: int | None = None,
+    rng: np.random.Generator | None = None,
 ) -> tuple[np.ndarray, list[tuple[int, float, float, float, float]]]:
     """创建合成图像和对应的标注
 
@@ -42,44 +58,52 @@ def create_synthetic_image(
         height: 图像高度
         num_objects: 目标数量
         class_id: 指定类别ID，None 则随机
+        rng: 随机数生成器，None 则使用模块级生成器
 
     Returns:
         (图像, 标注列表)，标注格式为 (class_id, cx, cy, w, h)
     """
-    # 创建灰色背景（模拟混凝土/金属表面）
-    img = np.ones((height, width, 3), dtype=np.uint8) * 120
-    img += np.random.randint(-20, 20, (height, width, 3), dtype=np.int16).astype(
-        np.uint8
-    )
+    if rng is None:
+        rng = _RNG
+
+    # 创建灰色背景（模拟混凝土/金属表面）：一次生成 [100, 140) 的噪声底图
+    img = rng.integers(100, 140, (height, width, 3), dtype=np.uint8)
+
+    # 一次性批量抽取所有目标的类别与 bbox（归一化坐标）
+    if class_id is not None:
+        cids = np.full(num_objects, class_id)
+    else:
+        cids = rng.integers(0, 5, num_objects)
+    boxes = rng.uniform(_BOX_LOW, _BOX_HIGH, (num_objects, 4))
+
+    # 向量化换算像素坐标 (x1, y1, x2, y2)
+    scale = np.array([width, height])
+    half_sizes = boxes[:, 2:] / 2
+    xyxy = np.hstack(
+        [(boxes[:, :2] - half_sizes) * scale, (boxes[:, :2] + half_sizes) * scale]
+    ).astype(np.int64)
+
+    # 多边形顶点缓冲区，各目标原地复用，避免逐个构造数组
+    pts4 = np.empty((4, 1, 2), dtype=np.int32)
+    pts5 = np.empty((5, 1, 2), dtype=np.int32)
 
     annotations = []
 
-    for _ in range(num_objects):
-        # 随机选择类别
-        cid = class_id if class_id is not None else random.randint(0, 4)
+    for cid, (cx, cy, w, h), (x1, y1, x2, y2) in zip(
+        cids.tolist(), boxes.tolist(), xyxy.tolist(), strict=True
+    ):
         color = COLORS[cid]
 
-        # 随机生成 bbox（归一化坐标）
-        cx = random.uniform(0.15, 0.85)
-        cy = random.uniform(0.15, 0.85)
-        w = random.uniform(0.05, 0.25)
-        h = random.uniform(0.05, 0.25)
-
-        # 转换为像素坐标
-        x1 = int((cx - w / 2) * width)
-        y1 = int((cy - h / 2) * height)
-        x2 = int((cx + w / 2) * width)
-        y2 = int((cy + h / 2) * height)
-
         # 绘制模拟缺陷
         if cid == 0:  # crack - 裂缝（线条）
-            cv2.line(img, (x1, y1), (x2, y2), color, thickness=random.randint(2, 5))
+            cv2.line(img, (x1, y1), (x2, y2), color, thickness=int(rng.integers(2, 6)))
             # 添加一些分支
             mid_x, mid_y = (x1 + x2) // 2, (y1 + y2) // 2
+            dx, dy = rng.integers(-30, 31, 2)
             cv2.line(
                 img,
                 (mid_x, mid_y),
-                (mid_x + random.randint(-30, 30), mid_y + random.randint(-30, 30)),
+                (mid_x + int(dx), mid_y + int(dy)),
                 color,
                 thickness=2,
             )
@@ -95,98 +119,125 @@ def create_synthetic_image(
                 -1,
             )
         elif cid == 2:  # deformation - 变形（曲线）
-            pts = np.array(
-                [
-                    [x1, (y1 + y2) // 2],
-                    [(x1 + x2) // 2, y1],
-                    [x2, (y1 + y2) // 2],
-                    [(x1 + x2) // 2, y2],
-                ],
-                np.int32,
-            )
-            pts = pts.reshape((-1, 1, 2))
-            cv2.polylines(img, [pts], True, color, thickness=3)
+            mid_x, mid_y = (x1 + x2) // 2, (y1 + y2) // 2
+            pts4[:, 0] = ((x1, mid_y), (mid_x, y1), (x2, mid_y), (mid_x, y2))
+            cv2.polylines(img, [pts4], True, color, thickness=3)
         elif cid == 3:  # spalling - 剥落（不规则多边形）
-            pts = np.array(
-                [
-                    [x1, y1],
-                    [x2, y1],
-                    [x2, y2],
-                    [(x1 + x2) // 2, y2 + random.randint(-10, 10)],
-                    [x1, y2],
-                ],
-                np.int32,
+            bottom_y = y2 + int(rng.integers(-10, 11))
+            pts5[:, 0] = (
+                (x1, y1),
+                (x2, y1),
+                (x2, y2),
+                ((x1 + x2) // 2, bottom_y),
+                (x1, y2),
             )
-            pts = pts.reshape((-1, 1, 2))
-            cv2.fillPoly(img, [pts], color)
+            cv2.fillPoly(img, [pts5], color)
         else:  # corrosion - 腐蚀（点状坑洞）
-            for _ in range(random.randint(5, 10)):
-                px = random.randint(x1, x2)
-                py = random.randint(y1, y2)
-                cv2.circle(img, (px, py), random.randint(2, 5), color, -1)
+            num_pits = int(rng.integers(5, 11))
+            pxs = rng.integers(x1, x2 + 1, num_pits).tolist()
+            pys = rng.integers(y1, y2 + 1, num_pits).tolist()
+            radii = rng.integers(2, 6, num_pits).tolist()
+            for px, py, r in zip(pxs, pys, radii, strict=True):
+                cv2.circle(img, (px, py), r, color, -1)
 
         annotations.append((cid, cx, cy, w, h))
 
     return img, annotations
 
 
+def _make_one(
+    i: int, split: str, output_dir: Path, seed: int = DEFAULT_SEED
+) -> tuple[str, list[tuple[int, float, float, float, float]]]:
+    """生成并保存单张图像及其标注（在工作进程中执行）
+
+    每张图像使用由 (seed, split, i) 派生的独立随机数生成器，
+    结果与执行顺序、进程数无关，保证可复现。
+
+    Args:
+        i: 图像序号
+        split: 数据集切分名称
+        output_dir: 输出根目录（data/）
+        seed: 基础随机种子
+
+    Returns:
+        (图像文件名, 标注列表)
+    """
+    rng = np.random.default_rng([seed, SPLITS.index(split), i])
+
+    # 为每个类别至少生成一张图像
+    class_id = i % 5 if i < 5 else None
+
+    # 生成图像和标注
+    img, annotations = create_synthetic_image(
+        width=640,
+        height=480,
+        num_objects=int(rng.integers(1, 4)),
+        class_id=class_id,
+        rng=rng,
+    )
+
+    # 保存图像：内存编码后一次写入
+    img_filename = f"sample_{i:03d}.jpg"
+    ok, encoded = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 90])
+    if not ok:
+        raise RuntimeError(f"JPEG 编码失败: {img_filename}")
+    (output_dir / "images" / split / img_filename).write_bytes(encoded.tobytes())
+
+    # 保存标注（YOLO 格式：class_id center_x center_y width height）
+    label_path = output_dir / "labels" / split / f"sample_{i:03d}.txt"
+    label_path.write_text(
+        "".join(
+            f"{cid} {cx:.6f} {cy:.6f} {w:.6f} {h:.6f}\n"
+            for cid, cx, cy, w, h in annotations
+        )
+    )
+
+    return img_filename, annotations
+
+
 def generate_dataset(
     output_dir: Path,
     train_count: int = 6,
     val_count: int = 2,
     test_count: int = 2,
+    seed: int = DEFAULT_SEED,
+    max_workers: int | None = None,
 ) -> None:
     """生成完整的测试数据集
 
+    每张图像的生成、JPEG 编码与写盘相互独立，分发到多个进程并行执行。
+
     Args:
         output_dir: 输出根目录（data/）
         train_count: 训练集图像数量
         val_count: 验证集图像数量
         test_count: 测试集图像数量
+        seed: 基础随机种子
+        max_workers: 工作进程数，None 则使用全部 CPU 核心
     """
-    splits = {
-        "train": train_count,
-        "val": val_count,
-        "test": test_count,
-    }
-
-    random.seed(42)  # 固定随机种子确保可复现
-
-    for split, count in splits.items():
-        print(f"\n生成 {split} 集合...")
-
-        img_dir = output_dir / "images" / split
-        label_dir = output_dir / "labels" / split
-
-        for i in range(count):
-            # 为每个类别至少生成一张图像
-            class_id = i % 5 if i < 5 else None
-
-            # 生成图像和标注
-            img, annotations = create_synthetic_image(
-                width=640,
-                height=480,
-                num_objects=random.randint(1, 3),
-                class_id=class_id,
+    counts = dict(zip(SPLITS, (train_count, val_count, test_count), strict=True))
+
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        for split, count in counts.items():
+            print(f"\n生成 {split} 集合...")
+
+            results = executor.map(
+                _make_one,
+                range(count),
+                repeat(split),
+                repeat(output_dir),
+                repeat(seed),
+            )
+            # 汇总本切分的目标统计，每个切分只输出一行，不逐图打印
+            class_counts = dict.fromkeys(CATEGORIES, 0)
+            for _, annotations in results:
+                for ann in annotations:
+                    class_counts[ann[0]] += 1
+            summary = ", ".join(
+                f"{CATEGORIES[cid]}={n}" for cid, n in class_counts.items() if n
             )
-
-            # 保存图像
-            img_filename = f"sample_{i:03d}.jpg"
-            img_path = img_dir / img_filename
-            cv2.imwrite(str(img_path), img)
-
-            # 保存标注
-            label_filename = f"sample_{i:03d}.txt"
-            label_path = label_dir / label_filename
-
-            with open(label_path, "w") as f:
-                for cid, cx, cy, w, h in annotations:
-                    # YOLO 格式：class_id center_x center_y width height
-                    f.write(f"{cid} {cx:.6f} {cy:.6f} {w:.6f} {h:.6f}\n")
-
             print(
-                f"  - {img_filename}: {len(annotations)} 个目标 "
-                f"({', '.join(CATEGORIES[ann[0]] for ann in annotations)})"
+                f"  - {count} 张图像, {sum(class_counts.values())} 个目标 ({summary})"
             )
 
     print("\n✅ 数据集生成完成！")
@@ -13,6 +13,8 @@ from pathlib import Path
 
 from ultralytics import YOLO
 
+from vision_analysis_pro.core.inference.base import configure_kernel_caches
+
 
 def parse_args() -> argparse.Namespace:
     """解析命令行参数"""
@@ -114,6 +116,9 @@ def main() -> None:
     """主训练函数"""
     args = parse_args()
 
+    # GPU 内核编译缓存需在首次使用 CUDA 之前配置
+    configure_kernel_caches()
+
     print("=" * 60)
     print("🚀 YOLO 模型训练")
     print("=" * 60)
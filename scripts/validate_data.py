@@ -7,11 +7,20 @@
 - 检查标注格式正确性
 """
 
+import os
+import warnings
 from collections import Counter
 from pathlib import Path
 
+import numpy as np
 import yaml
 
+try:
+    # tqdm 随 ultralytics 安装；缺失时退化为无进度条的普通迭代
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
+
 # 类别定义（与 categories.py 和 data.yaml 保持一致）
 EXPECTED_CATEGORIES = {
     0: "crack",
@@ -21,6 +30,10 @@ EXPECTED_CATEGORIES = {
     4: "corrosion",
 }
 
+# 识别的图像与标注文件扩展名
+IMAGE_SUFFIXES = frozenset({"jpg", "jpeg", "png"})
+LABEL_SUFFIXES = frozenset({"txt"})
+
 
 def load_data_config(yaml_path: Path) -> dict:
     """加载 data.yaml 配置"""
@@ -62,6 +75,29 @@ def validate_config(config: dict) -> bool:
     return True
 
 
+def _scan_dir(
+    directory: Path, suffixes: frozenset[str]
+) -> tuple[list[Path], dict[str, str]]:
+    """单次遍历目录，收集指定后缀的文件
+
+    Args:
+        directory: 待遍历目录
+        suffixes: 允许的扩展名（小写，不含点）
+
+    Returns:
+        (按路径排序的文件列表, 文件名主干到文件名的映射)
+    """
+    files = []
+    names = {}
+    with os.scandir(directory) as it:
+        for entry in it:
+            stem, _, ext = entry.name.rpartition(".")
+            if stem and ext.lower() in suffixes and entry.is_file():
+                files.append(entry.path)
+                names[stem] = entry.name
+    return [Path(p) for p in sorted(files)], names
+
+
 def check_dataset_split(
     data_root: Path, split: str
 ) -> tuple[list[Path], list[Path], dict]:
@@ -85,35 +121,20 @@ def check_dataset_split(
         print(f"  ❌ 标注目录不存在: {label_dir}")
         return [], [], {}
 
-    # 收集图像文件
-    img_files = sorted(
-        list(img_dir.glob("*.jpg"))
-        + list(img_dir.glob("*.png"))
-        + list(img_dir.glob("*.jpeg"))
-    )
+    # 收集图像与标注文件（各目录仅遍历一次，同时记录文件名主干）
+    img_files, img_names = _scan_dir(img_dir, IMAGE_SUFFIXES)
     print(f"  找到 {len(img_files)} 张图像")
 
-    # 收集标注文件
-    label_files = sorted(label_dir.glob("*.txt"))
+    label_files, label_names = _scan_dir(label_dir, LABEL_SUFFIXES)
     print(f"  找到 {len(label_files)} 个标注文件")
 
-    # 检查图像与标注匹配
-    matched = 0
-    unmatched_images = []
-    unmatched_labels = []
-
-    img_stems = {img.stem for img in img_files}
-    label_stems = {label.stem for label in label_files}
-
-    for img in img_files:
-        if img.stem not in label_stems:
-            unmatched_images.append(img.name)
-        else:
-            matched += 1
-
-    for label in label_files:
-        if label.stem not in img_stems:
-            unmatched_labels.append(label.name)
+    # 检查图像与标注匹配：对称差一次得到两侧缺失的文件名主干
+    missing = img_names.keys() ^ label_names.keys()
+    unmatched_images = sorted(img_names[stem] for stem in missing & img_names.keys())
+    unmatched_labels = sorted(
+        label_names[stem] for stem in missing & label_names.keys()
+    )
+    matched = len(img_names) - len(unmatched_images)
 
     print(f"  ✅ 匹配: {matched} 对")
 
@@ -128,57 +149,111 @@ def check_dataset_split(
             print(f"     ... 还有 {len(unmatched_labels) - 5} 个")
 
     # 统计标注信息
-    stats = validate_annotations(label_files)
+    stats = validate_annotations(label_files, desc=split)
 
     return img_files, label_files, stats
 
 
-def validate_annotations(label_files: list[Path]) -> dict:
-    """验证标注文件格式并统计
+def _validate_lines(label_file: Path) -> tuple[list[int], list[str]]:
+    """逐行解析并验证单个标注文件（慢路径，用于定位具体出错行）
 
     Returns:
-        统计信息字典
+        (有效目标的类别 ID 列表, 错误描述列表)
     """
-    total_objects = 0
-    class_counter = Counter()
-    invalid_files = []
+    class_ids = []
+    errors = []
+
+    with open(label_file) as f:
+        lines = f.readlines()
+
+    for line_num, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+
+        parts = line.split()
+        if len(parts) != 5:
+            errors.append(f"{label_file.name}:{line_num} (字段数={len(parts)})")
+            continue
 
-    for label_file in label_files:
         try:
-            with open(label_file) as f:
-                lines = f.readlines()
+            class_id = int(parts[0])
+            cx, cy, w, h = map(float, parts[1:])
+        except ValueError as e:
+            errors.append(f"{label_file.name}:{line_num} (解析错误: {e})")
+            continue
 
-            for line_num, line in enumerate(lines, 1):
-                line = line.strip()
-                if not line:
-                    continue
+        # 验证类别 ID
+        if class_id not in EXPECTED_CATEGORIES:
+            errors.append(f"{label_file.name}:{line_num} (class_id={class_id} 无效)")
+            continue
 
-                parts = line.split()
-                if len(parts) != 5:
-                    invalid_files.append(
-                        f"{label_file.name}:{line_num} (字段数={len(parts)})"
-                    )
-                    continue
+        # 验证坐标范围
+        if not (0 <= cx <= 1 and 0 <= cy <= 1 and 0 < w <= 1 and 0 < h <= 1):
+            errors.append(f"{label_file.name}:{line_num} (坐标超出 [0,1] 范围)")
+            continue
 
-                class_id = int(parts[0])
-                cx, cy, w, h = map(float, parts[1:])
+        class_ids.append(class_id)
 
-                # 验证类别 ID
-                if class_id not in EXPECTED_CATEGORIES:
-                    invalid_files.append(
-                        f"{label_file.name}:{line_num} (class_id={class_id} 无效)"
-                    )
-                    continue
+    return class_ids, errors
+
+
+def validate_annotations(label_files: list[Path], desc: str = "标注") -> dict:
+    """验证标注文件格式并统计
+
+    每个文件先用 np.loadtxt 一次解析为数组并做向量化校验；
+    仅当文件存在错误时才回退到逐行解析，以报告具体出错行号。
+    进度通过 tqdm 合并刷新，错误在遍历结束后统一输出。
 
-                # 验证坐标范围
-                if not (0 <= cx <= 1 and 0 <= cy <= 1 and 0 < w <= 1 and 0 < h <= 1):
-                    invalid_files.append(
-                        f"{label_file.name}:{line_num} (坐标超出 [0,1] 范围)"
-                    )
+    Args:
+        label_files: 标注文件列表
+        desc: 进度条描述
+
+    Returns:
+        统计信息字典
+    """
+    num_classes = len(EXPECTED_CATEGORIES)
+    class_counts = np.zeros(num_classes, dtype=np.int64)
+    invalid_files = []
+
+    progress = (
+        tqdm(label_files, desc=f"  {desc}", unit="file", leave=False)
+        if tqdm is not None
+        else label_files
+    )
+    for label_file in progress:
+        try:
+            try:
+                with warnings.catch_warnings():
+                    # 空标注文件（无目标的图像）是合法的，忽略 loadtxt 的空输入警告
+                    warnings.simplefilter("ignore", UserWarning)
+                    arr = np.loadtxt(label_file, dtype=np.float64, ndmin=2)
+            except ValueError:
+                arr = None
+
+            if arr is not None and arr.size == 0:
+                continue
+
+            if arr is not None and arr.shape[1] == 5:
+                cls = arr[:, 0].astype(np.int64)
+                coords = arr[:, 1:3]
+                sizes = arr[:, 3:5]
+                valid = (
+                    (cls == arr[:, 0])
+                    & (cls >= 0)
+                    & (cls < num_classes)
+                    & ((coords >= 0) & (coords <= 1)).all(axis=1)
+                    & ((sizes > 0) & (sizes <= 1)).all(axis=1)
+                )
+                if valid.all():
+                    class_counts += np.bincount(cls, minlength=num_classes)
                     continue
 
-                total_objects += 1
-                class_counter[class_id] += 1
+            # 存在错误：逐行解析以定位出错行，同时保留该文件中的有效目标
+            class_ids, errors = _validate_lines(label_file)
+            invalid_files.extend(errors)
+            if class_ids:
+                class_counts += np.bincount(class_ids, minlength=num_classes)
 
         except Exception as e:
             invalid_files.append(f"{label_file.name} (读取错误: {e})")
@@ -191,8 +266,12 @@ def validate_annotations(label_files: list[Path]) -> dict:
             print(f"     ... 还有 {len(invalid_files) - 5} 个")
 
     return {
-        "total_objects": total_objects,
-        "class_distribution": dict(class_counter),
+        "total_objects": int(class_counts.sum()),
+        "class_distribution": {
+            class_id: int(count)
+            for class_id, count in enumerate(class_counts.tolist())
+            if count
+        },
         "invalid_count": len(invalid_files),
     }
 
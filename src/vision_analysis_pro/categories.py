@@ -65,36 +65,45 @@ MIN_BOX_SIZE: Final[int] = 32
 # 最大目标占比（相对于图像面积）
 MAX_BOX_RATIO: Final[float] = 0.8
 
+# ========== 按类别 ID 索引的查找表 ==========
+
+# 由上方字典在导入时生成，辅助函数直接按下标取值，免去 id -> 名称 -> 值 的两次字典查找
+_NAMES: Final[tuple[str, ...]] = tuple(LABEL_MAP[i] for i in range(NUM_CLASSES))
+_NAMES_CN: Final[tuple[str, ...]] = tuple(LABEL_CN[n] for n in _NAMES)
+_COLORS: Final[tuple[tuple[int, int, int], ...]] = tuple(
+    LABEL_COLORS[n] for n in _NAMES
+)
+_SEVERITY: Final[tuple[str, ...]] = tuple(SEVERITY_LEVEL[n] for n in _NAMES)
+
 
 # ========== 辅助函数 ==========
 
 
 def get_label_name(class_id: int) -> str:
     """获取类别英文名称"""
-    return LABEL_MAP.get(class_id, "unknown")
+    return _NAMES[class_id] if 0 <= class_id < NUM_CLASSES else "unknown"
 
 
 def get_label_cn(class_id: int) -> str:
     """获取类别中文名称"""
-    label = get_label_name(class_id)
-    return LABEL_CN.get(label, "未知")
+    return _NAMES_CN[class_id] if 0 <= class_id < NUM_CLASSES else "未知"
 
 
 def get_label_color(class_id: int) -> tuple[int, int, int]:
     """获取类别颜色（BGR 格式）"""
-    label = get_label_name(class_id)
-    return LABEL_COLORS.get(label, (255, 255, 255))  # 默认白色
+    if 0 <= class_id < NUM_CLASSES:
+        return _COLORS[class_id]
+    return (255, 255, 255)  # 默认白色
 
 
 def get_severity(class_id: int) -> str:
     """获取类别严重等级"""
-    label = get_label_name(class_id)
-    return SEVERITY_LEVEL.get(label, "unknown")
+    return _SEVERITY[class_id] if 0 <= class_id < NUM_CLASSES else "unknown"
 
 
 def validate_class_id(class_id: int) -> bool:
     """验证类别 ID 是否有效"""
-    return class_id in LABEL_MAP
+    return 0 <= class_id < NUM_CLASSES
 
 
 # ========== 元数据 ==========
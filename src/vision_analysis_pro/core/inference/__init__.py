@@ -1,15 +1,50 @@
-"""推理引擎模块"""
+"""推理引擎模块
 
-from .base import InferenceEngine
-from .onnx_engine import ONNXInferenceEngine
-from .python_engine import PythonInferenceEngine
-from .stub_engine import StubInferenceEngine
-from .yolo_engine import YOLOInferenceEngine
+各引擎类在首次访问时才导入对应子模块（PEP 562），
+仅使用 Stub 引擎或不涉及推理的工具无需加载 OpenCV 等依赖。
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .base import InferenceEngine
+    from .batching_engine import BatchingInferenceEngine
+    from .onnx_engine import ONNXInferenceEngine
+    from .python_engine import PythonInferenceEngine
+    from .stub_engine import StubInferenceEngine
+    from .yolo_engine import YOLOInferenceEngine
+
+# 导出名称 -> 所在子模块
+_LAZY_IMPORTS: dict[str, str] = {
+    "BatchingInferenceEngine": "batching_engine",
+    "InferenceEngine": "base",
+    "ONNXInferenceEngine": "onnx_engine",
+    "PythonInferenceEngine": "python_engine",
+    "StubInferenceEngine": "stub_engine",
+    "YOLOInferenceEngine": "yolo_engine",
+}
 
 __all__ = [
+    "BatchingInferenceEngine",
     "InferenceEngine",
     "ONNXInferenceEngine",
     "PythonInferenceEngine",
     "StubInferenceEngine",
     "YOLOInferenceEngine",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """按需导入引擎类，并缓存到模块命名空间"""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,18 +1,121 @@
 """推理引擎基类"""
 
+import os
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+
+# GPU 内核 JIT/编译结果的持久化缓存根目录
+KERNEL_CACHE_ROOT = Path.home() / ".cache" / "vision_analysis_pro"
+
+
+def configure_kernel_caches(root: str | Path | None = None) -> None:
+    """为 GPU 执行后端配置持久化内核缓存
+
+    CUDA 首次在本机算力架构上运行时需将 PTX JIT 编译为 cubin，
+    MIOpen / TensorRT 同样会在首次运行时搜索或构建内核，耗时可达数分钟。
+    将缓存目录固定到磁盘后，后续启动直接加载已编译结果。
+
+    这些变量在创建 GPU 上下文 / 推理会话时才被读取，须在加载模型之前调用；
+    已存在的环境变量不会被覆盖，无法创建的目录会被跳过。
+    该函数会修改进程级环境变量，只应在进程入口（CLI、服务启动）处调用。
+
+    Args:
+        root: 缓存根目录，None 则使用 KERNEL_CACHE_ROOT
+    """
+    root = Path(root) if root is not None else KERNEL_CACHE_ROOT
+
+    cache_dirs = {
+        "CUDA_CACHE_PATH": root / "cuda",
+        "MIOPEN_USER_DB_PATH": root / "miopen",
+        "ORT_TENSORRT_CACHE_PATH": root / "trt",
+    }
+    for env_name, cache_dir in cache_dirs.items():
+        if env_name in os.environ:
+            continue
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            continue
+        os.environ[env_name] = str(cache_dir)
+
+    # CUDA 默认缓存上限较小，大模型的内核会被频繁淘汰
+    os.environ.setdefault("CUDA_CACHE_MAXSIZE", str(2**31))
+    # TensorRT EP 仅在启用引擎缓存时才使用上面的缓存目录
+    if "ORT_TENSORRT_CACHE_PATH" in os.environ:
+        os.environ.setdefault("ORT_TENSORRT_ENGINE_CACHE_ENABLE", "1")
+
 
 class InferenceEngine(ABC):
-    """推理引擎抽象基类"""
+    """推理引擎抽象基类
+
+    输入缓冲区约定：warmup() 应通过 _ensure_input_buffer() 按模型输入的
+    形状与 dtype 分配输入缓冲区，predict() 的预处理结果直接写入同一缓冲区，
+    使首次真实推理不再承担分配开销，后续调用也不再逐帧分配。
+    """
 
     def __init__(self, model_path: str | Path) -> None:
         self.model_path = Path(model_path)
         if not self.model_path.exists():
             raise FileNotFoundError(f"模型文件不存在: {self.model_path}")
 
+        # 可复用的主机端输入缓冲区（由 _ensure_input_buffer 按需分配）
+        self._input_buf: np.ndarray | None = None
+
+        # 类别 ID -> 名称查找表（由 _build_label_table 构建）
+        self._label_table: np.ndarray = np.empty(0, dtype=object)
+
+    def _build_label_table(self, class_names: dict[int, str]) -> None:
+        """构建类别 ID -> 名称的 object 数组查找表，缺失的 ID 记为 class_{id}
+
+        后处理时以 _lookup_labels 批量取类别名称，替代逐个检测的 dict.get。
+
+        Args:
+            class_names: 类别 ID 到名称的映射
+        """
+        size = max(class_names, default=-1) + 1
+        self._label_table = np.array(
+            [class_names.get(i, f"class_{i}") for i in range(size)], dtype=object
+        )
+
+    def _lookup_labels(self, class_ids: np.ndarray) -> list[str]:
+        """批量查找类别名称
+
+        Args:
+            class_ids: 整数类别 ID 数组
+
+        Returns:
+            与 class_ids 一一对应的类别名称列表
+        """
+        table = self._label_table
+        if class_ids.size and (class_ids.min() < 0 or class_ids.max() >= len(table)):
+            # 超出查找表范围的 ID（极少见）逐个生成名称
+            return [
+                table[i] if 0 <= i < len(table) else f"class_{i}"
+                for i in class_ids.tolist()
+            ]
+        return table[class_ids].tolist()
+
+    def _ensure_input_buffer(
+        self, shape: tuple[int, ...], dtype: np.dtype | type = np.float32
+    ) -> np.ndarray:
+        """返回指定形状与 dtype 的输入缓冲区，不匹配时重新分配
+
+        Args:
+            shape: 缓冲区形状，如 (1, 3, H, W)
+            dtype: 元素类型（fp32/fp16 等，与模型输入一致）
+
+        Returns:
+            可原地写入的输入缓冲区；内容在下次调用前保持有效
+        """
+        buf = self._input_buf
+        if buf is None or buf.shape != tuple(shape) or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            self._input_buf = buf
+        return buf
+
     @abstractmethod
     def predict(self, image: Any, conf: float = 0.5, iou: float = 0.5) -> Any:
         """执行推理
@@ -31,3 +134,28 @@ class InferenceEngine(ABC):
     def warmup(self, imgsz: int = 640) -> None:
         """预热模型"""
         pass
+
+    # ========== 可选：设备端 IO 绑定 ==========
+    # 支持 IO 绑定的引擎可覆盖以下方法，使输入/输出张量常驻设备内存，
+    # 省去每次推理的主机<->设备拷贝与输出缓冲区分配；不支持的引擎保持默认实现。
+    # 调用方以 create_io_binding() 是否返回 None 判断能力，绑定推理本身
+    # （如 ONNXInferenceEngine.predict_bound）由具体引擎提供。
+
+    def create_io_binding(self) -> Any:
+        """创建（或返回已缓存的）IO 绑定对象
+
+        Returns:
+            引擎相关的绑定对象（如 onnxruntime.IOBinding），不支持时返回 None
+        """
+        return None
+
+    def prepare_input(self, blob: Any) -> Any:
+        """将预处理后的输入张量放置到推理设备上
+
+        Args:
+            blob: 预处理后的输入张量
+
+        Returns:
+            可直接绑定到推理会话的设备端张量；默认原样返回
+        """
+        return blob
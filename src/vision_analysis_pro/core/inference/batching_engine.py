@@ -0,0 +1,227 @@
+"""动态批处理推理引擎
+
+包装 ONNXInferenceEngine，将多个调用方（多路数据源、并发 API 请求）的
+单帧推理请求在限定等待时间内合并为一个批次，以一次 session.run 完成推理，
+摊薄 GPU 上逐帧调用的内核启动与调度开销。
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from queue import Empty, Queue
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from .base import InferenceEngine
+from .onnx_engine import ONNXInferenceEngine
+
+logger = logging.getLogger(__name__)
+
+
+class _BatchRequest(NamedTuple):
+    """单个待批处理的推理请求"""
+
+    image: np.ndarray
+    conf: float
+    iou: float
+    future: Future
+
+
+class BatchingInferenceEngine(InferenceEngine):
+    """带动态批处理的 ONNX 推理引擎包装器
+
+    调用方通过 submit() 提交请求并获得 Future，后台线程最多收集
+    max_batch_size 个请求或等待 max_wait_ms 后，将预处理结果堆叠为
+    批次张量执行一次推理，再逐个后处理并回填结果。
+
+    要求 ONNX 模型导出时 batch 维度（第 0 维）为动态；
+    静态 batch 的模型会退化为逐个推理，并记录警告。
+    """
+
+    def __init__(
+        self,
+        engine: ONNXInferenceEngine,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 5.0,
+    ) -> None:
+        """初始化批处理引擎并启动后台批处理线程
+
+        Args:
+            engine: 被包装的 ONNX 推理引擎
+            max_batch_size: 单批次最大请求数
+            max_wait_ms: 收到首个请求后等待凑批的最长时间（毫秒）
+
+        Raises:
+            ValueError: 参数无效
+        """
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size 必须 >= 1，实际: {max_batch_size}")
+        if max_wait_ms < 0:
+            raise ValueError(f"max_wait_ms 必须 >= 0，实际: {max_wait_ms}")
+
+        super().__init__(engine.model_path)
+        self.engine = engine
+        self.max_wait_ms = max_wait_ms
+
+        batch_dim = engine.input_shape[0] if engine.input_shape else 1
+        if isinstance(batch_dim, int):
+            logger.warning(
+                f"ONNX 模型 batch 维度为静态 ({batch_dim})，动态批处理退化为逐个推理；"
+                "请使用 --dynamic 重新导出模型"
+            )
+            max_batch_size = 1
+        self.max_batch_size = max_batch_size
+
+        # None 作为停止哨兵；_closed 的检查与入队在同一把锁下，
+        # 保证停止哨兵之后不会再有请求入队
+        self._queue: Queue[_BatchRequest | None] = Queue()
+        self._closed = False
+        self._state_lock = threading.Lock()
+        self._worker = threading.Thread(
+            target=self._batch_worker,
+            name="inference-batcher",
+            daemon=True,
+        )
+        self._worker.start()
+
+    def submit(self, image: Any, conf: float = 0.5, iou: float = 0.5) -> Future:
+        """提交一次推理请求
+
+        阈值校验与图像解码在调用方线程完成，批处理线程只负责预处理、推理与后处理。
+
+        Args:
+            image: 输入图像（numpy 数组、文件路径或图像字节流）
+            conf: 置信度阈值 (0.0 - 1.0)
+            iou: NMS IoU 阈值 (0.0 - 1.0)
+
+        Returns:
+            结果为检测列表的 Future
+
+        Raises:
+            RuntimeError: 引擎已关闭
+        """
+        if self._closed:
+            raise RuntimeError("批处理推理引擎已关闭")
+
+        self.engine._validate_thresholds(conf, iou)
+        image = self.engine._load_image(image)
+
+        future: Future = Future()
+        with self._state_lock:
+            if self._closed:
+                raise RuntimeError("批处理推理引擎已关闭")
+            self._queue.put(_BatchRequest(image, conf, iou, future))
+        return future
+
+    def predict(
+        self, image: Any, conf: float = 0.5, iou: float = 0.5
+    ) -> list[dict[str, Any]]:
+        """提交请求并阻塞等待结果，输出格式与 ONNXInferenceEngine.predict 一致"""
+        return self.submit(image, conf, iou).result()
+
+    def warmup(self, imgsz: int = 640) -> None:
+        """预热被包装的推理引擎"""
+        self.engine.warmup(imgsz)
+
+    def close(self) -> None:
+        """停止批处理线程；已提交的请求会先处理完毕"""
+        with self._state_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._worker.join()
+
+    def __enter__(self) -> "BatchingInferenceEngine":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def _collect_batch(self, first: _BatchRequest) -> tuple[list[_BatchRequest], bool]:
+        """以首个请求为起点，在等待时限内凑满一个批次
+
+        Returns:
+            (批次请求列表, 是否收到停止哨兵)
+        """
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=timeout)
+            except Empty:
+                break
+            if request is None:
+                return batch, True
+            batch.append(request)
+        return batch, False
+
+    def _batch_worker(self) -> None:
+        """批处理线程主循环"""
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch, stop = self._collect_batch(first)
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: list[_BatchRequest]) -> None:
+        """对一个批次执行预处理、单次推理与逐个后处理，并回填 Future"""
+        requests = [r for r in batch if r.future.set_running_or_notify_cancel()]
+        if not requests:
+            return
+
+        engine = self.engine
+        # 预处理写入引擎复用的缓冲区、输出数组跨调用复用：与 engine.predict 共用实例锁
+        with engine.inference_lock:
+            self._process_batch(engine, requests)
+
+    @staticmethod
+    def _process_batch(
+        engine: ONNXInferenceEngine, requests: list[_BatchRequest]
+    ) -> None:
+        """在持有引擎锁时完成预处理、推理与后处理并回填 Future"""
+        try:
+            target_h, target_w = engine._target_size()
+            blobs = None
+            infos = []
+            for i, request in enumerate(requests):
+                # _preprocess 写入引擎复用的输入缓冲区，逐个拷贝到批次张量
+                blob, orig_shape, preprocess_info = engine._preprocess(
+                    request.image, (target_h, target_w)
+                )
+                if blobs is None:
+                    # 按引擎实际输入布局分配：NCHW float32，或内嵌预处理的 NHWC uint8
+                    blobs = np.empty((len(requests), *blob.shape[1:]), dtype=blob.dtype)
+                blobs[i] = blob[0]
+                infos.append((orig_shape, preprocess_info))
+
+            # 经引擎的 _run 执行，沿用其 IO 绑定、预分配输出与 CUDA Graph 会话
+            outputs = engine._run(blobs)[0]
+        except Exception as e:
+            error = RuntimeError(f"推理失败: {e}")
+            for request in requests:
+                request.future.set_exception(error)
+            return
+
+        for i, (request, (orig_shape, preprocess_info)) in enumerate(
+            zip(requests, infos, strict=True)
+        ):
+            try:
+                detections = engine._postprocess(
+                    outputs[i : i + 1],
+                    orig_shape,
+                    preprocess_info,
+                    request.conf,
+                    request.iou,
+                )
+            except Exception as e:
+                request.future.set_exception(RuntimeError(f"推理失败: {e}"))
+            else:
+                request.future.set_result(detections)
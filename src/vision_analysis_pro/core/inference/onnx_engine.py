@@ -4,14 +4,164 @@
 输出格式与 YOLOInferenceEngine 保持一致。
 """
 
+import logging
+import os
+import threading
 from pathlib import Path
 from typing import Any
 
 import cv2
 import numpy as np
 
+from ..preprocessing.decode import decode_bgr, decode_image
 from .base import InferenceEngine
 
+logger = logging.getLogger(__name__)
+
+# 可选：Numba JIT（预处理的通道重排/归一化，以及 cv2.dnn 不可用时的 NMS 循环）
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+
+def optimized_model_path(source_path: Path, provider: str) -> Path:
+    """预优化模型路径：按执行提供者区分，如 best.cpu.opt.onnx、best.cuda.opt.onnx
+
+    export_onnx.py 导出的预优化模型与 ONNXInferenceEngine 的优化缓存共用此命名，
+    导出结果可直接作为引擎缓存加载。ENABLE_ALL 级别的融合结果与执行提供者相关，
+    不同提供者各自保存。
+
+    Args:
+        source_path: 原始 ONNX 模型路径
+        provider: 执行提供者名称，如 "CPUExecutionProvider"
+
+    Returns:
+        与原模型同目录的预优化模型路径
+    """
+    tag = provider.removesuffix("ExecutionProvider").lower()
+    return source_path.with_suffix(f".{tag}.opt.onnx")
+
+
+def _bgr_to_chw_numpy(src: np.ndarray, dst: np.ndarray) -> None:
+    """BGR->RGB、HWC->CHW 并归一化到 [0, 1]：按通道逆序写入 (3, H, W) 缓冲区"""
+    for c in range(3):
+        np.divide(src[:, :, 2 - c], 255.0, out=dst[c])
+
+
+def _bgr_to_chw_loop(src: np.ndarray, dst: np.ndarray) -> None:
+    """与 _bgr_to_chw_numpy 等价的逐像素循环，按行并行，供 Numba 编译
+
+    单次遍历画布即完成三个通道的写入，而非逐通道各跨步读取一遍。
+    """
+    height, width = src.shape[0], src.shape[1]
+    for y in prange(height):
+        for x in range(width):
+            for c in range(3):
+                dst[c, y, x] = src[y, x, 2 - c] / 255.0
+
+
+def _nms_cv2(
+    boxes: np.ndarray, scores: np.ndarray, areas: np.ndarray, iou_threshold: float
+) -> np.ndarray:
+    """基于 cv2.dnn.NMSBoxes 的贪心 NMS（C++ 实现，面积由 OpenCV 自行计算）"""
+    # 输入为 [x, y, w, h]
+    xywh = boxes.astype(np.float64)
+    xywh[:, 2:] -= xywh[:, :2]
+
+    # 面积为 0 的框（如被裁剪到图像边缘）与任何框的 IoU 均为 0，应全部保留；
+    # OpenCV 会将两个零面积框视为完全重叠，因此只对有效框做 NMS
+    valid = np.flatnonzero((xywh[:, 2] > 0) & (xywh[:, 3] > 0))
+    kept = cv2.dnn.NMSBoxes(
+        xywh[valid].tolist(), scores[valid].tolist(), 0.0, iou_threshold
+    )
+    keep = valid[np.asarray(kept, dtype=np.int64).reshape(-1)]
+    if len(valid) < len(boxes):
+        degenerate = np.setdiff1d(np.arange(len(boxes)), valid)
+        keep = np.concatenate([keep, degenerate])
+        keep = keep[np.argsort(-scores[keep], kind="stable")]
+    return keep
+
+
+def _nms_greedy(
+    boxes: np.ndarray, scores: np.ndarray, areas: np.ndarray, iou_threshold: float
+) -> np.ndarray:
+    """逐对计算 IoU 的贪心 NMS，循环内不分配数组，供 Numba 编译"""
+    n = boxes.shape[0]
+    order = np.argsort(scores)[::-1]
+    suppressed = np.zeros(n, dtype=np.bool_)
+    keep = np.empty(n, dtype=np.int64)
+    count = 0
+    for a in range(n):
+        i = order[a]
+        if suppressed[i]:
+            continue
+        keep[count] = i
+        count += 1
+        for b in range(a + 1, n):
+            j = order[b]
+            if suppressed[j]:
+                continue
+            w = max(0.0, min(boxes[i, 2], boxes[j, 2]) - max(boxes[i, 0], boxes[j, 0]))
+            h = max(0.0, min(boxes[i, 3], boxes[j, 3]) - max(boxes[i, 1], boxes[j, 1]))
+            intersection = w * h
+            iou = intersection / (areas[i] + areas[j] - intersection + 1e-6)
+            if iou > iou_threshold:
+                suppressed[j] = True
+    return keep[:count]
+
+
+def _nms_numpy(
+    boxes: np.ndarray, scores: np.ndarray, areas: np.ndarray, iou_threshold: float
+) -> np.ndarray:
+    """按分数逐个保留、向量化计算 IoU 的贪心 NMS（无可选依赖时的回退实现）"""
+    # 按分数降序排列
+    order = scores.argsort()[::-1]
+
+    keep = []
+    while len(order) > 0:
+        i = order[0]
+        keep.append(i)
+
+        if len(order) == 1:
+            break
+
+        # 计算当前框与其他框的 IoU
+        xx1 = np.maximum(boxes[i, 0], boxes[order[1:], 0])
+        yy1 = np.maximum(boxes[i, 1], boxes[order[1:], 1])
+        xx2 = np.minimum(boxes[i, 2], boxes[order[1:], 2])
+        yy2 = np.minimum(boxes[i, 3], boxes[order[1:], 3])
+
+        w = np.maximum(0, xx2 - xx1)
+        h = np.maximum(0, yy2 - yy1)
+        intersection = w * h
+
+        union = areas[i] + areas[order[1:]] - intersection
+
+        iou = intersection / (union + 1e-6)
+
+        # 保留 IoU 小于阈值的框
+        mask = iou <= iou_threshold
+        order = order[1:][mask]
+
+    return np.asarray(keep, dtype=np.int64)
+
+
+# 预处理实现：优先 Numba 并行内核，否则逐通道 NumPy 写入
+if njit is not None:
+    _bgr_to_chw = njit(parallel=True, cache=True)(_bgr_to_chw_loop)
+else:
+    _bgr_to_chw = _bgr_to_chw_numpy
+
+# NMS 实现：优先 OpenCV 原生实现，其次 Numba JIT，最后纯 NumPy
+if hasattr(cv2, "dnn") and hasattr(cv2.dnn, "NMSBoxes"):
+    _nms_impl = _nms_cv2
+elif njit is not None:
+    _nms_impl = njit(cache=True, fastmath=True)(_nms_greedy)
+else:
+    _nms_impl = _nms_numpy
+
 
 class ONNXInferenceEngine(InferenceEngine):
     """基于 ONNX Runtime 的推理引擎
@@ -24,9 +174,27 @@ class ONNXInferenceEngine(InferenceEngine):
     支持特性：
     - CPU/GPU 自动选择
     - 动态/静态输入尺寸
+    - 静态形状模型在 CUDA 上启用 CUDA Graph（捕获一次、逐帧重放）
     - 与 YOLO 引擎输出格式一致
+
+    启用 CUDA Graph 时，warmup() 之后每次 predict() 的输入形状必须保持不变
+    （本引擎始终将图像 letterbox 到模型输入尺寸，天然满足该条件）。
+
+    线程安全：预处理画布、输入缓冲区与绑定的输出数组跨调用复用，
+    predict() 以实例锁串行化预处理、推理与后处理（图像解码在锁外并发执行）；
+    直接调用 _preprocess / _run 的调用方须自行持有 inference_lock。
+    _run 返回的数组在下次推理前有效，需要保留时应自行拷贝。
     """
 
+    # ONNX 张量类型到 numpy dtype 的映射（用于预分配设备端输出）
+    _ORT_DTYPES: dict[str, type[np.generic]] = {
+        "tensor(float)": np.float32,
+        "tensor(float16)": np.float16,
+    }
+
+    # 单次推理的最大算子内线程数，避免多核设备上默认线程数造成的超额订阅
+    MAX_INTRA_OP_THREADS = 4
+
     # 默认类别名称（与训练数据集一致）
     DEFAULT_CLASS_NAMES: dict[int, str] = {
         0: "crack",
@@ -39,8 +207,10 @@ class ONNXInferenceEngine(InferenceEngine):
     def __init__(
         self,
         model_path: str | Path,
-        providers: list[str] | None = None,
+        providers: list[str | tuple[str, dict[str, Any]]] | None = None,
         class_names: dict[int, str] | None = None,
+        cuda_graph: bool = True,
+        prefer_int8: bool = False,
     ) -> None:
         """初始化 ONNX Runtime 推理引擎
 
@@ -49,6 +219,10 @@ class ONNXInferenceEngine(InferenceEngine):
             providers: 执行提供者列表，默认自动选择
                        例如: ["CUDAExecutionProvider", "CPUExecutionProvider"]
             class_names: 类别 ID 到名称的映射，默认使用内置定义
+            cuda_graph: 在 CUDA 上且输入/输出形状完全静态时启用 CUDA Graph
+            prefer_int8: 仅使用 CPU 执行时，若同目录存在 INT8 量化模型
+                         （<model>.int8.onnx，由 export_onnx.py --int8 生成）则改为加载它；
+                         量化会改变检测精度，须显式开启
 
         Raises:
             FileNotFoundError: 模型文件不存在
@@ -75,15 +249,52 @@ class ONNXInferenceEngine(InferenceEngine):
             else:
                 providers = ["CPUExecutionProvider"]
 
+        # CPU 上优先使用 INT8 量化模型：int8 点积指令（VNNI/dotprod）吞吐更高、模型更小
+        source_path = self.model_path
+        int8_path = self.model_path.with_suffix(".int8.onnx")
+        if (
+            prefer_int8
+            and self._provider_name(providers[0]) == "CPUExecutionProvider"
+            and not self.model_path.name.endswith((".int8.onnx", ".opt.onnx"))
+            and int8_path.exists()
+        ):
+            source_path = int8_path
+
         # 创建推理会话
         try:
             sess_options = ort.SessionOptions()
             sess_options.graph_optimization_level = (
                 ort.GraphOptimizationLevel.ORT_ENABLE_ALL
             )
+            sess_options.intra_op_num_threads = min(
+                os.cpu_count() or 1, self.MAX_INTRA_OP_THREADS
+            )
+            sess_options.inter_op_num_threads = 1
+            sess_options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+
+            # 图优化结果按执行提供者缓存到磁盘：首次加载时写出，
+            # 之后若缓存不旧于源模型则直接加载并关闭图优化，跳过重复的图重写；
+            # 直接指定的预优化模型同样关闭图优化
+            load_path = source_path
+            if source_path.name.endswith(".opt.onnx"):
+                sess_options.graph_optimization_level = (
+                    ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+                )
+            else:
+                cache_path = self._optimized_cache_path(source_path, providers)
+                if (
+                    cache_path.exists()
+                    and cache_path.stat().st_mtime_ns >= source_path.stat().st_mtime_ns
+                ):
+                    load_path = cache_path
+                    sess_options.graph_optimization_level = (
+                        ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+                    )
+                elif os.access(cache_path.parent, os.W_OK):
+                    sess_options.optimized_model_filepath = str(cache_path)
 
             self.session = ort.InferenceSession(
-                str(self.model_path),
+                str(load_path),
                 sess_options=sess_options,
                 providers=providers,
             )
@@ -91,18 +302,115 @@ class ONNXInferenceEngine(InferenceEngine):
             msg = f"ONNX 模型加载失败: {e}"
             raise RuntimeError(msg) from e
 
+        # 实际加载的模型文件（可能为 INT8 量化模型）
+        self.loaded_model_path = source_path
+        logger.info(
+            "ONNX 模型已加载: %s (执行提供者: %s)",
+            source_path,
+            self._provider_name(providers[0]),
+        )
+
         # 获取输入输出信息
         self.input_name = self.session.get_inputs()[0].name
         self.input_shape = self.session.get_inputs()[0].shape
+        # 以 --embed-preprocess 导出的模型接收 NHWC uint8 (BGR) 输入，
+        # 通道翻转、归一化与转置在图内（GPU 上）完成
+        self.embedded_preprocess = self.session.get_inputs()[0].type == "tensor(uint8)"
         self.output_names = [out.name for out in self.session.get_outputs()]
 
         # 类别名称
         self.class_names = class_names or self.DEFAULT_CLASS_NAMES
         self.num_classes = len(self.class_names)
+        self._build_label_table(self.class_names)
 
         # 记录使用的执行提供者
         self.providers = self.session.get_providers()
 
+        # 启用 IO 绑定：GPU 上输入/输出常驻显存，CPU 上（静态输入形状时）
+        # 直接绑定复用的主机输入缓冲区与预分配输出，均跨调用复用
+        self._ort = ort
+        self._device = "cuda" if self.providers[0] == "CUDAExecutionProvider" else "cpu"
+        self._static_input = all(isinstance(d, int) for d in self.input_shape)
+
+        # CUDA Graph 要求输入/输出地址与形状跨调用不变：仅在形状完全静态时
+        # 以相同配置重建会话开启图捕获，失败（如存在回退到 CPU 的节点）则保留原会话
+        self.cuda_graph = False
+        static_outputs = all(
+            isinstance(d, int) for out in self.session.get_outputs() for d in out.shape
+        )
+        if (
+            cuda_graph
+            and self._device == "cuda"
+            and self._static_input
+            and static_outputs
+        ):
+            # 优化结果已在首次创建会话时写出，重建时不再重复序列化
+            sess_options.optimized_model_filepath = ""
+            try:
+                self.session = ort.InferenceSession(
+                    str(load_path),
+                    sess_options=sess_options,
+                    providers=self._with_cuda_graph(providers),
+                )
+                self.cuda_graph = True
+            except Exception:
+                pass
+
+        self._io_binding: Any = None
+        # CPU 上绑定为输出的主机数组（全部输出均已绑定时才设置）
+        self._host_outputs: list[np.ndarray] | None = None
+        self._input_value: Any = None
+        self._input_key: tuple[tuple[int, ...], np.dtype] | None = None
+
+        # 预处理画布，跨调用复用
+        self._canvas: np.ndarray | None = None
+
+        # 串行化使用上述共享缓冲区的推理（预处理 -> 推理 -> 后处理）
+        self.inference_lock = threading.Lock()
+
+    @staticmethod
+    def _provider_name(provider: str | tuple[str, dict[str, Any]]) -> str:
+        """执行提供者名称（兼容带选项的 (name, options) 形式）"""
+        return provider[0] if isinstance(provider, tuple) else provider
+
+    @classmethod
+    def _optimized_cache_path(
+        cls, source_path: Path, providers: list[str | tuple[str, dict[str, Any]]]
+    ) -> Path:
+        """按首选执行提供者区分的预优化模型缓存路径，如 best.cpu.opt.onnx"""
+        return optimized_model_path(source_path, cls._provider_name(providers[0]))
+
+    @staticmethod
+    def _with_cuda_graph(
+        providers: list[str | tuple[str, dict[str, Any]]],
+    ) -> list[str | tuple[str, dict[str, Any]]]:
+        """为 CUDAExecutionProvider 追加 enable_cuda_graph 选项，保留其余配置"""
+        result: list[str | tuple[str, dict[str, Any]]] = []
+        for provider in providers:
+            name, options = provider if isinstance(provider, tuple) else (provider, {})
+            if name == "CUDAExecutionProvider":
+                provider = (name, {**options, "enable_cuda_graph": "1"})
+            result.append(provider)
+        return result
+
+    def _target_size(self) -> tuple[int, int]:
+        """模型输入尺寸 (height, width)，动态维度回退为 640"""
+        if len(self.input_shape) == 4:
+            # NCHW 的 H、W 在第 2、3 维；内嵌预处理的 NHWC 输入在第 1、2 维
+            h_dim, w_dim = (1, 2) if self.embedded_preprocess else (2, 3)
+            target_h = (
+                self.input_shape[h_dim]
+                if isinstance(self.input_shape[h_dim], int)
+                else 640
+            )
+            target_w = (
+                self.input_shape[w_dim]
+                if isinstance(self.input_shape[w_dim], int)
+                else 640
+            )
+            return target_h, target_w
+        return 640, 640
+
     def _preprocess(
         self, image: np.ndarray, target_size: tuple[int, int] = (640, 640)
     ) -> tuple[np.ndarray, tuple[int, int], tuple[float, float]]:
@@ -126,22 +434,38 @@ class ONNXInferenceEngine(InferenceEngine):
         # 缩放图像
         resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
 
-        # 创建目标尺寸的画布（填充灰色）
-        canvas = np.full((target_h, target_w, 3), 114, dtype=np.uint8)
-
-        # 将缩放后的图像放到画布中心
+        if self.embedded_preprocess:
+            # 模型内嵌预处理：画布即 NHWC uint8 输入缓冲区，letterbox 后直接送入
+            blob = self._ensure_input_buffer((1, target_h, target_w, 3), np.uint8)
+            canvas = blob[0]
+        else:
+            # 复用目标尺寸的画布，尺寸变化时才重新分配
+            canvas = self._canvas
+            if canvas is None or canvas.shape[:2] != (target_h, target_w):
+                canvas = np.empty((target_h, target_w, 3), dtype=np.uint8)
+                self._canvas = canvas
+        # 以灰色边框 letterbox 到画布中心：copyMakeBorder 直接写入复用的画布，
+        # 只填充边框区域，无需先整体填充再拷贝缩放结果
         pad_w = (target_w - new_w) // 2
         pad_h = (target_h - new_h) // 2
-        canvas[pad_h : pad_h + new_h, pad_w : pad_w + new_w] = resized
-
-        # BGR -> RGB
-        canvas = cv2.cvtColor(canvas, cv2.COLOR_BGR2RGB)
-
-        # HWC -> CHW, 归一化到 [0, 1]
-        blob = canvas.transpose(2, 0, 1).astype(np.float32) / 255.0
-
-        # 添加 batch 维度
-        blob = np.expand_dims(blob, axis=0)
+        cv2.copyMakeBorder(
+            resized,
+            pad_h,
+            target_h - new_h - pad_h,
+            pad_w,
+            target_w - new_w - pad_w,
+            cv2.BORDER_CONSTANT,
+            dst=canvas,
+            value=(114, 114, 114),
+        )
+
+        if self.embedded_preprocess:
+            return blob, (orig_h, orig_w), (scale, pad_w, pad_h)
+
+        # 单次写入完成 BGR->RGB、HWC->CHW、归一化到 [0, 1] 与 float32 转换：
+        # 按通道逆序直接写入复用的输入缓冲区（含 batch 维度），不再生成中间数组
+        blob = self._ensure_input_buffer((1, 3, target_h, target_w), np.float32)
+        _bgr_to_chw(canvas, blob[0])
 
         return blob, (orig_h, orig_w), (scale, pad_w, pad_h)
 
@@ -177,15 +501,13 @@ class ONNXInferenceEngine(InferenceEngine):
         boxes = predictions[:, :4]
         scores = predictions[:, 4:]
 
-        # 获取每个框的最大类别分数和类别 ID
-        max_scores = np.max(scores, axis=1)
-        class_ids = np.argmax(scores, axis=1)
-
-        # 置信度过滤
+        # 先按每个框的最大类别分数做置信度过滤，
+        # argmax 只在通常仅数十个的幸存框上计算，而非全部 anchor
+        max_scores = scores.max(axis=1)
         mask = max_scores > conf_threshold
         boxes = boxes[mask]
         max_scores = max_scores[mask]
-        class_ids = class_ids[mask]
+        class_ids = scores[mask].argmax(axis=1)
 
         if len(boxes) == 0:
             return []
@@ -208,36 +530,40 @@ class ONNXInferenceEngine(InferenceEngine):
         x2 = np.clip(x2, 0, orig_w)
         y2 = np.clip(y2, 0, orig_h)
 
-        # 组合 bbox
+        # 组合 bbox，并一次性计算面积供 NMS 复用
         bboxes = np.stack([x1, y1, x2, y2], axis=1)
+        areas = (x2 - x1) * (y2 - y1)
 
         # NMS
-        indices = self._nms(bboxes, max_scores, iou_threshold)
+        indices = self._nms(bboxes, max_scores, iou_threshold, areas)
 
-        # 构建检测结果
-        detections: list[dict[str, Any]] = []
-        for idx in indices:
-            cls_id = int(class_ids[idx])
-            class_name = self.class_names.get(cls_id, f"class_{cls_id}")
+        # 构建检测结果：类别名称、置信度与坐标均批量转换为 Python 对象
+        labels = self._lookup_labels(class_ids[indices])
+        confs = max_scores[indices].tolist()
+        boxes_out = bboxes[indices].tolist()
 
-            detection = {
-                "label": class_name,
-                "confidence": float(max_scores[idx]),
-                "bbox": [float(x) for x in bboxes[idx]],
-            }
-            detections.append(detection)
-
-        return detections
+        return [
+            {"label": label, "confidence": confidence, "bbox": bbox}
+            for label, confidence, bbox in zip(labels, confs, boxes_out, strict=True)
+        ]
 
     def _nms(
-        self, boxes: np.ndarray, scores: np.ndarray, iou_threshold: float
+        self,
+        boxes: np.ndarray,
+        scores: np.ndarray,
+        iou_threshold: float,
+        areas: np.ndarray | None = None,
     ) -> list[int]:
         """非极大值抑制 (NMS)
 
+        默认由 cv2.dnn.NMSBoxes 在 C++ 中完成；OpenCV 未编译 dnn 模块时
+        回退到 Numba JIT 编译的循环（已安装 numba）或 NumPy 实现。
+
         Args:
             boxes: 边界框 (N, 4) [x1, y1, x2, y2]
             scores: 置信度分数 (N,)
             iou_threshold: IoU 阈值
+            areas: 预先计算的框面积 (N,)，None 则在此计算
 
         Returns:
             保留的框索引列表
@@ -245,61 +571,110 @@ class ONNXInferenceEngine(InferenceEngine):
         if len(boxes) == 0:
             return []
 
-        # 按分数降序排列
-        order = scores.argsort()[::-1]
+        boxes = np.ascontiguousarray(boxes, dtype=np.float32)
+        scores = np.ascontiguousarray(scores, dtype=np.float32)
+        if areas is None:
+            areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+        areas = np.ascontiguousarray(areas, dtype=np.float32)
+        return _nms_impl(boxes, scores, areas, iou_threshold).tolist()
 
-        keep = []
-        while len(order) > 0:
-            i = order[0]
-            keep.append(i)
+    def create_io_binding(self) -> Any:
+        """创建 IO 绑定并预分配静态形状的设备端输出缓冲区
 
-            if len(order) == 1:
-                break
+        绑定对象在引擎生命周期内复用；输出形状完全静态时直接在设备上
+        预分配输出张量，之后每次推理不再分配输出内存。
+        CPU 上则直接绑定复用的 numpy 数组，推理结果原地写入，无需再拷贝。
 
-            # 计算当前框与其他框的 IoU
-            xx1 = np.maximum(boxes[i, 0], boxes[order[1:], 0])
-            yy1 = np.maximum(boxes[i, 1], boxes[order[1:], 1])
-            xx2 = np.minimum(boxes[i, 2], boxes[order[1:], 2])
-            yy2 = np.minimum(boxes[i, 3], boxes[order[1:], 3])
+        Returns:
+            onnxruntime.IOBinding 实例
+        """
+        if self._io_binding is not None:
+            return self._io_binding
+
+        binding = self.session.io_binding()
+        outputs = self.session.get_outputs()
+        host_outputs: list[np.ndarray] = []
+        for output in outputs:
+            dtype = self._ORT_DTYPES.get(output.type)
+            if dtype is None or not all(isinstance(d, int) for d in output.shape):
+                binding.bind_output(output.name, self._device)
+            elif self._device == "cpu":
+                array = np.empty(output.shape, dtype=dtype)
+                binding.bind_output(
+                    output.name, "cpu", 0, dtype, output.shape, array.ctypes.data
+                )
+                host_outputs.append(array)
+            else:
+                buffer = self._ort.OrtValue.ortvalue_from_shape_and_type(
+                    output.shape, dtype, self._device, 0
+                )
+                binding.bind_ortvalue_output(output.name, buffer)
 
-            w = np.maximum(0, xx2 - xx1)
-            h = np.maximum(0, yy2 - yy1)
-            intersection = w * h
+        if len(host_outputs) == len(outputs):
+            self._host_outputs = host_outputs
+        self._io_binding = binding
+        return binding
 
-            area_i = (boxes[i, 2] - boxes[i, 0]) * (boxes[i, 3] - boxes[i, 1])
-            area_others = (boxes[order[1:], 2] - boxes[order[1:], 0]) * (
-                boxes[order[1:], 3] - boxes[order[1:], 1]
-            )
-            union = area_i + area_others - intersection
+    def prepare_input(self, blob: np.ndarray) -> Any:
+        """将输入张量上传到设备端 OrtValue
 
-            iou = intersection / (union + 1e-6)
+        形状不变时原地更新已有的设备端张量，避免重复分配显存。
 
-            # 保留 IoU 小于阈值的框
-            mask = iou <= iou_threshold
-            order = order[1:][mask]
+        Args:
+            blob: 预处理后的输入 (1, 3, H, W)
 
-        return keep
+        Returns:
+            设备端 OrtValue
+        """
+        key = (blob.shape, blob.dtype)
+        if self._input_value is not None and self._input_key == key:
+            self._input_value.update_inplace(blob)
+        else:
+            self._input_value = self._ort.OrtValue.ortvalue_from_numpy(
+                blob, self._device, 0
+            )
+            self._input_key = key
+        return self._input_value
 
-    def predict(
-        self, image: Any, conf: float = 0.5, iou: float = 0.5
-    ) -> list[dict[str, Any]]:
-        """执行推理
+    def predict_bound(self, io_binding: Any) -> list[np.ndarray]:
+        """使用 IO 绑定执行推理
 
         Args:
-            image: 输入图像（支持多种格式）:
-                - numpy 数组 (HxWxC, BGR)
-                - 文件路径 (str/Path)
-                - 图像字节流 (bytes)
-            conf: 置信度阈值 (0.0 - 1.0)
-            iou: NMS IoU 阈值 (0.0 - 1.0)
+            io_binding: 已绑定输入/输出的 IOBinding
 
         Returns:
-            检测结果列表，每项包含：
-            - label: 类别名称
-            - confidence: 置信度
-            - bbox: [x1, y1, x2, y2] 像素坐标
+            主机内存中的模型输出列表；CPU 上输出已绑定到复用数组时直接返回这些数组，
+            内容在下次推理前有效
+        """
+        self.session.run_with_iobinding(io_binding)
+        if self._host_outputs is not None and io_binding is self._io_binding:
+            return self._host_outputs
+        return io_binding.copy_outputs_to_cpu()
+
+    def _run(self, blob: np.ndarray) -> list[np.ndarray]:
+        """执行一次前向推理
+
+        GPU 上始终走 IO 绑定；CPU 上输入形状静态时同样走 IO 绑定
+        （零拷贝绑定主机缓冲区 + 预分配输出），动态形状回退到 session.run。
+        """
+        if self._device == "cpu":
+            if not self._static_input:
+                return self.session.run(self.output_names, {self.input_name: blob})
+            binding = self.create_io_binding()
+            binding.bind_cpu_input(self.input_name, blob)
+            return self.predict_bound(binding)
+
+        binding = self.create_io_binding()
+        binding.bind_ortvalue_input(self.input_name, self.prepare_input(blob))
+        return self.predict_bound(binding)
+
+    @staticmethod
+    def _validate_thresholds(conf: float, iou: float) -> None:
+        """校验置信度与 IoU 阈值
+
+        Raises:
+            ValueError: 阈值不在 [0.0, 1.0] 范围内
         """
-        # 参数校验
         if not (0.0 <= conf <= 1.0):
             msg = f"置信度阈值应在 [0.0, 1.0] 范围内，实际: {conf}"
             raise ValueError(msg)
@@ -307,11 +682,23 @@ class ONNXInferenceEngine(InferenceEngine):
             msg = f"IoU 阈值应在 [0.0, 1.0] 范围内，实际: {iou}"
             raise ValueError(msg)
 
-        # 加载图像
+    @staticmethod
+    def _load_image(image: Any) -> np.ndarray:
+        """将支持的输入格式统一加载为 BGR numpy 数组
+
+        Args:
+            image: numpy 数组 (HxWxC, BGR)、文件路径 (str/Path) 或图像字节流
+
+        Returns:
+            BGR 图像
+
+        Raises:
+            RuntimeError: 图像解码或读取失败
+            TypeError: 不支持的图像类型
+        """
         if isinstance(image, bytes):
             try:
-                nparr = np.frombuffer(image, np.uint8)
-                image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+                image = decode_bgr(image)
                 if image is None:
                     msg = "无法解码图像字节流（可能不是有效的图像格式）"
                     raise RuntimeError(msg)
@@ -328,35 +715,66 @@ class ONNXInferenceEngine(InferenceEngine):
         elif not isinstance(image, np.ndarray):
             msg = f"不支持的图像类型: {type(image)}"
             raise TypeError(msg)
+        return image
+
+    def predict(
+        self, image: Any, conf: float = 0.5, iou: float = 0.5
+    ) -> list[dict[str, Any]]:
+        """执行推理
+
+        Args:
+            image: 输入图像（支持多种格式）:
+                - numpy 数组 (HxWxC, BGR)
+                - 文件路径 (str/Path)
+                - 图像字节流 (bytes)
+            conf: 置信度阈值 (0.0 - 1.0)
+            iou: NMS IoU 阈值 (0.0 - 1.0)
+
+        Returns:
+            检测结果列表，每项包含：
+            - label: 类别名称
+            - confidence: 置信度
+            - bbox: [x1, y1, x2, y2] 像素坐标
+        """
+        self._validate_thresholds(conf, iou)
 
         # 获取目标尺寸
-        if len(self.input_shape) == 4:
-            target_h = (
-                self.input_shape[2] if isinstance(self.input_shape[2], int) else 640
-            )
-            target_w = (
-                self.input_shape[3] if isinstance(self.input_shape[3], int) else 640
-            )
+        target_h, target_w = self._target_size()
+
+        # 字节流按目标尺寸解码：大尺寸 JPEG 直接在 DCT 域降采样
+        factor = 1
+        if isinstance(image, bytes):
+            decoded = decode_image(image, (target_h, target_w))
+            if decoded.image is None:
+                msg = "无法解码图像字节流（可能不是有效的图像格式）"
+                raise RuntimeError(msg)
+            image, full_shape, factor = decoded
         else:
-            target_h, target_w = 640, 640
+            image = self._load_image(image)
 
         try:
-            # 预处理
-            blob, orig_shape, preprocess_info = self._preprocess(
-                image, (target_h, target_w)
-            )
-
-            # 推理
-            outputs = self.session.run(self.output_names, {self.input_name: blob})
-
-            # 后处理
-            detections = self._postprocess(
-                outputs[0],
-                orig_shape,
-                preprocess_info,
-                conf,
-                iou,
-            )
+            with self.inference_lock:
+                # 预处理
+                blob, orig_shape, preprocess_info = self._preprocess(
+                    image, (target_h, target_w)
+                )
+                if factor > 1:
+                    # 坐标按全分辨率图像还原：缩放比例折算缩小倍数
+                    scale, pad_w, pad_h = preprocess_info
+                    preprocess_info = (scale / factor, pad_w, pad_h)
+                    orig_shape = full_shape
+
+                # 推理
+                outputs = self._run(blob)
+
+                # 后处理（读取复用的输出数组，须在锁内完成）
+                detections = self._postprocess(
+                    outputs[0],
+                    orig_shape,
+                    preprocess_info,
+                    conf,
+                    iou,
+                )
 
             return detections
 
@@ -367,15 +785,30 @@ class ONNXInferenceEngine(InferenceEngine):
     def warmup(self, imgsz: int = 640) -> None:
         """预热模型
 
-        在首次推理前执行，初始化 ONNX Runtime 会话。
+        在首次推理前执行，初始化 ONNX Runtime 会话并分配可复用的输入缓冲区。
+
+        启用 CUDA Graph 时，ONNX Runtime 在首次运行后捕获计算图，
+        因此这里连续运行两次，使捕获开销也发生在预热阶段。
 
         Args:
-            imgsz: 输入图像尺寸
+            imgsz: 输入图像尺寸（静态形状模型以模型输入尺寸为准）
         """
         try:
-            # 创建随机输入进行预热
-            dummy_input = np.random.rand(1, 3, imgsz, imgsz).astype(np.float32)
-            self.session.run(self.output_names, {self.input_name: dummy_input})
+            # 预先分配输入缓冲区（及 IO 绑定与设备端张量），
+            # 以灰色填充值进行推理；首次真实推理复用这些缓冲区
+            size = self._target_size() if self._static_input else (imgsz, imgsz)
+            with self.inference_lock:
+                if self.embedded_preprocess:
+                    dummy_input = self._ensure_input_buffer((1, *size, 3), np.uint8)
+                    dummy_input.fill(114)
+                else:
+                    # 经预处理内核填充灰色，同时完成 Numba 内核的首次编译
+                    dummy_input = self._ensure_input_buffer((1, 3, *size), np.float32)
+                    _bgr_to_chw(
+                        np.full((*size, 3), 114, dtype=np.uint8), dummy_input[0]
+                    )
+                for _ in range(2 if self.cuda_graph else 1):
+                    self._run(dummy_input)
         except Exception:
             # 预热失败不影响后续使用
             pass
@@ -388,10 +821,12 @@ class ONNXInferenceEngine(InferenceEngine):
         """
         return {
             "model_path": str(self.model_path),
+            "loaded_model_path": str(self.loaded_model_path),
             "num_classes": self.num_classes,
             "class_names": self.class_names,
             "input_name": self.input_name,
             "input_shape": self.input_shape,
             "output_names": self.output_names,
             "providers": self.providers,
+            "cuda_graph": self.cuda_graph,
         }
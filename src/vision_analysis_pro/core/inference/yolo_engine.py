@@ -6,9 +6,9 @@
 from pathlib import Path
 from typing import Any
 
-import cv2
 import numpy as np
 
+from ..preprocessing.decode import decode_image
 from .base import InferenceEngine
 
 
@@ -21,6 +21,9 @@ class YOLOInferenceEngine(InferenceEngine):
     - bbox: [x1, y1, x2, y2] 像素坐标 (list[float])
     """
 
+    # Ultralytics 默认推理尺寸，用于字节流的降采样解码
+    IMGSZ = 640
+
     def __init__(self, model_path: str | Path) -> None:
         """初始化 YOLO 推理引擎
 
@@ -51,6 +54,7 @@ class YOLOInferenceEngine(InferenceEngine):
         self.num_classes = self.model.model.nc if hasattr(self.model.model, "nc") else 5
         # 类别名称字典
         self.class_names = self.model.names
+        self._build_label_table(self.class_names)
 
     def predict(
         self, image: Any, conf: float = 0.5, iou: float = 0.5
@@ -81,15 +85,15 @@ class YOLOInferenceEngine(InferenceEngine):
             msg = f"IoU 阈值应在 [0.0, 1.0] 范围内，实际: {iou}"
             raise ValueError(msg)
 
-        # 如果是字节流，转换为 numpy 数组
+        # 如果是字节流，转换为 numpy 数组；大尺寸 JPEG 按推理尺寸在 DCT 域降采样解码
+        factor = 1
         if isinstance(image, bytes):
             try:
-                nparr = np.frombuffer(image, np.uint8)
-                decoded_image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-                if decoded_image is None:
+                decoded = decode_image(image, (self.IMGSZ, self.IMGSZ))
+                if decoded.image is None:
                     msg = "无法解码图像字节流（可能不是有效的图像格式）"
                     raise RuntimeError(msg)
-                image = decoded_image
+                image, (orig_h, orig_w), factor = decoded
             except RuntimeError:
                 # 重新抛出 RuntimeError
                 raise
@@ -107,22 +111,26 @@ class YOLOInferenceEngine(InferenceEngine):
                 if result.boxes is None or len(result.boxes) == 0:
                     continue
 
-                # 获取检测框、置信度、类别 ID
-                boxes = result.boxes.xyxy.cpu().numpy()  # [x1, y1, x2, y2]
-                confs = result.boxes.conf.cpu().numpy()
-                cls_ids = result.boxes.cls.cpu().numpy()
-
-                # 构建检测结果
-                for box, conf_val, cls_id in zip(boxes, confs, cls_ids, strict=True):
-                    cls_id_int = int(cls_id)
-                    class_name = self.class_names.get(cls_id_int, f"class_{cls_id_int}")
-
-                    detection = {
-                        "label": class_name,
-                        "confidence": float(conf_val),
-                        "bbox": [float(x) for x in box],  # [x1, y1, x2, y2]
-                    }
-                    detections.append(detection)
+                # 一次性取回检测框、置信度、类别 ID（单次设备->主机拷贝），
+                # 列布局与 Boxes 一致: [x1, y1, x2, y2, (track_id,) conf, cls]
+                data = result.boxes.data.cpu().numpy()
+                boxes = data[:, :4]
+                confs = data[:, -2]
+                cls_ids = data[:, -1].astype(np.int64)
+                if factor > 1:
+                    # 还原到全分辨率图像坐标
+                    boxes = boxes * factor
+                    np.clip(boxes[:, 0::2], 0, orig_w, out=boxes[:, 0::2])
+                    np.clip(boxes[:, 1::2], 0, orig_h, out=boxes[:, 1::2])
+
+                # 构建检测结果：类别名称查表、数值批量转换为 Python 对象
+                labels = self._lookup_labels(cls_ids)
+                detections.extend(
+                    {"label": label, "confidence": conf_val, "bbox": box}
+                    for label, conf_val, box in zip(
+                        labels, confs.tolist(), boxes.tolist(), strict=True
+                    )
+                )
 
             return detections
 
@@ -0,0 +1,164 @@
+"""图像字节流解码
+
+对远大于模型输入尺寸的 JPEG，利用 libjpeg 在 DCT 域的缩放能力
+（IMREAD_REDUCED_COLOR_2/4/8）直接解码出 1/2、1/4、1/8 尺寸的图像，
+省去全分辨率解码与随后大幅缩放的大部分开销。
+
+安装了 PyTurboJPEG 且能加载 libturbojpeg 时，JPEG 优先经由 TurboJPEG 解码
+（SIMD 哈夫曼解码，且省去 OpenCV 包装层的额外缓冲区拷贝），否则回退到 OpenCV。
+"""
+
+from math import ceil
+from typing import Any, NamedTuple
+
+import cv2
+import numpy as np
+
+# 可选：libjpeg-turbo 的 Python 绑定，解码与可视化编码共用同一实例
+try:
+    from turbojpeg import TJPF_BGR, TurboJPEG
+
+    JPEG_CODEC: Any = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    # 未安装绑定或找不到 libturbojpeg 动态库时回退到 OpenCV
+    JPEG_CODEC = None
+    TJPF_BGR = None
+
+# 缩小倍数 -> OpenCV 解码标志，按倍数从大到小排列
+_REDUCED_FLAGS = {
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+}
+
+# 不携带图像尺寸的 SOF 区间标记：DHT / JPG / DAC
+_NON_SOF_MARKERS = frozenset({0xC4, 0xC8, 0xCC})
+
+
+class DecodedImage(NamedTuple):
+    """解码结果
+
+    Attributes:
+        image: BGR 图像，解码失败为 None
+        orig_shape: 全分辨率图像尺寸 (height, width)
+        factor: 缩小倍数，原图坐标 = 解码图坐标 × factor
+    """
+
+    image: np.ndarray | None
+    orig_shape: tuple[int, int]
+    factor: int
+
+
+def jpeg_size(data: bytes) -> tuple[int, int] | None:
+    """从 JPEG 帧头 (SOFn) 读取图像尺寸，不解码像素
+
+    Args:
+        data: 图像字节流
+
+    Returns:
+        (height, width)，不是 JPEG 或帧头损坏时返回 None
+    """
+    header = _scan_jpeg_header(data)
+    return header[0] if header is not None else None
+
+
+def _scan_jpeg_header(data: bytes) -> tuple[tuple[int, int], bool] | None:
+    """扫描 JPEG 帧头之前的标记段
+
+    Returns:
+        ((height, width), 是否含 EXIF 段)，不是 JPEG 或帧头损坏时返回 None
+    """
+    if data[:2] != b"\xff\xd8":
+        return None
+
+    has_exif = False
+    i, n = 2, len(data)
+    while i + 4 <= n:
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:
+            # 填充字节
+            i += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:
+            # 无长度字段的独立标记
+            i += 2
+            continue
+        if 0xC0 <= marker <= 0xCF and marker not in _NON_SOF_MARKERS:
+            if i + 9 > n:
+                return None
+            height = int.from_bytes(data[i + 5 : i + 7], "big")
+            width = int.from_bytes(data[i + 7 : i + 9], "big")
+            return (height, width), has_exif
+        if marker == 0xE1 and data[i + 4 : i + 10] == b"Exif\x00\x00":
+            has_exif = True
+        i += 2 + int.from_bytes(data[i + 2 : i + 4], "big")
+    return None
+
+
+def _turbo_decode(data: bytes, factor: int) -> np.ndarray | None:
+    """使用 TurboJPEG 解码（可选 DCT 域缩放），失败返回 None"""
+    try:
+        return JPEG_CODEC.decode(
+            data, pixel_format=TJPF_BGR, scaling_factor=(1, factor)
+        )
+    except Exception:
+        return None
+
+
+def _pick_factor(size: tuple[int, int], target_size: tuple[int, int] | None) -> int:
+    """选择不超过 letterbox 缩放比例倒数的最大缩小倍数，无需缩小时返回 1"""
+    if target_size is None:
+        return 1
+    max_factor = max(size[0] / target_size[0], size[1] / target_size[1])
+    return next((f for f in _REDUCED_FLAGS if f <= max_factor), 1)
+
+
+def decode_image(
+    data: bytes, target_size: tuple[int, int] | None = None
+) -> DecodedImage:
+    """解码图像字节流，大尺寸 JPEG 按目标尺寸降采样解码
+
+    选择不超过 letterbox 缩放比例倒数的最大倍数，
+    保证降采样后的图像在缩放到目标尺寸时仍只缩小、不放大。
+
+    Args:
+        data: 图像字节流
+        target_size: 模型输入尺寸 (height, width)，None 则总是全分辨率解码
+
+    Returns:
+        DecodedImage
+    """
+    nparr = np.frombuffer(data, np.uint8)
+
+    header = _scan_jpeg_header(data)
+    if header is not None and min(header[0]) > 0:
+        (height, width), has_exif = header
+        factor = _pick_factor((height, width), target_size)
+
+        # TurboJPEG 不处理 EXIF 方向，含 EXIF 的图像交给 OpenCV 以保持一致的朝向
+        if JPEG_CODEC is not None and not has_exif:
+            image = _turbo_decode(data, factor)
+            if image is not None:
+                return DecodedImage(image, (height, width), factor)
+
+        if factor > 1:
+            image = cv2.imdecode(nparr, _REDUCED_FLAGS[factor])
+            if image is not None:
+                reduced = (ceil(height / factor), ceil(width / factor))
+                if image.shape[:2] == reduced:
+                    return DecodedImage(image, (height, width), factor)
+                if image.shape[:2] == reduced[::-1]:
+                    # 已按 EXIF 方向旋转
+                    return DecodedImage(image, (width, height), factor)
+            # 尺寸无法对应（不应发生）或解码失败，回退到全分辨率解码
+
+    image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    orig_shape = image.shape[:2] if image is not None else (0, 0)
+    return DecodedImage(image, orig_shape, 1)
+
+
+def decode_bgr(data: bytes) -> np.ndarray | None:
+    """全分辨率解码图像字节流为 BGR 数组，失败返回 None"""
+    return decode_image(data).image
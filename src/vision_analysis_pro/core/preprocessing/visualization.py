@@ -1,5 +1,6 @@
 """可视化工具：绘制检测框"""
 
+from functools import lru_cache
 from typing import Any
 
 import cv2
@@ -7,6 +8,51 @@ import numpy as np
 
 from vision_analysis_pro.categories import LABEL_COLORS
 
+from .decode import JPEG_CODEC, decode_bgr
+
+# 可视化结果的 JPEG 质量：85 相比默认 95 体积约减少 40%，视觉差异可忽略
+JPEG_QUALITY = 85
+
+# OpenCV 编码参数（复用，避免逐次构造）
+_CV2_JPEG_PARAMS = [
+    cv2.IMWRITE_JPEG_QUALITY,
+    JPEG_QUALITY,
+    cv2.IMWRITE_JPEG_OPTIMIZE,
+    1,
+    cv2.IMWRITE_JPEG_PROGRESSIVE,
+    0,
+]
+
+
+def _encode_jpeg(img: np.ndarray) -> bytes:
+    """将 BGR 图像编码为 JPEG，优先使用 TurboJPEG
+
+    Raises:
+        ValueError: 编码失败
+    """
+    if JPEG_CODEC is not None:
+        return JPEG_CODEC.encode(img, quality=JPEG_QUALITY)
+
+    success, encoded_img = cv2.imencode(".jpg", img, _CV2_JPEG_PARAMS)
+    if not success:
+        raise ValueError("图像编码失败")
+    return encoded_img.tobytes()
+
+
+@lru_cache(maxsize=1024)
+def _text_size(
+    text: str, font_scale: float, thickness: int
+) -> tuple[tuple[int, int], int]:
+    """计算标签文本尺寸，结果按文本缓存
+
+    标签文本为 "类别: 两位小数置信度"，取值组合有限（类别数 × 101），
+    视频流中逐帧重复出现，缓存后无需每个检测框都重新计算字体度量。
+
+    Returns:
+        ((文本宽度, 文本高度), 基线偏移)
+    """
+    return cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness)
+
 
 def draw_detections(
     image_bytes: bytes,
@@ -36,8 +82,7 @@ def draw_detections(
         ValueError: 图像解码失败
     """
     # 解码图像
-    nparr = np.frombuffer(image_bytes, np.uint8)
-    img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    img = decode_bgr(image_bytes)
 
     if img is None:
         raise ValueError("无法解码图像")
@@ -67,21 +112,21 @@ def draw_detections(
         text = f"{label}: {confidence:.2f}"
 
         # 计算文本大小以绘制背景
-        (text_width, text_height), baseline = cv2.getTextSize(
-            text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness
-        )
-
-        # 绘制文本背景（使用与框相同的颜色，半透明效果）
-        overlay = img.copy()
-        cv2.rectangle(
-            overlay,
-            (x1, y1 - text_height - baseline - 5),
-            (x1 + text_width, y1),
-            box_color,
-            -1,
-        )
-        # 混合透明度 0.6
-        cv2.addWeighted(overlay, 0.6, img, 0.4, 0, img)
+        (text_width, text_height), baseline = _text_size(text, font_scale, thickness)
+
+        # 绘制文本背景（使用与框相同的颜色，半透明效果）：
+        # 仅在标签背景区域内原地混合，不复制、不混合整帧
+        # （区域与 cv2.rectangle 填充一致，含两端点，并裁剪到图像范围内）
+        img_h, img_w = img.shape[:2]
+        top = max(y1 - text_height - baseline - 5, 0)
+        bottom = min(y1 + 1, img_h)
+        left = max(x1, 0)
+        right = min(x1 + text_width + 1, img_w)
+        if top < bottom and left < right:
+            roi = img[top:bottom, left:right]
+            patch = np.full_like(roi, box_color)
+            # 混合透明度 0.6
+            cv2.addWeighted(patch, 0.6, roi, 0.4, 0, dst=roi)
 
         # 绘制文本（白色）
         cv2.putText(
@@ -95,8 +140,4 @@ def draw_detections(
         )
 
     # 编码为 JPEG
-    success, encoded_img = cv2.imencode(".jpg", img)
-    if not success:
-        raise ValueError("图像编码失败")
-
-    return encoded_img.tobytes()
+    return _encode_jpeg(img)
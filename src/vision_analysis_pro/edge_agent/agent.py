@@ -4,27 +4,118 @@
 支持多种数据源、推理引擎和上报方式。
 """
 
+import asyncio
 import logging
 import os
 import signal
 import sys
 import threading
 import time
+from collections import deque
+from concurrent.futures import Future
+from contextlib import nullcontext
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from queue import Empty, Queue
 from typing import Any
 
-from ..core.inference import InferenceEngine, ONNXInferenceEngine, YOLOInferenceEngine
+from ..core.inference import (
+    BatchingInferenceEngine,
+    InferenceEngine,
+    ONNXInferenceEngine,
+    YOLOInferenceEngine,
+)
+from ..core.inference.base import configure_kernel_caches
 from ..logging_utils import configure_logging
 from .config import EdgeAgentConfig
 from .models import Detection, FrameData, InferenceResult, ReportPayload, ReportStatus
 from .reporters import create_reporter
-from .sources import create_source
+from .sources import FramePrefetcher, create_source
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class _InflightFrame:
+    """已提交给批处理引擎、尚未取回结果的帧
+
+    Attributes:
+        frame: 帧数据
+        future: 批处理引擎返回的 Future
+        submitted: 提交时刻 (perf_counter)
+        finished: 推理完成时刻 (perf_counter)，由 Future 完成回调写入
+    """
+
+    frame: FrameData
+    future: Future
+    submitted: float
+    finished: float = 0.0
+
+
+def _ensure_dynamic_int8(model_path: Path) -> Path | None:
+    """确保模型旁存在 INT8 动态量化模型，不存在或已过期时生成
+
+    量化结果写入 <model>.dyn-int8.onnx，与 export_onnx.py --int8 的静态量化模型
+    <model>.int8.onnx 区分；已存在且不早于原模型时直接复用。
+    动态量化仅面向 CPU 执行，CUDA 可用时不做量化。
+
+    Args:
+        model_path: FP32 ONNX 模型路径
+
+    Returns:
+        INT8 模型路径；跳过或量化失败时返回 None（继续使用原模型）
+    """
+    try:
+        import onnxruntime as ort
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+    except ImportError:
+        logger.warning("onnxruntime.quantization 不可用，跳过 INT8 动态量化")
+        return None
+
+    if "CUDAExecutionProvider" in ort.get_available_providers():
+        logger.info("CUDA 可用，跳过 INT8 动态量化，使用原模型")
+        return None
+
+    int8_path = model_path.with_suffix(".dyn-int8.onnx")
+    if int8_path.exists() and int8_path.stat().st_mtime >= model_path.stat().st_mtime:
+        return int8_path
+
+    logger.info(f"INT8 动态量化: {model_path} -> {int8_path}")
+    # 先写入临时文件再替换，避免中断时留下不完整的模型被后续运行加载
+    tmp_path = int8_path.with_name(f"{int8_path.name}.tmp")
+    try:
+        quantize_dynamic(model_path, tmp_path, weight_type=QuantType.QUInt8)
+        tmp_path.replace(int8_path)
+    except Exception as e:
+        tmp_path.unlink(missing_ok=True)
+        logger.warning(f"INT8 动态量化失败，使用原模型: {e}")
+        return None
+    return int8_path
+
+
+def _pin_current_thread(cores: list[int], role: str) -> None:
+    """将当前线程绑定到指定 CPU 核心
+
+    Linux 上 sched_setaffinity(0, ...) 只作用于调用线程，之后由该线程创建的线程
+    （如 ONNX Runtime 线程池）继承同一设置。非 Linux 平台或绑定失败时仅记录日志。
+
+    Args:
+        cores: CPU 核心编号，空列表表示不绑定
+        role: 线程角色，用于日志
+    """
+    if not cores:
+        return
+    if not hasattr(os, "sched_setaffinity"):
+        logger.warning(f"当前平台不支持 CPU 亲和性设置，忽略 {role} 线程绑定")
+        return
+    try:
+        os.sched_setaffinity(0, cores)
+    except OSError as e:
+        logger.warning(f"{role} 线程绑定 CPU {cores} 失败: {e}")
+    else:
+        logger.info(f"{role} 线程已绑定 CPU: {sorted(set(cores))}")
+
+
 class EdgeAgent:
     """边缘设备推理 Agent
 
@@ -71,12 +162,19 @@ class EdgeAgent:
 
         # 内部状态
         self._running = False
+        self._config_validated = False
         self._stop_event = threading.Event()
         self._inference_engine: InferenceEngine | None = None
-        self._report_queue: Queue[ReportPayload] = Queue()
+        # 上报队列：主循环是唯一生产者、上报线程是唯一消费者，
+        # deque 的 append/popleft 本身线程安全，Event 仅用于唤醒上报协程
+        self._report_queue: deque[ReportPayload] = deque()
+        self._report_loop: asyncio.AbstractEventLoop | None = None
+        self._report_wakeup: asyncio.Event | None = None
+        self._report_closing = False
         self._reporter_thread: threading.Thread | None = None
 
-        # 统计信息
+        # 统计信息；时间戳以 epoch 秒保存，仅在 get_stats() 时格式化
+        self._start_monotonic: float | None = None
         self._stats = {
             "frames_processed": 0,
             "detections_total": 0,
@@ -110,6 +208,15 @@ class EdgeAgent:
 
         # 设置 edge_agent 模块日志级别
         logging.getLogger("vision_analysis_pro.edge_agent").setLevel(log_level)
+        self._refresh_log_levels()
+
+    def _refresh_log_levels(self) -> None:
+        """缓存逐帧/逐条日志是否启用，日志级别变化后需重新调用
+
+        热路径日志先判断缓存的开关，级别不够时不构造日志参数与格式化字符串。
+        """
+        self._log_debug = logger.isEnabledFor(logging.DEBUG)
+        self._log_info = logger.isEnabledFor(logging.INFO)
 
     def _update_reporter_stats(self, reporter: Any) -> None:
         """将 reporter 运行统计同步到 Agent 状态。"""
@@ -152,6 +259,9 @@ class EdgeAgent:
         logger.info(f"创建推理引擎: {engine_type}, 模型: {model_path}")
 
         if engine_type == "onnx":
+            # 仅在显式配置动态量化时加载量化模型
+            if self.config.inference.quantize == "dynamic":
+                model_path = _ensure_dynamic_int8(model_path) or model_path
             engine = ONNXInferenceEngine(model_path)
         elif engine_type == "yolo":
             engine = YOLOInferenceEngine(model_path)
@@ -165,8 +275,27 @@ class EdgeAgent:
             logger.info("预热推理引擎...")
             engine.warmup()
 
+        # 动态合批：由批处理引擎把一组帧合并为一次推理
+        max_batch_size = self.config.inference.max_batch_size
+        if max_batch_size > 1:
+            if isinstance(engine, ONNXInferenceEngine):
+                engine = BatchingInferenceEngine(
+                    engine,
+                    max_batch_size=max_batch_size,
+                    max_wait_ms=self.config.inference.max_wait_ms,
+                )
+            else:
+                logger.warning(f"{engine_type} 引擎不支持动态合批，逐帧推理")
+
         return engine
 
+    def _batch_capacity(self) -> int:
+        """主循环单次凑批的最大帧数（未启用合批时为 1）"""
+        engine = self._inference_engine
+        if isinstance(engine, BatchingInferenceEngine):
+            return engine.max_batch_size
+        return 1
+
     def _run_inference(self, frame: FrameData) -> InferenceResult:
         """执行推理
 
@@ -189,7 +318,70 @@ class EdgeAgent:
         )
 
         inference_time_ms = (time.perf_counter() - start_time) * 1000
+        return self._build_result(frame, raw_results, inference_time_ms)
+
+    def _submit_inference(self, frame: FrameData) -> _InflightFrame:
+        """将帧提交给批处理引擎，不等待结果
+
+        凑批等待由批处理引擎的后台线程按 max_wait_ms 计时，
+        主循环无需自行计时，也不会在引擎之外再多等一轮。
+
+        Args:
+            frame: 帧数据
+
+        Returns:
+            在途帧，通过 _finish_inference 取回结果
+        """
+        engine = self._inference_engine
+        if not isinstance(engine, BatchingInferenceEngine):
+            raise RuntimeError("批处理推理引擎未初始化")
+
+        submitted = time.perf_counter()
+        future = engine.submit(
+            frame.image,
+            conf=self.config.inference.confidence,
+            iou=self.config.inference.iou,
+        )
+        item = _InflightFrame(frame, future, submitted)
+
+        def _mark_finished(_future: Future) -> None:
+            item.finished = time.perf_counter()
+
+        future.add_done_callback(_mark_finished)
+        return item
+
+    def _finish_inference(self, item: _InflightFrame) -> InferenceResult | None:
+        """等待在途帧的推理结果，规则同 _process_frame
+
+        Args:
+            item: _submit_inference 返回的在途帧
+
+        Returns:
+            推理结果，推理耗时为提交到批次完成的时间（含凑批等待）
+        """
+        raw_results = item.future.result()
+        # 完成回调可能晚于 result() 返回执行，此时以当前时刻近似
+        finished = item.finished or time.perf_counter()
+        inference_time_ms = (finished - item.submitted) * 1000
+        result = self._build_result(item.frame, raw_results, inference_time_ms)
+        return self._record_result(item.frame, result)
+
+    def _build_result(
+        self,
+        frame: FrameData,
+        raw_results: list[dict[str, Any]],
+        inference_time_ms: float,
+    ) -> InferenceResult:
+        """将引擎输出转换为推理结果
+
+        Args:
+            frame: 帧数据
+            raw_results: 引擎返回的检测列表
+            inference_time_ms: 推理耗时（毫秒）
 
+        Returns:
+            推理结果
+        """
         # 转换结果格式
         detections = [
             Detection(
@@ -209,68 +401,169 @@ class EdgeAgent:
             metadata=frame.metadata,
         )
 
+    def _enqueue_report(self, payload: ReportPayload) -> None:
+        """将上报数据放入队列并唤醒上报协程"""
+        self._report_queue.append(payload)
+        self._wake_reporter()
+        self._stats["report_queue_max"] = max(
+            self._stats["report_queue_max"],
+            len(self._report_queue),
+        )
+
+    def _wake_reporter(self) -> None:
+        """从其他线程唤醒上报协程"""
+        loop = self._report_loop
+        wakeup = self._report_wakeup
+        if loop is None or wakeup is None:
+            return
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            # 上报线程已退出、事件循环已关闭
+            pass
+
+    def _start_reporter(self) -> None:
+        """创建上报事件循环并启动上报线程"""
+        self._report_closing = False
+        self._report_loop = asyncio.new_event_loop()
+        self._report_wakeup = asyncio.Event()
+        self._reporter_thread = threading.Thread(
+            target=self._reporter_worker,
+            name="reporter-worker",
+            daemon=True,
+        )
+        self._reporter_thread.start()
+
+    def _stop_reporter(self) -> None:
+        """通知上报线程处理完队列中剩余数据（含在途请求）后退出，并等待其结束"""
+        self._report_closing = True
+        self._wake_reporter()
+        if self._reporter_thread and self._reporter_thread.is_alive():
+            if self._report_queue:
+                logger.info(
+                    f"等待上报队列处理完成 ({len(self._report_queue)} 条待处理)"
+                )
+            self._reporter_thread.join()
+
     def _reporter_worker(self) -> None:
         """上报工作线程
 
-        从队列中取出数据并上报到云端。
+        在独立的事件循环中运行上报协程，上报器的生命周期（连接、断开）
+        与该事件循环绑定在同一线程内。
         """
         logger.info("上报工作线程启动")
+        _pin_current_thread(self.config.reporter.cpu_affinity, "上报")
+
+        loop = self._report_loop
+        if loop is None:
+            raise RuntimeError("上报事件循环未创建")
+        asyncio.set_event_loop(loop)
 
         reporter = create_reporter(
             self.config.reporter,
             self.config.cache if self.config.cache.enabled else None,
         )
 
-        with reporter:
-            last_flush_time = time.time()
+        try:
+            with reporter:
+                loop.run_until_complete(self._reporter_main(reporter))
+        finally:
+            loop.close()
 
-            while not self._stop_event.is_set():
-                try:
-                    # 尝试从队列获取数据
-                    payload = self._report_queue.get(timeout=1.0)
+        logger.info("上报工作线程停止")
 
-                    # 上报
-                    status = reporter.report_sync(payload)
+    async def _reporter_main(self, reporter: Any) -> None:
+        """上报协程主循环
 
-                    if status == ReportStatus.SUCCESS:
-                        self._stats["reports_sent"] += 1
-                        logger.debug(
-                            f"上报成功: {payload.batch_id} "
-                            f"({payload.total_detections} 检测)"
-                        )
-                    elif status == ReportStatus.CACHED:
-                        self._stats["reports_cached"] += 1
-                        logger.debug(f"上报已缓存: {payload.batch_id}")
-                    else:
-                        self._stats["reports_failed"] += 1
-                        logger.warning(f"上报失败: {payload.batch_id}")
+        被唤醒后为队列中的每条数据创建上报任务，最多 max_inflight 个请求同时在途，
+        使网络往返与主循环的推理重叠；空闲时一直休眠到下一次缓存刷新。
 
-                    self._update_reporter_stats(reporter)
+        Args:
+            reporter: 已连接的上报器
+        """
+        wakeup = self._report_wakeup
+        if wakeup is None:
+            raise RuntimeError("上报唤醒事件未创建")
+
+        inflight = asyncio.Semaphore(self.config.reporter.max_inflight)
+        tasks: set[asyncio.Task[None]] = set()
+        flush_interval = self.config.cache.flush_interval
+        next_flush = time.monotonic() + flush_interval
+
+        while True:
+            # 等待新数据或下一次缓存刷新的截止时间
+            timeout = next_flush - time.monotonic()
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=max(timeout, 0.0))
+            except TimeoutError:
+                pass
+            wakeup.clear()
+
+            while self._report_queue:
+                # 在途请求已满时等待，形成背压
+                await inflight.acquire()
+                task = asyncio.create_task(
+                    self._report_payload(
+                        reporter, self._report_queue.popleft(), inflight
+                    )
+                )
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
 
-                    self._report_queue.task_done()
+            # 主循环结束且队列已清空时退出（先读标志再检查队列，
+            # 标志置位前入队的数据不会遗漏）
+            if self._report_closing and not self._report_queue:
+                break
 
-                except Empty:
-                    pass
+            # 定期刷新缓存
+            if time.monotonic() >= next_flush:
+                flushed = await reporter.flush_cache()
+                if flushed > 0:
+                    self._stats["reports_sent"] += flushed
+                    self._stats["reports_flushed"] += flushed
+                    logger.info(f"缓存刷新: {flushed} 条成功")
 
-                # 定期刷新缓存
-                current_time = time.time()
-                if current_time - last_flush_time >= self.config.cache.flush_interval:
-                    if hasattr(reporter, "flush_cache_sync"):
-                        flushed = reporter.flush_cache_sync()
-                        if flushed > 0:
-                            self._stats["reports_sent"] += flushed
-                            self._stats["reports_flushed"] += flushed
-                            logger.info(f"缓存刷新: {flushed} 条成功")
+                # 清理过期缓存
+                reporter.cleanup_cache()
 
-                    # 清理过期缓存
-                    if hasattr(reporter, "cleanup_cache"):
-                        reporter.cleanup_cache()
+                self._update_reporter_stats(reporter)
 
-                    self._update_reporter_stats(reporter)
+                next_flush = time.monotonic() + flush_interval
 
-                    last_flush_time = current_time
+        # 等待在途请求完成
+        if tasks:
+            await asyncio.gather(*tasks)
 
-        logger.info("上报工作线程停止")
+    async def _report_payload(
+        self,
+        reporter: Any,
+        payload: ReportPayload,
+        inflight: asyncio.Semaphore,
+    ) -> None:
+        """上报单条数据并更新统计，完成后释放在途名额"""
+        try:
+            status = await reporter.report(payload)
+        except Exception as e:
+            logger.error(f"上报异常: {payload.batch_id}: {e}")
+            status = ReportStatus.FAILED
+        finally:
+            inflight.release()
+
+        if status == ReportStatus.SUCCESS:
+            self._stats["reports_sent"] += 1
+            if self._log_debug:
+                logger.debug(
+                    "上报成功: %s (%d 检测)", payload.batch_id, payload.total_detections
+                )
+        elif status == ReportStatus.CACHED:
+            self._stats["reports_cached"] += 1
+            if self._log_debug:
+                logger.debug("上报已缓存: %s", payload.batch_id)
+        else:
+            self._stats["reports_failed"] += 1
+            logger.warning(f"上报失败: {payload.batch_id}")
+
+        self._update_reporter_stats(reporter)
 
     def _process_frame(self, frame: FrameData) -> InferenceResult | None:
         """处理单帧
@@ -281,27 +574,34 @@ class EdgeAgent:
         Returns:
             推理结果，如果配置为仅上报有检测的帧且无检测则返回 None
         """
-        # 执行推理
-        result = self._run_inference(frame)
+        return self._record_result(frame, self._run_inference(frame))
 
+    def _record_result(
+        self, frame: FrameData, result: InferenceResult
+    ) -> InferenceResult | None:
+        """更新统计与日志，并按配置过滤无检测的结果"""
         # 更新统计
         self._stats["frames_processed"] += 1
         self._stats["detections_total"] += result.detection_count
         self._stats["inference_count"] += 1
         self._stats["inference_time_ms_total"] += result.inference_time_ms
         self._stats["last_inference_time_ms"] = round(result.inference_time_ms, 2)
-        self._stats["last_frame_time"] = datetime.now().isoformat()
+        self._stats["last_frame_time"] = time.time()
 
         # 日志
         if result.has_detections:
-            logger.info(
-                f"帧 {frame.frame_id}: 检测到 {result.detection_count} 个目标 "
-                f"(推理耗时: {result.inference_time_ms:.1f}ms)"
-            )
-        else:
+            if self._log_info:
+                logger.info(
+                    "帧 %d: 检测到 %d 个目标 (推理耗时: %.1fms)",
+                    frame.frame_id,
+                    result.detection_count,
+                    result.inference_time_ms,
+                )
+        elif self._log_debug:
             logger.debug(
-                f"帧 {frame.frame_id}: 无检测 "
-                f"(推理耗时: {result.inference_time_ms:.1f}ms)"
+                "帧 %d: 无检测 (推理耗时: %.1fms)",
+                frame.frame_id,
+                result.inference_time_ms,
             )
 
         # 根据配置决定是否返回结果
@@ -321,29 +621,31 @@ class EdgeAgent:
         if self._running:
             raise RuntimeError("Agent 已在运行")
 
-        # 验证配置
-        errors = self.config.validate()
-        if errors:
-            for error in errors:
-                logger.error(f"配置错误: {error}")
-            raise ValueError(f"配置验证失败: {errors}")
+        # 验证配置（同一实例只验证一次，重复 run() 不再重复访问模型与数据源路径）
+        if not self._config_validated:
+            errors = self.config.validate()
+            if errors:
+                for error in errors:
+                    logger.error(f"配置错误: {error}")
+                raise ValueError(f"配置验证失败: {errors}")
+            self._config_validated = True
 
         logger.info("Edge Agent 启动中...")
+        self._refresh_log_levels()
         self._running = True
         self._stop_event.clear()
-        self._stats["start_time"] = datetime.now().isoformat()
+        self._stats["start_time"] = time.time()
+        self._start_monotonic = time.monotonic()
+
+        # 先绑定主线程，推理引擎随后创建的线程池继承该 CPU 亲和性
+        _pin_current_thread(self.config.inference.cpu_affinity, "推理")
 
         try:
             # 创建推理引擎
             self._inference_engine = self._create_inference_engine()
 
             # 启动上报线程
-            self._reporter_thread = threading.Thread(
-                target=self._reporter_worker,
-                name="reporter-worker",
-                daemon=True,
-            )
-            self._reporter_thread.start()
+            self._start_reporter()
 
             # 创建数据源
             source = create_source(self.config.source, self.config.device_id)
@@ -352,40 +654,68 @@ class EdgeAgent:
             results_buffer: list[InferenceResult] = []
             last_report_time = time.time()
 
-            with source:
+            # 动态合批：帧到达即提交给批处理引擎，由引擎按批大小与等待时限凑批；
+            # 在途帧达到批容量时等待最早的结果，其余仅回收已完成的结果
+            batching = isinstance(self._inference_engine, BatchingInferenceEngine)
+            batch_capacity = self._batch_capacity()
+            inflight: deque[_InflightFrame] = deque()
+
+            def handle_result(result: InferenceResult | None) -> None:
+                nonlocal last_report_time, results_buffer
+
+                if result is not None:
+                    results_buffer.append(result)
+
+                # 检查是否需要上报
+                should_report = len(
+                    results_buffer
+                ) >= self.config.reporter.batch_size or (
+                    results_buffer
+                    and time.time() - last_report_time
+                    >= self.config.reporter.batch_interval
+                )
+
+                if should_report:
+                    # 缓冲区整体移交给载荷，换用新列表继续累积，无需拷贝
+                    payload = ReportPayload(
+                        device_id=self.config.device_id,
+                        results=results_buffer,
+                    )
+                    self._enqueue_report(payload)
+                    results_buffer = []
+                    last_report_time = time.time()
+
+            # 帧预取：后台线程读取/解码下一帧，与当前帧推理重叠；
+            # 预取器先于数据源退出，保证关闭数据源时预取线程已停止
+            prefetch = self.config.source.prefetch
+            frame_stream = (
+                FramePrefetcher(source, prefetch)
+                if prefetch > 0
+                else nullcontext(source)
+            )
+
+            with source, frame_stream as frames:
                 logger.info(f"数据源已打开: {source.get_info()}")
 
-                for frame in source:
+                for frame in frames:
                     if self._stop_event.is_set():
                         logger.info("收到停止信号，退出主循环")
                         break
 
                     # 处理帧
-                    result = self._process_frame(frame)
-                    if result is not None:
-                        results_buffer.append(result)
-
-                    # 检查是否需要上报
-                    should_report = len(
-                        results_buffer
-                    ) >= self.config.reporter.batch_size or (
-                        results_buffer
-                        and time.time() - last_report_time
-                        >= self.config.reporter.batch_interval
-                    )
+                    if not batching:
+                        handle_result(self._process_frame(frame))
+                        continue
 
-                    if should_report:
-                        payload = ReportPayload(
-                            device_id=self.config.device_id,
-                            results=results_buffer.copy(),
-                        )
-                        self._report_queue.put(payload)
-                        self._stats["report_queue_max"] = max(
-                            self._stats["report_queue_max"],
-                            self._report_queue.qsize(),
-                        )
-                        results_buffer.clear()
-                        last_report_time = time.time()
+                    inflight.append(self._submit_inference(frame))
+                    while inflight and (
+                        len(inflight) > batch_capacity or inflight[0].future.done()
+                    ):
+                        handle_result(self._finish_inference(inflight.popleft()))
+
+                # 取回已提交但尚未处理的帧
+                while inflight:
+                    handle_result(self._finish_inference(inflight.popleft()))
 
                 # 处理剩余的结果
                 if results_buffer:
@@ -393,11 +723,7 @@ class EdgeAgent:
                         device_id=self.config.device_id,
                         results=results_buffer,
                     )
-                    self._report_queue.put(payload)
-                    self._stats["report_queue_max"] = max(
-                        self._stats["report_queue_max"],
-                        self._report_queue.qsize(),
-                    )
+                    self._enqueue_report(payload)
 
             logger.info("数据源处理完成")
 
@@ -415,18 +741,13 @@ class EdgeAgent:
         """清理资源"""
         logger.info("正在清理资源...")
 
-        # 等待上报队列处理完成
-        if not self._report_queue.empty():
-            logger.info(f"等待上报队列处理完成 ({self._report_queue.qsize()} 条待处理)")
-            try:
-                self._report_queue.join()
-            except Exception:
-                pass
-
-        # 停止上报线程
+        # 停止上报线程（先处理完队列中剩余数据）
         self._stop_event.set()
-        if self._reporter_thread and self._reporter_thread.is_alive():
-            self._reporter_thread.join(timeout=5.0)
+        self._stop_reporter()
+
+        # 停止批处理线程
+        if isinstance(self._inference_engine, BatchingInferenceEngine):
+            self._inference_engine.close()
 
         self._running = False
         self._inference_engine = None
@@ -458,11 +779,15 @@ class EdgeAgent:
         """
         stats = self._stats.copy()
         stats["is_running"] = self._running
-        stats["queue_size"] = self._report_queue.qsize()
+        stats["queue_size"] = len(self._report_queue)
+
+        for key in ("start_time", "last_frame_time"):
+            if stats[key] is not None:
+                stats[key] = datetime.fromtimestamp(stats[key]).isoformat()
 
-        if stats["start_time"]:
-            start = datetime.fromisoformat(stats["start_time"])
-            elapsed = (datetime.now() - start).total_seconds()
+        if self._start_monotonic is not None:
+            # 单调时钟计算运行时长，不受 NTP 校时等系统时间跳变影响
+            elapsed = time.monotonic() - self._start_monotonic
             stats["elapsed_seconds"] = round(elapsed, 2)
 
             if elapsed > 0:
@@ -536,6 +861,9 @@ def main() -> None:
 
         os.environ["EDGE_AGENT_LOG_LEVEL"] = "DEBUG"
 
+    # 加载模型前配置 GPU 内核持久化缓存
+    configure_kernel_caches()
+
     try:
         agent = EdgeAgent(config_path=args.config)
         agent.run()
@@ -13,10 +13,16 @@ import yaml
 
 from .models import SourceType
 
+# 优先使用 libyaml 实现的 C 解析器，PyYAML 未链接 libyaml 时回退到纯 Python 实现
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class KeyframeSelectionConfig:
     """视频关键帧选择配置"""
 
@@ -39,7 +45,7 @@ class KeyframeSelectionConfig:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class SourceConfig:
     """数据源配置
 
@@ -51,6 +57,7 @@ class SourceConfig:
         skip_frames: 跳帧数，0 表示不跳帧
         extensions: 支持的图像扩展名（仅对文件夹有效）
         keyframes: 视频关键帧选择配置（仅对 video 有效）
+        prefetch: 后台预取的帧数，使帧读取/解码与推理重叠；默认 0 表示在主循环中串行读取
     """
 
     type: SourceType = SourceType.VIDEO
@@ -62,6 +69,7 @@ class SourceConfig:
         default_factory=lambda: [".jpg", ".jpeg", ".png", ".bmp"]
     )
     keyframes: KeyframeSelectionConfig = field(default_factory=KeyframeSelectionConfig)
+    prefetch: int = 0
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "SourceConfig":
@@ -78,10 +86,11 @@ class SourceConfig:
             skip_frames=int(data.get("skip_frames", 0)),
             extensions=data.get("extensions", [".jpg", ".jpeg", ".png", ".bmp"]),
             keyframes=KeyframeSelectionConfig.from_dict(data.get("keyframes", {})),
+            prefetch=int(data.get("prefetch", 0)),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class InferenceConfig:
     """推理配置
 
@@ -92,6 +101,10 @@ class InferenceConfig:
         iou: IoU 阈值
         device: 推理设备 (cpu, cuda, mps)
         warmup: 是否预热模型
+        max_batch_size: 单次推理合并的最大帧数，1 表示逐帧推理（仅 onnx 引擎支持合批）
+        max_wait_ms: 凑批等待时间上限（毫秒）
+        cpu_affinity: 主线程（推理）绑定的 CPU 核心编号，空列表表示不绑定
+        quantize: 启动时对 ONNX 模型做 INT8 量化 (none, dynamic)，仅 CPU 执行时生效
     """
 
     engine: str = "onnx"
@@ -100,6 +113,10 @@ class InferenceConfig:
     iou: float = 0.5
     device: str = "cpu"
     warmup: bool = True
+    max_batch_size: int = 1
+    max_wait_ms: float = 5.0
+    cpu_affinity: list[int] = field(default_factory=list)
+    quantize: str = "none"
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "InferenceConfig":
@@ -111,10 +128,14 @@ class InferenceConfig:
             iou=float(data.get("iou", 0.5)),
             device=str(data.get("device", "cpu")),
             warmup=bool(data.get("warmup", True)),
+            max_batch_size=int(data.get("max_batch_size", 1)),
+            max_wait_ms=float(data.get("max_wait_ms", 5.0)),
+            cpu_affinity=[int(c) for c in data.get("cpu_affinity") or []],
+            quantize=str(data.get("quantize", "none")).lower(),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ReporterConfig:
     """上报器配置
 
@@ -128,6 +149,9 @@ class ReporterConfig:
         retry_backoff: 重试退避倍数
         batch_size: 批量上报大小
         batch_interval: 批量上报间隔 (秒)
+        max_inflight: 同时在途的上报请求数上限
+        compression: 请求体压缩算法 (none, gzip, zstd)
+        cpu_affinity: 上报线程绑定的 CPU 核心编号，空列表表示不绑定
     """
 
     type: str = "http"
@@ -139,6 +163,9 @@ class ReporterConfig:
     retry_backoff: float = 2.0
     batch_size: int = 10
     batch_interval: float = 5.0
+    max_inflight: int = 4
+    compression: str = "none"
+    cpu_affinity: list[int] = field(default_factory=list)
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "ReporterConfig":
@@ -153,10 +180,13 @@ class ReporterConfig:
             retry_backoff=float(data.get("retry_backoff", 2.0)),
             batch_size=int(data.get("batch_size", 10)),
             batch_interval=float(data.get("batch_interval", 5.0)),
+            max_inflight=int(data.get("max_inflight", 4)),
+            compression=str(data.get("compression", "none")).lower(),
+            cpu_affinity=[int(c) for c in data.get("cpu_affinity") or []],
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class CacheConfig:
     """离线缓存配置
 
@@ -166,6 +196,8 @@ class CacheConfig:
         max_entries: 最大缓存条目数
         max_age_hours: 最大缓存时长 (小时)
         flush_interval: 缓存刷新间隔 (秒)
+        journal_mode: SQLite 日志模式 (wal, delete)
+        synchronous: SQLite 同步级别 (off, normal, full)
     """
 
     enabled: bool = True
@@ -173,6 +205,8 @@ class CacheConfig:
     max_entries: int = 10000
     max_age_hours: float = 24.0
     flush_interval: float = 60.0
+    journal_mode: str = "wal"
+    synchronous: str = "normal"
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "CacheConfig":
@@ -183,10 +217,12 @@ class CacheConfig:
             max_entries=int(data.get("max_entries", 10000)),
             max_age_hours=float(data.get("max_age_hours", 24.0)),
             flush_interval=float(data.get("flush_interval", 60.0)),
+            journal_mode=str(data.get("journal_mode", "wal")).lower(),
+            synchronous=str(data.get("synchronous", "normal")).lower(),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class EdgeAgentConfig:
     """边缘 Agent 主配置
 
@@ -235,15 +271,7 @@ class EdgeAgentConfig:
             FileNotFoundError: 配置文件不存在
             yaml.YAMLError: YAML 解析错误
         """
-        config_path = Path(path)
-        if not config_path.exists():
-            raise FileNotFoundError(f"配置文件不存在: {config_path}")
-
-        with open(config_path, encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
-
-        logger.info(f"从 YAML 加载配置: {config_path}")
-        return cls.from_dict(data)
+        return cls.from_dict(_yaml_to_dict(path))
 
     @classmethod
     def from_env(cls, prefix: str = "EDGE_AGENT") -> "EdgeAgentConfig":
@@ -279,12 +307,8 @@ class EdgeAgentConfig:
         Returns:
             EdgeAgentConfig 实例
         """
-        # 从 YAML 加载基础配置
-        if config_path:
-            base_config = cls.from_yaml(config_path)
-            base_data = _config_to_dict(base_config)
-        else:
-            base_data = {}
+        # 在原始字典层合并：YAML 与环境变量覆盖项合并后只构建一次配置对象
+        base_data = _yaml_to_dict(config_path) if config_path else {}
 
         # 从环境变量加载覆盖配置；只合并显式设置的环境变量。
         env_data = _env_to_dict(env_prefix)
@@ -313,6 +337,18 @@ class EdgeAgentConfig:
         if not 0.0 <= self.inference.iou <= 1.0:
             errors.append(f"IoU 阈值必须在 [0.0, 1.0] 范围内: {self.inference.iou}")
 
+        # 验证合批参数
+        if self.inference.max_batch_size < 1:
+            errors.append(f"最大批大小必须大于等于 1: {self.inference.max_batch_size}")
+        if self.inference.max_wait_ms < 0:
+            errors.append(f"凑批等待时间不能为负: {self.inference.max_wait_ms}")
+
+        # 验证量化模式（静态量化需要校准数据，请使用 scripts/export_onnx.py --int8）
+        if self.inference.quantize not in ("none", "dynamic"):
+            errors.append(
+                f"无效的量化模式: {self.inference.quantize}，支持: ['none', 'dynamic']"
+            )
+
         # 验证模型文件存在性
         model_path = Path(self.inference.model_path)
         if not model_path.exists():
@@ -324,12 +360,13 @@ class EdgeAgentConfig:
             if not source_path.exists():
                 errors.append(f"数据源路径不存在: {source_path}")
 
+        if self.source.prefetch < 0:
+            errors.append(f"预取帧数不能为负: {self.source.prefetch}")
+
         # 验证视频关键帧配置
         keyframes = self.source.keyframes
         if keyframes.interval_seconds < 0:
-            errors.append(
-                f"关键帧间隔必须大于等于 0: {keyframes.interval_seconds}"
-            )
+            errors.append(f"关键帧间隔必须大于等于 0: {keyframes.interval_seconds}")
         if keyframes.min_scene_delta < 0:
             errors.append(
                 f"关键帧场景变化阈值必须大于等于 0: {keyframes.min_scene_delta}"
@@ -346,9 +383,52 @@ class EdgeAgentConfig:
         if self.reporter.timeout <= 0:
             errors.append(f"请求超时必须大于 0: {self.reporter.timeout}")
 
+        if self.reporter.max_inflight < 1:
+            errors.append(f"在途上报请求数必须大于等于 1: {self.reporter.max_inflight}")
+
+        if self.reporter.compression not in ("none", "gzip", "zstd"):
+            errors.append(f"无效的请求体压缩算法: {self.reporter.compression}")
+
+        # 验证 CPU 亲和性配置
+        for name, cores in (
+            ("inference", self.inference.cpu_affinity),
+            ("reporter", self.reporter.cpu_affinity),
+        ):
+            if any(core < 0 for core in cores):
+                errors.append(f"{name}.cpu_affinity 核心编号不能为负: {cores}")
+
+        # 验证缓存数据库参数
+        if self.cache.journal_mode not in ("wal", "delete"):
+            errors.append(f"无效的缓存日志模式: {self.cache.journal_mode}")
+        if self.cache.synchronous not in ("off", "normal", "full"):
+            errors.append(f"无效的缓存同步级别: {self.cache.synchronous}")
+
         return errors
 
 
+def _parse_int_list(value: str) -> list[int]:
+    """解析逗号分隔的整数列表，如 4,5,6,7"""
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def _yaml_to_dict(path: str | Path) -> dict[str, Any]:
+    """读取 YAML 配置文件为原始字典
+
+    Raises:
+        FileNotFoundError: 配置文件不存在
+        yaml.YAMLError: YAML 解析错误
+    """
+    config_path = Path(path)
+    if not config_path.exists():
+        raise FileNotFoundError(f"配置文件不存在: {config_path}")
+
+    with open(config_path, encoding="utf-8") as f:
+        data = yaml.load(f, Loader=_YamlLoader) or {}
+
+    logger.info(f"从 YAML 加载配置: {config_path}")
+    return data
+
+
 def _env_to_dict(prefix: str = "EDGE_AGENT") -> dict[str, Any]:
     """读取环境变量覆盖项，只返回显式设置的键。"""
     data: dict[str, Any] = {}
@@ -371,6 +451,8 @@ def _env_to_dict(prefix: str = "EDGE_AGENT") -> dict[str, Any]:
         source_data["loop"] = env_val.lower() in ("true", "1", "yes")
     if env_val := os.getenv(f"{prefix}_SOURCE_SKIP_FRAMES"):
         source_data["skip_frames"] = int(env_val)
+    if env_val := os.getenv(f"{prefix}_SOURCE_PREFETCH"):
+        source_data["prefetch"] = int(env_val)
     keyframe_data: dict[str, Any] = {}
     if env_val := os.getenv(f"{prefix}_SOURCE_KEYFRAMES_ENABLED"):
         keyframe_data["enabled"] = env_val.lower() in ("true", "1", "yes")
@@ -398,6 +480,14 @@ def _env_to_dict(prefix: str = "EDGE_AGENT") -> dict[str, Any]:
         inference_data["iou"] = float(env_val)
     if env_val := os.getenv(f"{prefix}_INFERENCE_DEVICE"):
         inference_data["device"] = env_val
+    if env_val := os.getenv(f"{prefix}_INFERENCE_MAX_BATCH_SIZE"):
+        inference_data["max_batch_size"] = int(env_val)
+    if env_val := os.getenv(f"{prefix}_INFERENCE_MAX_WAIT_MS"):
+        inference_data["max_wait_ms"] = float(env_val)
+    if env_val := os.getenv(f"{prefix}_INFERENCE_CPU_AFFINITY"):
+        inference_data["cpu_affinity"] = _parse_int_list(env_val)
+    if env_val := os.getenv(f"{prefix}_INFERENCE_QUANTIZE"):
+        inference_data["quantize"] = env_val
     if inference_data:
         data["inference"] = inference_data
 
@@ -414,6 +504,12 @@ def _env_to_dict(prefix: str = "EDGE_AGENT") -> dict[str, Any]:
         reporter_data["retry_max"] = int(env_val)
     if env_val := os.getenv(f"{prefix}_REPORTER_BATCH_SIZE"):
         reporter_data["batch_size"] = int(env_val)
+    if env_val := os.getenv(f"{prefix}_REPORTER_MAX_INFLIGHT"):
+        reporter_data["max_inflight"] = int(env_val)
+    if env_val := os.getenv(f"{prefix}_REPORTER_COMPRESSION"):
+        reporter_data["compression"] = env_val
+    if env_val := os.getenv(f"{prefix}_REPORTER_CPU_AFFINITY"):
+        reporter_data["cpu_affinity"] = _parse_int_list(env_val)
     if reporter_data:
         data["reporter"] = reporter_data
 
@@ -430,56 +526,6 @@ def _env_to_dict(prefix: str = "EDGE_AGENT") -> dict[str, Any]:
     return data
 
 
-def _config_to_dict(config: EdgeAgentConfig) -> dict[str, Any]:
-    """将配置对象转换为字典"""
-    return {
-        "device_id": config.device_id,
-        "log_level": config.log_level,
-        "report_only_detections": config.report_only_detections,
-        "source": {
-            "type": config.source.type.value,
-            "path": config.source.path,
-            "fps_limit": config.source.fps_limit,
-            "loop": config.source.loop,
-            "skip_frames": config.source.skip_frames,
-            "extensions": config.source.extensions,
-            "keyframes": {
-                "enabled": config.source.keyframes.enabled,
-                "interval_seconds": config.source.keyframes.interval_seconds,
-                "min_scene_delta": config.source.keyframes.min_scene_delta,
-                "blur_threshold": config.source.keyframes.blur_threshold,
-                "max_frames": config.source.keyframes.max_frames,
-            },
-        },
-        "inference": {
-            "engine": config.inference.engine,
-            "model_path": config.inference.model_path,
-            "confidence": config.inference.confidence,
-            "iou": config.inference.iou,
-            "device": config.inference.device,
-            "warmup": config.inference.warmup,
-        },
-        "reporter": {
-            "type": config.reporter.type,
-            "url": config.reporter.url,
-            "api_key": config.reporter.api_key,
-            "timeout": config.reporter.timeout,
-            "retry_max": config.reporter.retry_max,
-            "retry_delay": config.reporter.retry_delay,
-            "retry_backoff": config.reporter.retry_backoff,
-            "batch_size": config.reporter.batch_size,
-            "batch_interval": config.reporter.batch_interval,
-        },
-        "cache": {
-            "enabled": config.cache.enabled,
-            "db_path": config.cache.db_path,
-            "max_entries": config.cache.max_entries,
-            "max_age_hours": config.cache.max_age_hours,
-            "flush_interval": config.cache.flush_interval,
-        },
-    }
-
-
 def _deep_merge(base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:
     """深度合并两个字典，override 中的非空值覆盖 base
 
@@ -488,15 +534,22 @@ def _deep_merge(base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any
         override: 覆盖字典
 
     Returns:
-        合并后的字典
+        合并后的字典（只复制被覆盖路径上的字典，base 本身不被修改）
     """
     result = base.copy()
-
-    for key, value in override.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = _deep_merge(result[key], value)
-        elif value is not None and value != "":
-            # 只有非空值才覆盖
-            result[key] = value
+    # 以工作栈代替递归：(目标字典, 覆盖字典)
+    stack = [(result, override)]
+
+    while stack:
+        dst, src = stack.pop()
+        for key, value in src.items():
+            current = dst.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                nested = current.copy()
+                dst[key] = nested
+                stack.append((nested, value))
+            elif value is not None and value != "":
+                # 只有非空值才覆盖
+                dst[key] = value
 
     return result
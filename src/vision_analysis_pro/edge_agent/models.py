@@ -1,5 +1,6 @@
 """边缘 Agent 数据模型定义"""
 
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import StrEnum
@@ -26,10 +27,13 @@ class ReportStatus(StrEnum):
     CACHED = "cached"
 
 
-@dataclass
+@dataclass(slots=True)
 class FrameData:
     """帧数据
 
+    FrameData / Detection / InferenceResult 每帧（每个检测）都会创建，
+    使用 __slots__ 省去实例 __dict__，降低内存占用与属性访问开销。
+
     Attributes:
         image: 图像数据 (HxWxC, BGR 格式)
         timestamp: 采集时间戳 (UNIX 时间戳)
@@ -44,6 +48,15 @@ class FrameData:
     frame_id: int = 0
     metadata: dict[str, Any] = field(default_factory=dict)
 
+    def __post_init__(self) -> None:
+        """保证图像为 C 连续布局
+
+        裁剪、通道翻转等视图的步长不连续，下游 OpenCV 预处理与编码会各自隐式拷贝；
+        在构造时转换一次，已连续的数组原样保留、不拷贝。
+        """
+        if not self.image.flags.c_contiguous:
+            self.image = np.ascontiguousarray(self.image)
+
     @property
     def datetime(self) -> datetime:
         """获取采集时间的 datetime 对象"""
@@ -55,7 +68,7 @@ class FrameData:
         return self.image.shape
 
 
-@dataclass
+@dataclass(slots=True)
 class Detection:
     """单个检测结果
 
@@ -87,7 +100,7 @@ class Detection:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class InferenceResult:
     """推理结果
 
@@ -141,7 +154,7 @@ class InferenceResult:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ReportPayload:
     """上报数据载荷
 
@@ -156,7 +169,7 @@ class ReportPayload:
 
     device_id: str
     results: list[InferenceResult]
-    report_time: float = field(default_factory=lambda: datetime.now().timestamp())
+    report_time: float = field(default_factory=time.time)
     batch_id: str = ""
     status: ReportStatus = ReportStatus.PENDING
     retry_count: int = 0
@@ -187,7 +200,7 @@ class ReportPayload:
         return sum(r.detection_count for r in self.results)
 
 
-@dataclass
+@dataclass(slots=True)
 class CacheEntry:
     """缓存条目
 
@@ -203,11 +216,11 @@ class CacheEntry:
 
     id: int
     payload: ReportPayload
-    created_at: float = field(default_factory=lambda: datetime.now().timestamp())
+    created_at: float = field(default_factory=time.time)
     retry_count: int = 0
     last_error: str = ""
 
     @property
     def age_seconds(self) -> float:
         """缓存时长 (秒)"""
-        return datetime.now().timestamp() - self.created_at
+        return time.time() - self.created_at
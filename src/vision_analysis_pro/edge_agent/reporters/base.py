@@ -3,16 +3,38 @@
 定义结果上报的统一接口，支持 HTTP、MQTT 等多种上报方式。
 """
 
+import json
 import logging
 from abc import ABC, abstractmethod
 from types import TracebackType
 
+# 可选：orjson 序列化（C 实现，直接输出 UTF-8 字节），未安装时回退到标准库 json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from ..config import ReporterConfig
 from ..models import ReportPayload, ReportStatus
 
 logger = logging.getLogger(__name__)
 
 
+def serialize_payload(payload: ReportPayload) -> bytes:
+    """将载荷序列化为紧凑的 UTF-8 JSON
+
+    上报请求体与离线缓存共用此序列化，格式与 httpx 的 json= 参数一致
+    （紧凑分隔符、不转义非 ASCII）。
+    """
+    data = payload.to_dict()
+    if orjson is not None:
+        # 非字符串键按标准库 json 的行为转为字符串
+        return orjson.dumps(
+            data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
 class BaseReporter(ABC):
     """上报器抽象基类
 
@@ -106,6 +128,14 @@ class BaseReporter(ABC):
         self.connect()
         return self
 
+    async def flush_cache(self) -> int:
+        """异步刷新缓存
+
+        默认实现为 no-op，返回 0。
+        支持缓存能力的子类可覆盖此方法。
+        """
+        return 0
+
     def flush_cache_sync(self) -> int:
         """同步刷新缓存
 
@@ -7,15 +7,63 @@ import json
 import logging
 import sqlite3
 import threading
-from datetime import datetime
+import time
+import zlib
 from pathlib import Path
 from types import TracebackType
+from typing import NamedTuple
+
+# 可选：orjson 解析（C 实现），未安装时回退到标准库 json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from ..config import CacheConfig
 from ..models import CacheEntry, Detection, InferenceResult, ReportPayload
+from .base import serialize_payload
 
 logger = logging.getLogger(__name__)
 
+# 页缓存上限 (KiB，负值按大小而非页数计) 与内存映射读取上限 (字节)
+_CACHE_SIZE_KIB = 8192
+_MMAP_SIZE = 64 * 1024 * 1024
+
+# 载荷 JSON 的 zlib 压缩级别：检测结果中重复的标签与键名压缩率高，级别 1 已足够且最快
+_PAYLOAD_COMPRESS_LEVEL = 1
+
+
+def _payload_json_bytes(value: str | bytes) -> bytes:
+    """取出缓存载荷的 UTF-8 JSON 字节
+
+    新条目为压缩后的 BLOB，旧版本写入的条目为 JSON 文本，两者均可读取。
+    """
+    if isinstance(value, bytes):
+        return zlib.decompress(value)
+    return value.encode("utf-8")
+
+
+def _deserialize_payload(value: str | bytes) -> dict:
+    """解析缓存的载荷"""
+    data = _payload_json_bytes(value)
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+class RawCacheEntry(NamedTuple):
+    """未解析载荷的缓存条目
+
+    Attributes:
+        id: 缓存条目 ID
+        batch_id: 批次 ID
+        payload_json: 载荷的 UTF-8 JSON 字节，可直接作为上报请求体
+        retry_count: 已重试次数
+    """
+
+    id: int
+    batch_id: str
+    payload_json: bytes
+    retry_count: int
+
 
 class CacheManager:
     """离线缓存管理器
@@ -38,8 +86,11 @@ class CacheManager:
         """
         self.config = config
         self._db_path = Path(config.db_path)
-        self._conn: sqlite3.Connection | None = None
-        self._lock = threading.Lock()
+        # 每个线程使用独立连接：读操作无需加锁，WAL 模式下读写可并发
+        self._conns: dict[int, sqlite3.Connection] = {}
+        self._conns_lock = threading.Lock()
+        # 写操作串行化，避免并发的 IMMEDIATE 事务在 SQLite 层忙等
+        self._write_lock = threading.Lock()
         self._is_open = False
 
     @property
@@ -62,29 +113,24 @@ class CacheManager:
             # 确保目录存在
             self._db_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # 连接数据库
-            self._conn = sqlite3.connect(
-                str(self._db_path),
-                check_same_thread=False,
-                isolation_level="IMMEDIATE",
-            )
-            self._conn.row_factory = sqlite3.Row
+            # 连接数据库（WAL 为数据库级设置，只需在首个连接上切换）
+            conn = self._connection()
+            self._set_journal_mode(conn)
 
             # 创建表结构
-            self._create_tables()
+            self._create_tables(conn)
 
             self._is_open = True
             logger.info(f"缓存数据库已打开: {self._db_path}")
 
         except sqlite3.Error as e:
+            self._close_connections()
             raise RuntimeError(f"无法打开缓存数据库: {e}") from e
 
     def close(self) -> None:
-        """关闭缓存数据库"""
-        if self._conn is not None:
-            self._conn.close()
-            self._conn = None
+        """关闭缓存数据库及所有线程的连接"""
         self._is_open = False
+        self._close_connections()
         logger.info("缓存数据库已关闭")
 
     def __enter__(self) -> "CacheManager":
@@ -101,19 +147,68 @@ class CacheManager:
         """上下文管理器出口"""
         self.close()
 
-    def _create_tables(self) -> None:
-        """创建数据库表结构"""
-        if self._conn is None:
-            return
+    def _connection(self) -> sqlite3.Connection:
+        """获取当前线程的数据库连接，首次使用时创建
+
+        连接按线程 ID 登记，线程结束后 ID 被复用时连接随之复用，
+        连接数不超过曾访问缓存的并发线程数。
+        """
+        thread_id = threading.get_ident()
+        conn = self._conns.get(thread_id)
+        if conn is not None:
+            return conn
+
+        conn = sqlite3.connect(
+            str(self._db_path),
+            check_same_thread=False,
+            isolation_level="IMMEDIATE",
+        )
+        conn.row_factory = sqlite3.Row
+        self._configure_connection(conn)
+        with self._conns_lock:
+            self._conns[thread_id] = conn
+        return conn
+
+    def _close_connections(self) -> None:
+        """关闭所有线程的连接"""
+        with self._conns_lock:
+            conns = list(self._conns.values())
+            self._conns.clear()
+        for conn in conns:
+            conn.close()
+
+    def _set_journal_mode(self, conn: sqlite3.Connection) -> None:
+        """设置数据库日志模式"""
+        journal_mode = conn.execute(
+            f"PRAGMA journal_mode={self.config.journal_mode.upper()}"
+        ).fetchone()[0]
+        if journal_mode.lower() != self.config.journal_mode:
+            # 如内存数据库或不支持 WAL 的文件系统
+            logger.warning(
+                f"缓存数据库日志模式为 {journal_mode}，未能切换为 {self.config.journal_mode}"
+            )
+
+    def _configure_connection(self, conn: sqlite3.Connection) -> None:
+        """设置连接级 PRAGMA
 
-        with self._lock:
-            cursor = self._conn.cursor()
+        WAL 模式下提交只追加写 WAL 文件，配合 synchronous=NORMAL 仅在检查点时 fsync；
+        临时表与排序使用内存，读取经内存映射减少 read() 拷贝。
+        """
+        conn.execute(f"PRAGMA synchronous={self.config.synchronous.upper()}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA cache_size=-{_CACHE_SIZE_KIB}")
+        conn.execute(f"PRAGMA mmap_size={_MMAP_SIZE}")
+
+    def _create_tables(self, conn: sqlite3.Connection) -> None:
+        """创建数据库表结构"""
+        with self._write_lock:
+            cursor = conn.cursor()
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS cache_entries (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     batch_id TEXT UNIQUE NOT NULL,
                     device_id TEXT NOT NULL,
-                    payload_json TEXT NOT NULL,
+                    payload_json TEXT NOT NULL,  -- 压缩 JSON (BLOB) 或旧版 JSON 文本
                     created_at REAL NOT NULL,
                     retry_count INTEGER DEFAULT 0,
                     last_error TEXT DEFAULT ''
@@ -125,13 +220,15 @@ class CacheManager:
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_device_id ON cache_entries(device_id)
             """)
-            self._conn.commit()
+            conn.commit()
 
-    def add(self, payload: ReportPayload) -> int:
+    def add(self, payload: ReportPayload, payload_json: bytes | None = None) -> int:
         """添加缓存条目
 
         Args:
             payload: 上报数据载荷
+            payload_json: 已序列化的载荷 UTF-8 JSON（如上报时的请求体），
+                提供时不再重复序列化
 
         Returns:
             缓存条目 ID
@@ -139,39 +236,76 @@ class CacheManager:
         Raises:
             RuntimeError: 缓存未打开或添加失败
         """
-        if not self._is_open or self._conn is None:
+        payload_jsons = None if payload_json is None else [payload_json]
+        return self.add_many([payload], payload_jsons)[0]
+
+    def add_many(
+        self,
+        payloads: list[ReportPayload],
+        payload_jsons: list[bytes] | None = None,
+    ) -> list[int]:
+        """在单个事务中批量添加缓存条目
+
+        序列化在加锁前完成，所有行只提交一次，批量写入时日志与 fsync 开销被摊薄。
+
+        Args:
+            payloads: 上报数据载荷列表
+            payload_jsons: 与 payloads 一一对应的已序列化 UTF-8 JSON，
+                为 None 则逐个序列化
+
+        Returns:
+            与 payloads 一一对应的缓存条目 ID
+
+        Raises:
+            RuntimeError: 缓存未打开或添加失败（失败时整批回滚）
+        """
+        if not self._is_open:
             raise RuntimeError("缓存未打开")
+        if not payloads:
+            return []
 
-        # 序列化 payload
-        payload_json = json.dumps(payload.to_dict(), ensure_ascii=False)
+        # 序列化并压缩 payload
+        if payload_jsons is None:
+            payload_jsons = [serialize_payload(payload) for payload in payloads]
+        created_at = time.time()
+        rows = [
+            (
+                payload.batch_id,
+                payload.device_id,
+                zlib.compress(data, _PAYLOAD_COMPRESS_LEVEL),
+                created_at,
+                payload.retry_count,
+                "",
+            )
+            for payload, data in zip(payloads, payload_jsons, strict=True)
+        ]
 
-        with self._lock:
+        conn = self._connection()
+        with self._write_lock:
             try:
-                cursor = self._conn.cursor()
-                cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO cache_entries
-                    (batch_id, device_id, payload_json, created_at, retry_count, last_error)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        payload.batch_id,
-                        payload.device_id,
-                        payload_json,
-                        datetime.now().timestamp(),
-                        payload.retry_count,
-                        "",
-                    ),
-                )
-                self._conn.commit()
-                entry_id = cursor.lastrowid or 0
-
-                logger.debug(f"缓存条目已添加: {payload.batch_id} (ID: {entry_id})")
-                return entry_id
+                cursor = conn.cursor()
+                # executemany 不返回每行的 rowid（INSERT OR REPLACE 时 ID 也不连续），
+                # 逐行 execute 取 lastrowid，同一事务内仍只提交一次
+                entry_ids = []
+                for row in rows:
+                    cursor.execute(
+                        """
+                        INSERT OR REPLACE INTO cache_entries
+                        (batch_id, device_id, payload_json, created_at, retry_count, last_error)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                        """,
+                        row,
+                    )
+                    entry_ids.append(cursor.lastrowid or 0)
+                conn.commit()
 
             except sqlite3.Error as e:
+                conn.rollback()
                 raise RuntimeError(f"添加缓存失败: {e}") from e
 
+        logger.debug(f"缓存条目已添加: {len(entry_ids)} 条 (ID: {entry_ids})")
+        return entry_ids
+
     def get(self, entry_id: int) -> CacheEntry | None:
         """获取缓存条目
 
@@ -181,21 +315,20 @@ class CacheManager:
         Returns:
             CacheEntry 实例，如果不存在则返回 None
         """
-        if not self._is_open or self._conn is None:
+        if not self._is_open:
             return None
 
-        with self._lock:
-            cursor = self._conn.cursor()
-            cursor.execute(
-                "SELECT * FROM cache_entries WHERE id = ?",
-                (entry_id,),
-            )
-            row = cursor.fetchone()
+        cursor = self._connection().cursor()
+        cursor.execute(
+            "SELECT * FROM cache_entries WHERE id = ?",
+            (entry_id,),
+        )
+        row = cursor.fetchone()
 
-            if row is None:
-                return None
+        if row is None:
+            return None
 
-            return self._row_to_entry(row)
+        return self._row_to_entry(row)
 
     def get_pending(self, limit: int = 100) -> list[CacheEntry]:
         """获取待处理的缓存条目
@@ -208,22 +341,57 @@ class CacheManager:
         Returns:
             CacheEntry 列表
         """
-        if not self._is_open or self._conn is None:
+        if not self._is_open:
             return []
 
-        with self._lock:
-            cursor = self._conn.cursor()
-            cursor.execute(
-                """
-                SELECT * FROM cache_entries
-                ORDER BY created_at ASC
-                LIMIT ?
-                """,
-                (limit,),
-            )
-            rows = cursor.fetchall()
+        cursor = self._connection().cursor()
+        cursor.execute(
+            """
+            SELECT * FROM cache_entries
+            ORDER BY created_at ASC
+            LIMIT ?
+            """,
+            (limit,),
+        )
+        rows = cursor.fetchall()
+
+        return [self._row_to_entry(row) for row in rows]
+
+    def get_pending_raw(self, limit: int = 100) -> list[RawCacheEntry]:
+        """获取待处理的缓存条目，不解析载荷
+
+        与 get_pending 顺序相同，但只解压出载荷 JSON 字节，
+        不重建 ReportPayload，供上报器直接转发。
+
+        Args:
+            limit: 最大返回数量
 
-            return [self._row_to_entry(row) for row in rows]
+        Returns:
+            RawCacheEntry 列表
+        """
+        if not self._is_open:
+            return []
+
+        cursor = self._connection().cursor()
+        cursor.execute(
+            """
+            SELECT id, batch_id, payload_json, retry_count FROM cache_entries
+            ORDER BY created_at ASC
+            LIMIT ?
+            """,
+            (limit,),
+        )
+        rows = cursor.fetchall()
+
+        return [
+            RawCacheEntry(
+                id=row["id"],
+                batch_id=row["batch_id"],
+                payload_json=_payload_json_bytes(row["payload_json"]),
+                retry_count=row["retry_count"],
+            )
+            for row in rows
+        ]
 
     def remove(self, entry_id: int) -> bool:
         """移除缓存条目
@@ -234,17 +402,18 @@ class CacheManager:
         Returns:
             是否成功移除
         """
-        if not self._is_open or self._conn is None:
+        if not self._is_open:
             return False
 
-        with self._lock:
+        conn = self._connection()
+        with self._write_lock:
             try:
-                cursor = self._conn.cursor()
+                cursor = conn.cursor()
                 cursor.execute(
                     "DELETE FROM cache_entries WHERE id = ?",
                     (entry_id,),
                 )
-                self._conn.commit()
+                conn.commit()
                 removed = cursor.rowcount > 0
 
                 if removed:
@@ -256,6 +425,38 @@ class CacheManager:
                 logger.error(f"移除缓存条目失败: {e}")
                 return False
 
+    def remove_many(self, entry_ids: list[int]) -> int:
+        """在单个事务中批量移除缓存条目
+
+        刷新缓存时逐条移除会为每个条目各提交一次，批量移除只提交一次。
+
+        Args:
+            entry_ids: 缓存条目 ID 列表
+
+        Returns:
+            实际移除的条目数
+        """
+        if not self._is_open or not entry_ids:
+            return 0
+
+        conn = self._connection()
+        with self._write_lock:
+            try:
+                cursor = conn.cursor()
+                cursor.executemany(
+                    "DELETE FROM cache_entries WHERE id = ?",
+                    [(entry_id,) for entry_id in entry_ids],
+                )
+                conn.commit()
+
+            except sqlite3.Error as e:
+                conn.rollback()
+                logger.error(f"批量移除缓存条目失败: {e}")
+                return 0
+
+        logger.debug(f"缓存条目已移除: {cursor.rowcount} 条")
+        return cursor.rowcount
+
     def remove_by_batch_id(self, batch_id: str) -> bool:
         """按批次 ID 移除缓存条目
 
@@ -265,17 +466,18 @@ class CacheManager:
         Returns:
             是否成功移除
         """
-        if not self._is_open or self._conn is None:
+        if not self._is_open:
             return False
 
-        with self._lock:
+        conn = self._connection()
+        with self._write_lock:
             try:
-                cursor = self._conn.cursor()
+                cursor = conn.cursor()
                 cursor.execute(
                     "DELETE FROM cache_entries WHERE batch_id = ?",
                     (batch_id,),
                 )
-                self._conn.commit()
+                conn.commit()
                 return cursor.rowcount > 0
 
             except sqlite3.Error as e:
@@ -289,12 +491,13 @@ class CacheManager:
             entry_id: 缓存条目 ID
             error: 错误信息
         """
-        if not self._is_open or self._conn is None:
+        if not self._is_open:
             return
 
-        with self._lock:
+        conn = self._connection()
+        with self._write_lock:
             try:
-                cursor = self._conn.cursor()
+                cursor = conn.cursor()
                 cursor.execute(
                     """
                     UPDATE cache_entries
@@ -303,7 +506,7 @@ class CacheManager:
                     """,
                     (error, entry_id),
                 )
-                self._conn.commit()
+                conn.commit()
 
             except sqlite3.Error as e:
                 logger.error(f"更新重试计数失败: {e}")
@@ -314,14 +517,13 @@ class CacheManager:
         Returns:
             缓存条目数量
         """
-        if not self._is_open or self._conn is None:
+        if not self._is_open:
             return 0
 
-        with self._lock:
-            cursor = self._conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM cache_entries")
-            row = cursor.fetchone()
-            return row[0] if row else 0
+        cursor = self._connection().cursor()
+        cursor.execute("SELECT COUNT(*) FROM cache_entries")
+        row = cursor.fetchone()
+        return row[0] if row else 0
 
     def clear(self) -> int:
         """清空所有缓存
@@ -329,17 +531,18 @@ class CacheManager:
         Returns:
             清除的条目数量
         """
-        if not self._is_open or self._conn is None:
+        if not self._is_open:
             return 0
 
-        with self._lock:
+        conn = self._connection()
+        with self._write_lock:
             try:
-                cursor = self._conn.cursor()
+                cursor = conn.cursor()
                 cursor.execute("SELECT COUNT(*) FROM cache_entries")
                 count = cursor.fetchone()[0]
 
                 cursor.execute("DELETE FROM cache_entries")
-                self._conn.commit()
+                conn.commit()
 
                 logger.info(f"已清空 {count} 个缓存条目")
                 return count
@@ -356,20 +559,21 @@ class CacheManager:
         Returns:
             清除的条目数量
         """
-        if not self._is_open or self._conn is None:
+        if not self._is_open:
             return 0
 
         max_age_seconds = self.config.max_age_hours * 3600
-        cutoff_time = datetime.now().timestamp() - max_age_seconds
+        cutoff_time = time.time() - max_age_seconds
 
-        with self._lock:
+        conn = self._connection()
+        with self._write_lock:
             try:
-                cursor = self._conn.cursor()
+                cursor = conn.cursor()
                 cursor.execute(
                     "DELETE FROM cache_entries WHERE created_at < ?",
                     (cutoff_time,),
                 )
-                self._conn.commit()
+                conn.commit()
                 removed = cursor.rowcount
 
                 if removed > 0:
@@ -389,30 +593,29 @@ class CacheManager:
         Returns:
             清除的条目数量
         """
-        if not self._is_open or self._conn is None:
+        if not self._is_open:
             return 0
 
-        current_count = self.count()
-        if current_count <= self.config.max_entries:
+        # 无锁读取作为快速路径；超出数量在删除语句内重新计算，不受期间其他写入影响
+        if self.count() <= self.config.max_entries:
             return 0
 
-        to_remove = current_count - self.config.max_entries
-
-        with self._lock:
+        conn = self._connection()
+        with self._write_lock:
             try:
-                cursor = self._conn.cursor()
+                cursor = conn.cursor()
                 cursor.execute(
                     """
                     DELETE FROM cache_entries
                     WHERE id IN (
                         SELECT id FROM cache_entries
                         ORDER BY created_at ASC
-                        LIMIT ?
+                        LIMIT max(0, (SELECT COUNT(*) FROM cache_entries) - ?)
                     )
                     """,
-                    (to_remove,),
+                    (self.config.max_entries,),
                 )
-                self._conn.commit()
+                conn.commit()
                 removed = cursor.rowcount
 
                 if removed > 0:
@@ -442,41 +645,33 @@ class CacheManager:
         Returns:
             包含统计信息的字典
         """
-        if not self._is_open or self._conn is None:
+        if not self._is_open:
             return {
                 "is_open": False,
                 "count": 0,
             }
 
-        with self._lock:
-            cursor = self._conn.cursor()
-
-            # 总数
-            cursor.execute("SELECT COUNT(*) FROM cache_entries")
-            count = cursor.fetchone()[0]
-
-            # 最早条目时间
-            cursor.execute("SELECT MIN(created_at) FROM cache_entries")
-            oldest = cursor.fetchone()[0]
-
-            # 最新条目时间
-            cursor.execute("SELECT MAX(created_at) FROM cache_entries")
-            newest = cursor.fetchone()[0]
-
-            # 平均重试次数
-            cursor.execute("SELECT AVG(retry_count) FROM cache_entries")
-            avg_retry = cursor.fetchone()[0] or 0
-
-            return {
-                "is_open": True,
-                "db_path": str(self._db_path),
-                "count": count,
-                "max_entries": self.config.max_entries,
-                "max_age_hours": self.config.max_age_hours,
-                "oldest_entry": oldest,
-                "newest_entry": newest,
-                "avg_retry_count": round(avg_retry, 2),
-            }
+        # 单条查询取全部统计值，读不加锁时各项仍来自同一快照
+        cursor = self._connection().cursor()
+        cursor.execute(
+            """
+            SELECT COUNT(*), MIN(created_at), MAX(created_at),
+                   COALESCE(AVG(retry_count), 0)
+            FROM cache_entries
+            """
+        )
+        count, oldest, newest, avg_retry = cursor.fetchone()
+
+        return {
+            "is_open": True,
+            "db_path": str(self._db_path),
+            "count": count,
+            "max_entries": self.config.max_entries,
+            "max_age_hours": self.config.max_age_hours,
+            "oldest_entry": oldest,
+            "newest_entry": newest,
+            "avg_retry_count": round(avg_retry, 2),
+        }
 
     def _row_to_entry(self, row: sqlite3.Row) -> CacheEntry:
         """将数据库行转换为 CacheEntry
@@ -487,7 +682,7 @@ class CacheManager:
         Returns:
             CacheEntry 实例
         """
-        payload_data = json.loads(row["payload_json"])
+        payload_data = _deserialize_payload(row["payload_json"])
 
         # 重建 ReportPayload
         results = [
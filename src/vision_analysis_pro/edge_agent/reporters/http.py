@@ -4,21 +4,40 @@
 - 指数退避重试
 - 离线缓存
 - 批量上报
+- 请求体压缩 (gzip / zstd)
 """
 
 import asyncio
+import gzip
 import logging
 import time
 
 import httpx
 
+# 可选：zstd 压缩，未安装时回退到 gzip
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# 可选：安装 h2 后对 HTTPS 上报地址启用 HTTP/2（经 ALPN 协商，服务端不支持时仍用 HTTP/1.1）
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 from ..config import CacheConfig, ReporterConfig
 from ..models import ReportPayload, ReportStatus
-from .base import BaseReporter
+from .base import BaseReporter, serialize_payload
 from .cache import CacheManager
 
 logger = logging.getLogger(__name__)
 
+# 空闲长连接保活时长 (秒)，覆盖常见的上报间隔，避免每批重新握手
+KEEPALIVE_EXPIRY = 120.0
+
 
 class HTTPReporter(BaseReporter):
     """HTTP 上报器
@@ -46,10 +65,30 @@ class HTTPReporter(BaseReporter):
         self._client: httpx.AsyncClient | None = None
         self._sync_client: httpx.Client | None = None
         self._cache: CacheManager | None = None
+        self._compression = self._resolve_compression(config.compression)
+        self._zstd = (
+            zstandard.ZstdCompressor(level=3) if self._compression == "zstd" else None
+        )
 
         if cache_config and cache_config.enabled:
             self._cache = CacheManager(cache_config)
 
+    @staticmethod
+    def _resolve_compression(compression: str) -> str:
+        """确定实际使用的压缩算法，zstd 不可用时回退到 gzip"""
+        if compression == "zstd" and zstandard is None:
+            logger.warning("未安装 zstandard，上报请求体压缩回退为 gzip")
+            return "gzip"
+        return compression
+
+    def _compress_body(self, body: bytes) -> bytes:
+        """按配置压缩已序列化的 JSON 请求体"""
+        if self._zstd is not None:
+            return self._zstd.compress(body)
+        if self._compression == "gzip":
+            return gzip.compress(body, compresslevel=6)
+        return body
+
     @property
     def has_cache(self) -> bool:
         """是否启用缓存"""
@@ -76,21 +115,35 @@ class HTTPReporter(BaseReporter):
             if self.config.api_key:
                 headers["Authorization"] = f"Bearer {self.config.api_key}"
 
+            if self._compression != "none":
+                headers["Content-Encoding"] = self._compression
+
             timeout = httpx.Timeout(
                 timeout=self.config.timeout,
                 connect=10.0,
             )
 
+            # 连接池按在途上报数上限设置，长连接复用 TCP/TLS 会话
+            limits = httpx.Limits(
+                max_connections=self.config.max_inflight,
+                max_keepalive_connections=self.config.max_inflight,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            )
+
             # 创建异步客户端
             self._client = httpx.AsyncClient(
                 headers=headers,
                 timeout=timeout,
+                limits=limits,
+                http2=HTTP2_AVAILABLE,
             )
 
             # 创建同步客户端
             self._sync_client = httpx.Client(
                 headers=headers,
                 timeout=timeout,
+                limits=limits,
+                http2=HTTP2_AVAILABLE,
             )
 
             # 打开缓存
@@ -138,13 +191,17 @@ class HTTPReporter(BaseReporter):
             self._record_result(success=False)
             return ReportStatus.FAILED
 
-        # 尝试上报（带重试）
-        status = await self._send_with_retry(payload)
+        # 尝试上报（带重试）；JSON 只序列化一次，失败时原样写入缓存
+        data = serialize_payload(payload)
+        status = await self._post_with_retry(
+            self._compress_body(data), payload.batch_id
+        )
 
         # 如果失败且有缓存，加入缓存
+        # 写库与提交在线程池中执行，避免阻塞事件循环上其他并发上报
         if status == ReportStatus.FAILED and self._cache:
             try:
-                self._cache.add(payload)
+                await asyncio.to_thread(self._cache.add, payload, data)
                 logger.info(f"上报失败，已缓存: {payload.batch_id}")
                 return ReportStatus.CACHED
             except Exception as e:
@@ -166,13 +223,14 @@ class HTTPReporter(BaseReporter):
             self._record_result(success=False)
             return ReportStatus.FAILED
 
-        # 尝试上报（带重试）
-        status = self._send_with_retry_sync(payload)
+        # 尝试上报（带重试）；JSON 只序列化一次，失败时原样写入缓存
+        data = serialize_payload(payload)
+        status = self._post_with_retry_sync(self._compress_body(data), payload.batch_id)
 
         # 如果失败且有缓存，加入缓存
         if status == ReportStatus.FAILED and self._cache:
             try:
-                self._cache.add(payload)
+                self._cache.add(payload, data)
                 logger.info(f"上报失败，已缓存: {payload.batch_id}")
                 return ReportStatus.CACHED
             except Exception as e:
@@ -180,13 +238,14 @@ class HTTPReporter(BaseReporter):
 
         return status
 
-    async def _send_with_retry(self, payload: ReportPayload) -> ReportStatus:
-        """带重试的异步发送
+    async def _post_with_retry(self, body: bytes, batch_id: str) -> ReportStatus:
+        """带重试的异步发送已编码的请求体
 
         使用指数退避策略进行重试。
 
         Args:
-            payload: 上报数据载荷
+            body: 已序列化并按配置压缩的请求体
+            batch_id: 批次 ID，用于日志
 
         Returns:
             上报状态
@@ -200,13 +259,13 @@ class HTTPReporter(BaseReporter):
             try:
                 response = await self._client.post(
                     str(self.config.url),
-                    json=payload.to_dict(),
+                    content=body,
                 )
 
                 if response.is_success:
                     self._record_result(success=True)
                     logger.debug(
-                        f"上报成功: {payload.batch_id} "
+                        f"上报成功: {batch_id} "
                         f"(尝试 {attempt + 1}/{self.config.retry_max + 1})"
                     )
                     return ReportStatus.SUCCESS
@@ -248,16 +307,17 @@ class HTTPReporter(BaseReporter):
                 delay *= self.config.retry_backoff  # 指数退避
 
         self._record_result(success=False)
-        logger.error(f"上报失败，已达到最大重试次数: {payload.batch_id}")
+        logger.error(f"上报失败，已达到最大重试次数: {batch_id}")
         return ReportStatus.FAILED
 
-    def _send_with_retry_sync(self, payload: ReportPayload) -> ReportStatus:
-        """带重试的同步发送
+    def _post_with_retry_sync(self, body: bytes, batch_id: str) -> ReportStatus:
+        """带重试的同步发送已编码的请求体
 
         使用指数退避策略进行重试。
 
         Args:
-            payload: 上报数据载荷
+            body: 已序列化并按配置压缩的请求体
+            batch_id: 批次 ID，用于日志
 
         Returns:
             上报状态
@@ -271,13 +331,13 @@ class HTTPReporter(BaseReporter):
             try:
                 response = self._sync_client.post(
                     str(self.config.url),
-                    json=payload.to_dict(),
+                    content=body,
                 )
 
                 if response.is_success:
                     self._record_result(success=True)
                     logger.debug(
-                        f"上报成功: {payload.batch_id} "
+                        f"上报成功: {batch_id} "
                         f"(尝试 {attempt + 1}/{self.config.retry_max + 1})"
                     )
                     return ReportStatus.SUCCESS
@@ -319,7 +379,7 @@ class HTTPReporter(BaseReporter):
                 delay *= self.config.retry_backoff  # 指数退避
 
         self._record_result(success=False)
-        logger.error(f"上报失败，已达到最大重试次数: {payload.batch_id}")
+        logger.error(f"上报失败，已达到最大重试次数: {batch_id}")
         return ReportStatus.FAILED
 
     async def flush_cache(self) -> int:
@@ -333,16 +393,20 @@ class HTTPReporter(BaseReporter):
         if not self._cache or not self._cache.is_open:
             return 0
 
-        entries = self._cache.get_pending(limit=self.config.batch_size)
+        # 缓存中即为上报用的 JSON，直接转发，无需重建 ReportPayload
+        entries = self._cache.get_pending_raw(limit=self.config.batch_size)
         if not entries:
             return 0
 
         success_count = 0
+        # 已送达或放弃的条目在本轮结束后一次性移除
+        done_ids: list[int] = []
         for entry in entries:
-            status = await self._send_with_retry(entry.payload)
+            body = self._compress_body(entry.payload_json)
+            status = await self._post_with_retry(body, entry.batch_id)
 
             if status == ReportStatus.SUCCESS:
-                self._cache.remove(entry.id)
+                done_ids.append(entry.id)
                 success_count += 1
             else:
                 # 更新重试计数
@@ -350,10 +414,10 @@ class HTTPReporter(BaseReporter):
 
                 # 如果重试次数过多，可能需要放弃
                 if entry.retry_count >= self.config.retry_max * 3:
-                    logger.warning(
-                        f"缓存条目重试次数过多，放弃: {entry.payload.batch_id}"
-                    )
-                    self._cache.remove(entry.id)
+                    logger.warning(f"缓存条目重试次数过多，放弃: {entry.batch_id}")
+                    done_ids.append(entry.id)
+
+        self._cache.remove_many(done_ids)
 
         if success_count > 0:
             logger.info(f"缓存刷新完成: {success_count}/{len(entries)} 成功")
@@ -371,16 +435,20 @@ class HTTPReporter(BaseReporter):
         if not self._cache or not self._cache.is_open:
             return 0
 
-        entries = self._cache.get_pending(limit=self.config.batch_size)
+        # 缓存中即为上报用的 JSON，直接转发，无需重建 ReportPayload
+        entries = self._cache.get_pending_raw(limit=self.config.batch_size)
         if not entries:
             return 0
 
         success_count = 0
+        # 已送达或放弃的条目在本轮结束后一次性移除
+        done_ids: list[int] = []
         for entry in entries:
-            status = self._send_with_retry_sync(entry.payload)
+            body = self._compress_body(entry.payload_json)
+            status = self._post_with_retry_sync(body, entry.batch_id)
 
             if status == ReportStatus.SUCCESS:
-                self._cache.remove(entry.id)
+                done_ids.append(entry.id)
                 success_count += 1
             else:
                 # 更新重试计数
@@ -388,10 +456,10 @@ class HTTPReporter(BaseReporter):
 
                 # 如果重试次数过多，可能需要放弃
                 if entry.retry_count >= self.config.retry_max * 3:
-                    logger.warning(
-                        f"缓存条目重试次数过多，放弃: {entry.payload.batch_id}"
-                    )
-                    self._cache.remove(entry.id)
+                    logger.warning(f"缓存条目重试次数过多，放弃: {entry.batch_id}")
+                    done_ids.append(entry.id)
+
+        self._cache.remove_many(done_ids)
 
         if success_count > 0:
             logger.info(f"缓存刷新完成: {success_count}/{len(entries)} 成功")
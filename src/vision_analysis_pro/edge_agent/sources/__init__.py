@@ -14,12 +14,14 @@ from ..models import SourceType
 from .base import BaseSource
 from .camera import CameraSource
 from .folder import FolderSource
+from .prefetch import FramePrefetcher
 from .video import VideoSource
 
 __all__ = [
     "BaseSource",
     "CameraSource",
     "FolderSource",
+    "FramePrefetcher",
     "VideoSource",
     "create_source",
 ]
@@ -0,0 +1,135 @@
+"""帧预取
+
+在后台线程中迭代数据源，把解码好的帧放入有界队列，
+使下一帧的读取/解码与当前帧的推理重叠执行。
+"""
+
+import logging
+import threading
+from collections.abc import Iterator
+from queue import Empty, Full, Queue
+from types import TracebackType
+
+from ..models import FrameData
+from .base import BaseSource
+
+logger = logging.getLogger(__name__)
+
+# 数据源结束哨兵
+_END = object()
+
+# 队列满/空时检查停止标志的间隔 (秒)
+_POLL_INTERVAL = 0.1
+
+# 退出时等待预取线程结束的最长时间 (秒)
+_JOIN_TIMEOUT = 5.0
+
+
+class FramePrefetcher:
+    """数据源帧预取器
+
+    预取线程按数据源自身的迭代语义（FPS 限制、跳帧、循环）读取帧，
+    队列容量 depth 限定了预取帧数，也即相对于实时画面的最大额外延迟。
+    预取线程中的异常会在消费方迭代时重新抛出。
+
+    必须在数据源关闭之前退出（__exit__ 会停止并等待预取线程），例如:
+
+        with source, FramePrefetcher(source, depth=2) as frames:
+            for frame in frames:
+                ...
+    """
+
+    def __init__(self, source: BaseSource, depth: int = 2) -> None:
+        """初始化预取器
+
+        Args:
+            source: 已打开或即将打开的数据源
+            depth: 预取队列容量
+
+        Raises:
+            ValueError: depth 小于 1
+        """
+        if depth < 1:
+            raise ValueError(f"预取队列容量必须 >= 1，实际: {depth}")
+
+        self.source = source
+        self.depth = depth
+        self._queue: Queue[object] = Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> "FramePrefetcher":
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._worker,
+            name="frame-prefetch",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """停止预取线程并丢弃尚未消费的帧"""
+        self._stop.set()
+        thread = self._thread
+        if thread is None:
+            return
+        thread.join(timeout=_JOIN_TIMEOUT)
+        if thread.is_alive():
+            logger.warning("预取线程未能在超时内退出（数据源读取阻塞）")
+        self._thread = None
+
+        while True:
+            try:
+                self._queue.get_nowait()
+            except Empty:
+                break
+
+    def __iter__(self) -> Iterator[FrameData]:
+        """按数据源顺序返回预取的帧"""
+        while True:
+            try:
+                item = self._queue.get(timeout=_POLL_INTERVAL)
+            except Empty:
+                if self._thread is None or not self._thread.is_alive():
+                    return
+                continue
+            if item is _END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item  # type: ignore[misc]
+
+    def _put(self, item: object) -> bool:
+        """放入队列，队列满时阻塞直到有空位或收到停止信号
+
+        Returns:
+            是否成功放入
+        """
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except Full:
+                continue
+        return False
+
+    def _worker(self) -> None:
+        """预取线程：迭代数据源并把帧放入队列"""
+        try:
+            for frame in self.source:
+                if not self._put(frame):
+                    return
+        except Exception as e:
+            logger.error(f"预取线程读取数据源失败: {e}")
+            self._put(e)
+            return
+        self._put(_END)
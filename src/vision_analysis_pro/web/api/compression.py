@@ -0,0 +1,122 @@
+"""压缩请求体解码
+
+边缘 Agent 可按配置以 gzip / zstd 压缩上报请求体并设置 Content-Encoding，
+此处提供在路由层透明解压请求体的 Request / APIRoute 子类。
+"""
+
+import zlib
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.routing import APIRoute
+
+# 可选：zstd 解压，未安装时只接受 gzip
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# 解压后请求体大小上限，防止压缩炸弹
+MAX_DECOMPRESSED_BYTES = 32 * 1024 * 1024
+
+
+def supported_encodings() -> tuple[str, ...]:
+    """当前环境可解码的 Content-Encoding"""
+    return ("gzip", "zstd") if zstandard is not None else ("gzip",)
+
+
+def _gunzip(body: bytes, limit: int) -> bytes:
+    """解压 gzip 数据，最多输出 limit 字节
+
+    Raises:
+        ValueError: 数据损坏或不完整
+    """
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        data = decoder.decompress(body, limit)
+    except zlib.error as e:
+        raise ValueError(str(e)) from e
+    if len(data) < limit and not decoder.eof:
+        raise ValueError("gzip 数据不完整")
+    return data
+
+
+def _unzstd(body: bytes, limit: int) -> bytes:
+    """解压 zstd 数据，最多输出 limit 字节
+
+    Raises:
+        ValueError: 数据损坏或不完整
+    """
+    chunks: list[bytes] = []
+    size = 0
+    try:
+        with zstandard.ZstdDecompressor().stream_reader(body) as reader:
+            while size < limit and (chunk := reader.read(limit - size)):
+                chunks.append(chunk)
+                size += len(chunk)
+    except zstandard.ZstdError as e:
+        raise ValueError(str(e)) from e
+    return b"".join(chunks)
+
+
+def decode_body(body: bytes, encoding: str) -> bytes:
+    """按 Content-Encoding 解压请求体
+
+    Args:
+        body: 原始请求体
+        encoding: Content-Encoding 头的值（已小写），空字符串或 identity 表示未压缩
+
+    Returns:
+        解压后的请求体
+
+    Raises:
+        HTTPException: 不支持的编码 (415)、数据损坏 (400) 或解压后超过大小上限 (413)
+    """
+    if encoding in ("", "identity"):
+        return body
+    if encoding not in supported_encodings():
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"不支持的 Content-Encoding: {encoding}",
+        )
+
+    decompress = _gunzip if encoding == "gzip" else _unzstd
+    try:
+        data = decompress(body, MAX_DECOMPRESSED_BYTES + 1)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"请求体解压失败: {e}",
+        ) from e
+
+    if len(data) > MAX_DECOMPRESSED_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="解压后的请求体过大",
+        )
+    return data
+
+
+class DecompressingRequest(Request):
+    """读取请求体时按 Content-Encoding 透明解压的 Request"""
+
+    async def body(self) -> bytes:
+        if not hasattr(self, "_body"):
+            raw = await super().body()
+            encoding = self.headers.get("content-encoding", "").strip().lower()
+            self._body = decode_body(raw, encoding)
+        return self._body
+
+
+class DecompressingRoute(APIRoute):
+    """使用 DecompressingRequest 的路由类，供接收压缩上报的路由器使用"""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        original_route_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            request = DecompressingRequest(request.scope, request.receive)
+            return await original_route_handler(request)
+
+        return route_handler
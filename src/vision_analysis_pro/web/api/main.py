@@ -5,7 +5,8 @@ import logging
 import os
 import time
 import uuid
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any
 
@@ -13,6 +14,7 @@ from fastapi import FastAPI, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from vision_analysis_pro.core.inference.base import configure_kernel_caches
 from vision_analysis_pro.logging_utils import configure_logging
 from vision_analysis_pro.settings import get_settings
 from vision_analysis_pro.web.api import schemas
@@ -30,7 +32,15 @@ def _parse_cors_allow_origins(raw_origins: str) -> list[str]:
     return origins or ["*"]
 
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """服务启动时配置 GPU 内核持久化缓存（须早于首次加载模型）"""
+    configure_kernel_caches()
+    yield
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="工程基础设施图像识别智能运维系统",
     description="基于 YOLO 的无人机巡检系统后端 API",
     version="0.1.0",
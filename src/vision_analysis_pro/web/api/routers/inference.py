@@ -8,7 +8,7 @@ import logging
 import time
 import zipfile
 from types import SimpleNamespace
-from typing import Annotated, Any
+from typing import Annotated, Any, Literal
 
 from fastapi import (
     APIRouter,
@@ -40,6 +40,10 @@ logger = logging.getLogger(__name__)
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 ALLOWED_MIME_TYPES = {"image/jpeg", "image/png", "image/jpg", "image/webp"}
 
+# format=binary 时放入 X-Inference-Result 响应头的检测结果 JSON 上限（字节）；
+# 常见反向代理的响应头缓冲为 4-8 KB，超出时改为返回 JSON 响应
+MAX_RESULT_HEADER_BYTES = 4 * 1024
+
 
 def _record_inference_metrics(
     metrics: ApiMetrics,
@@ -130,6 +134,24 @@ async def _read_and_validate_upload(file: UploadFile) -> bytes:
     return file_bytes
 
 
+def _render_visualization(
+    file_bytes: bytes, detections: list[schemas.DetectionBox]
+) -> bytes | None:
+    """绘制检测框并编码为 JPEG，失败时返回 None。"""
+    try:
+        detection_dicts = [
+            {
+                "label": det.label,
+                "confidence": det.confidence,
+                "bbox": det.bbox,
+            }
+            for det in detections
+        ]
+        return draw_detections(file_bytes, detection_dicts)
+    except Exception:
+        return None
+
+
 def _run_inference(
     *,
     request_id: str,
@@ -181,20 +203,10 @@ def _run_inference(
 
     visualization_data = None
     if visualize and detections:
-        try:
-            detection_dicts = [
-                {
-                    "label": det.label,
-                    "confidence": det.confidence,
-                    "bbox": det.bbox,
-                }
-                for det in detections
-            ]
-            vis_bytes = draw_detections(file_bytes, detection_dicts)
+        vis_bytes = _render_visualization(file_bytes, detections)
+        if vis_bytes is not None:
             vis_base64 = base64.b64encode(vis_bytes).decode("utf-8")
             visualization_data = f"data:image/jpeg;base64,{vis_base64}"
-        except Exception:
-            visualization_data = None
 
     inference_time_ms = round((time.perf_counter() - start_time) * 1000, 2)
     detection_count = len(detections)
@@ -238,6 +250,7 @@ def _run_inference(
     "/image",
     response_model=schemas.InferenceResponse,
     responses={
+        200: {"content": {"image/jpeg": {}}},
         400: {"model": schemas.ErrorResponse},
         500: {"model": schemas.ErrorResponse},
     },
@@ -248,8 +261,20 @@ async def inference_image(
     engine: Annotated[Any, Depends(get_inference_engine)],
     file: UploadFile = File(...),
     visualize: bool = Query(False, description="是否返回可视化图像"),
-) -> schemas.InferenceResponse:
-    """图像推理接口"""
+    response_format: Literal["json", "binary"] = Query(
+        "json",
+        alias="format",
+        description="响应格式：json 返回检测结果；binary 直接返回可视化 JPEG",
+    ),
+) -> schemas.InferenceResponse | Response:
+    """图像推理接口
+
+    ``format=binary`` 时响应体为绘制检测框后的 JPEG 原始字节，省去 base64 编解码；
+    检测数量通过 ``X-Detection-Count`` 响应头返回，完整检测结果（不含可视化）以
+    JSON 形式放在 ``X-Inference-Result`` 响应头中，客户端一次请求即可同时拿到两者。
+    检测结果 JSON 超过 ``MAX_RESULT_HEADER_BYTES`` 时（目标密集的画面），
+    改为返回 JSON 响应，可视化图像以 Data URI 放在 ``visualization`` 字段中。
+    """
     request_id = getattr(request.state, "request_id", "unknown")
 
     logger.info(
@@ -259,6 +284,7 @@ async def inference_image(
             "upload_filename": file.filename,
             "content_type": file.content_type,
             "visualize": visualize,
+            "response_format": response_format,
         },
     )
 
@@ -266,14 +292,46 @@ async def inference_image(
 
     metrics: ApiMetrics = request.app.state.metrics
     metrics.inc("inference_requests_total")
-    return _run_inference(
+    result = _run_inference(
         request_id=request_id,
         file=file,
         file_bytes=file_bytes,
         settings=settings,
         engine=engine,
         metrics=metrics,
-        visualize=visualize,
+        visualize=visualize and response_format == "json",
+    )
+    if response_format == "json":
+        return result
+
+    vis_bytes = _render_visualization(file_bytes, result.detections)
+    if vis_bytes is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "code": "VISUALIZATION_ERROR",
+                "message": "可视化图像生成失败",
+                "detail": "无法绘制检测结果",
+            },
+        )
+    metrics.inc("inference_visualizations_total")
+
+    # 响应头按 latin-1 编码，ensure_ascii 转义文件名等非 ASCII 字符
+    result_header = json.dumps(
+        result.model_dump(mode="json"), ensure_ascii=True, separators=(",", ":")
+    )
+    if len(result_header) > MAX_RESULT_HEADER_BYTES:
+        vis_base64 = base64.b64encode(vis_bytes).decode("utf-8")
+        result.visualization = f"data:image/jpeg;base64,{vis_base64}"
+        return result
+
+    return Response(
+        content=vis_bytes,
+        media_type="image/jpeg",
+        headers={
+            "X-Detection-Count": str(len(result.detections)),
+            "X-Inference-Result": result_header,
+        },
     )
 
 
@@ -11,6 +11,7 @@ from fastapi.responses import Response
 
 from vision_analysis_pro.settings import Settings, get_settings
 from vision_analysis_pro.web.api import schemas
+from vision_analysis_pro.web.api.compression import DecompressingRoute
 from vision_analysis_pro.web.api.inference_tasks import get_inference_task_manager
 from vision_analysis_pro.web.api.metrics import ApiMetrics
 from vision_analysis_pro.web.api.report_store import (
@@ -20,7 +21,8 @@ from vision_analysis_pro.web.api.report_store import (
 )
 from vision_analysis_pro.web.api.reporting import build_detection_report
 
-router = APIRouter(prefix="/api/v1", tags=["reports"])
+# 边缘 Agent 可能以 gzip / zstd 压缩上报请求体
+router = APIRouter(prefix="/api/v1", tags=["reports"], route_class=DecompressingRoute)
 logger = logging.getLogger(__name__)
 
 
@@ -31,6 +33,7 @@ logger = logging.getLogger(__name__)
     responses={
         202: {"model": schemas.ReportResponse},
         401: {"model": schemas.ErrorResponse},
+        415: {"model": schemas.ErrorResponse},
         422: {"model": schemas.ErrorResponse},
     },
 )
@@ -2,6 +2,8 @@
 
 import asyncio
 import base64
+import gzip
+import json
 import logging
 import re
 import time
@@ -240,6 +242,53 @@ async def test_inference_endpoint_with_visualization() -> None:
         assert img is not None
 
 
+@pytest.mark.asyncio
+async def test_inference_endpoint_binary_visualization() -> None:
+    """测试 format=binary 直接返回可视化 JPEG 字节"""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.post(
+            "/api/v1/inference/image",
+            params={"visualize": "true", "format": "binary"},
+            files={"file": ("test.jpg", _create_test_image(), "image/jpeg")},
+        )
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "image/jpeg"
+        assert resp.headers["x-detection-count"] == "3"
+        result = json.loads(resp.headers["x-inference-result"])
+        assert result["filename"] == "test.jpg"
+        assert len(result["detections"]) == 3
+        assert result["visualization"] is None
+
+        nparr = np.frombuffer(resp.content, np.uint8)
+        img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        assert img is not None
+
+
+@pytest.mark.asyncio
+async def test_inference_endpoint_binary_falls_back_to_json_for_large_results(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """测试 format=binary 检测结果超出响应头上限时回退为带 Data URI 的 JSON 响应"""
+    from vision_analysis_pro.web.api.routers import inference as inference_router
+
+    monkeypatch.setattr(inference_router, "MAX_RESULT_HEADER_BYTES", 64)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.post(
+            "/api/v1/inference/image",
+            params={"visualize": "true", "format": "binary"},
+            files={"file": ("test.jpg", _create_test_image(), "image/jpeg")},
+        )
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    assert "x-inference-result" not in resp.headers
+    data = resp.json()
+    assert len(data["detections"]) == 3
+    assert data["visualization"].startswith("data:image/jpeg;base64,")
+
+
 @pytest.mark.asyncio
 async def test_inference_endpoint_without_visualization() -> None:
     """测试不带可视化的推理接口（默认行为）"""
@@ -1217,6 +1266,29 @@ async def test_report_endpoint_accepts_edge_agent_payload() -> None:
     assert data["request_id"] == request_id
 
 
+@pytest.mark.asyncio
+async def test_report_endpoint_decodes_gzip_body() -> None:
+    """测试 report 端点透明解压 gzip 请求体，不支持的编码返回 415"""
+    body = gzip.compress(json.dumps(_create_report_payload()).encode("utf-8"))
+    headers = {"content-type": "application/json", "content-encoding": "gzip"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.post("/api/v1/report", headers=headers, content=body)
+        corrupt_resp = await client.post(
+            "/api/v1/report", headers=headers, content=body[:-8]
+        )
+        unsupported_resp = await client.post(
+            "/api/v1/report",
+            headers={**headers, "content-encoding": "br"},
+            content=body,
+        )
+
+    assert resp.status_code == 202
+    assert resp.json()["total_detections"] == 1
+    assert corrupt_resp.status_code == 400
+    assert unsupported_resp.status_code == 415
+
+
 @pytest.mark.asyncio
 async def test_report_endpoint_accepts_empty_result_batch() -> None:
     """测试 report 端点允许空批次，便于心跳或空检测批次扩展"""
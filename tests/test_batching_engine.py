@@ -0,0 +1,175 @@
+"""动态批处理推理引擎测试
+
+使用模拟的 ONNX 引擎验证请求合并、结果回填与静态 batch 降级逻辑，无需模型文件。
+"""
+
+import threading
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+
+from vision_analysis_pro.core.inference import BatchingInferenceEngine
+
+
+class FakeSession:
+    """记录每次 run 的 batch 大小，输出每个样本的像素均值"""
+
+    def __init__(self) -> None:
+        self.batch_sizes: list[int] = []
+
+    def run(self, output_names: list[str], feeds: dict[str, np.ndarray]) -> list:
+        blobs = feeds["images"]
+        self.batch_sizes.append(len(blobs))
+        return [blobs.reshape(len(blobs), -1).mean(axis=1)]
+
+
+class FakeONNXEngine:
+    """提供 BatchingInferenceEngine 所需接口的模拟 ONNX 引擎"""
+
+    def __init__(self, model_path: Path, batch_dim: Any = "batch") -> None:
+        self.model_path = model_path
+        self.input_name = "images"
+        self.input_shape = [batch_dim, 3, 4, 4]
+        self.output_names = ["output0"]
+        self.session = FakeSession()
+        self._buf = np.empty((1, 3, 4, 4), dtype=np.float32)
+        self.inference_lock = threading.Lock()
+
+    _validate_thresholds = staticmethod(lambda conf, iou: None)
+
+    def _run(self, blob: np.ndarray) -> list:
+        return self.session.run(self.output_names, {self.input_name: blob})
+
+    _load_image = staticmethod(lambda image: image)
+
+    def _target_size(self) -> tuple[int, int]:
+        return 4, 4
+
+    def _preprocess(self, image: np.ndarray, target_size: tuple[int, int]) -> tuple:
+        self._buf.fill(float(image[0, 0, 0]))
+        return self._buf, image.shape[:2], (1.0, 0, 0)
+
+    def _postprocess(self, outputs, orig_shape, info, conf, iou) -> list:
+        return [{"value": float(outputs[0]), "conf": conf}]
+
+
+@pytest.fixture
+def model_file(tmp_path: Path) -> Path:
+    path = tmp_path / "model.onnx"
+    path.write_bytes(b"")
+    return path
+
+
+def test_batching_merges_concurrent_requests(model_file: Path):
+    """测试并发请求被合并为一次推理，且结果按请求回填"""
+    fake = FakeONNXEngine(model_file)
+    images = [np.full((8, 8, 3), i, dtype=np.uint8) for i in range(4)]
+
+    with BatchingInferenceEngine(fake, max_batch_size=4, max_wait_ms=500) as engine:
+        futures = [engine.submit(img, conf=0.3) for img in images]
+        results = [f.result(timeout=5) for f in futures]
+
+    assert fake.session.batch_sizes == [4]
+    assert [r[0]["value"] for r in results] == [0.0, 1.0, 2.0, 3.0]
+    assert all(r[0]["conf"] == 0.3 for r in results)
+
+
+def test_batching_respects_max_batch_size(model_file: Path):
+    """测试单批次不超过 max_batch_size，多余请求进入下一批"""
+    fake = FakeONNXEngine(model_file)
+    images = [np.full((8, 8, 3), i, dtype=np.uint8) for i in range(5)]
+
+    with BatchingInferenceEngine(fake, max_batch_size=2, max_wait_ms=200) as engine:
+        futures = [engine.submit(img) for img in images]
+        for f in futures:
+            f.result(timeout=5)
+
+    assert max(fake.session.batch_sizes) <= 2
+    assert sum(fake.session.batch_sizes) == 5
+
+
+def test_batching_predict_from_multiple_threads(model_file: Path):
+    """测试多线程调用 predict 均能拿到各自的结果"""
+    fake = FakeONNXEngine(model_file)
+    results: dict[int, list] = {}
+
+    with BatchingInferenceEngine(fake, max_batch_size=8, max_wait_ms=50) as engine:
+
+        def worker(i: int) -> None:
+            results[i] = engine.predict(np.full((8, 8, 3), i, dtype=np.uint8))
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5)
+
+    assert {i: r[0]["value"] for i, r in results.items()} == {
+        i: float(i) for i in range(6)
+    }
+
+
+def test_batching_static_batch_falls_back_to_single(model_file: Path):
+    """测试静态 batch 维度的模型退化为逐个推理"""
+    fake = FakeONNXEngine(model_file, batch_dim=1)
+
+    with BatchingInferenceEngine(fake, max_batch_size=8) as engine:
+        assert engine.max_batch_size == 1
+
+
+def test_batching_submit_after_close_raises(model_file: Path):
+    """测试关闭后提交请求抛出异常"""
+    engine = BatchingInferenceEngine(FakeONNXEngine(model_file))
+    engine.close()
+
+    with pytest.raises(RuntimeError):
+        engine.submit(np.zeros((8, 8, 3), dtype=np.uint8))
+
+
+def test_batching_keeps_embedded_preprocess_input_layout(model_file: Path):
+    """测试内嵌预处理模型的 NHWC uint8 输入按原布局堆叠为批次"""
+
+    class UInt8Engine(FakeONNXEngine):
+        def _preprocess(self, image, target_size):
+            blob = np.full((1, 4, 4, 3), image[0, 0, 0], dtype=np.uint8)
+            return blob, image.shape[:2], (1.0, 0, 0)
+
+    fake = UInt8Engine(model_file)
+    feeds: list[np.ndarray] = []
+    run = fake.session.run
+    fake.session.run = lambda names, inputs: (
+        feeds.append(inputs["images"]) or run(names, inputs)
+    )
+
+    with BatchingInferenceEngine(fake, max_batch_size=2, max_wait_ms=500) as engine:
+        futures = [engine.submit(np.full((8, 8, 3), i, np.uint8)) for i in (3, 7)]
+        results = [f.result(timeout=5) for f in futures]
+
+    assert feeds[0].shape == (2, 4, 4, 3)
+    assert feeds[0].dtype == np.uint8
+    assert [r[0]["value"] for r in results] == [3.0, 7.0]
+
+
+def test_batching_close_resolves_concurrently_submitted_requests(model_file: Path):
+    """测试与 close 并发提交的请求要么被拒绝，要么都能得到结果"""
+    engine = BatchingInferenceEngine(FakeONNXEngine(model_file), max_wait_ms=1)
+    futures = []
+
+    def submitter() -> None:
+        image = np.zeros((8, 8, 3), dtype=np.uint8)
+        while True:
+            try:
+                futures.append(engine.submit(image))
+            except RuntimeError:
+                return
+
+    threads = [threading.Thread(target=submitter) for _ in range(4)]
+    for t in threads:
+        t.start()
+    engine.close()
+    for t in threads:
+        t.join(timeout=5)
+
+    assert all(f.result(timeout=5) is not None for f in futures)
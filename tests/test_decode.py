@@ -0,0 +1,51 @@
+"""图像字节流解码测试"""
+
+import cv2
+import numpy as np
+
+from vision_analysis_pro.core.preprocessing.decode import decode_image, jpeg_size
+
+
+def _encode(ext: str, height: int, width: int) -> bytes:
+    img = np.full((height, width, 3), 128, dtype=np.uint8)
+    success, encoded = cv2.imencode(ext, img)
+    assert success
+    return encoded.tobytes()
+
+
+def test_jpeg_size_reads_frame_header():
+    """测试从 JPEG 帧头读取尺寸"""
+    assert jpeg_size(_encode(".jpg", 123, 456)) == (123, 456)
+
+
+def test_jpeg_size_returns_none_for_non_jpeg():
+    """测试非 JPEG 数据返回 None"""
+    assert jpeg_size(_encode(".png", 10, 10)) is None
+    assert jpeg_size(b"not an image") is None
+
+
+def test_decode_image_reduces_large_jpeg():
+    """测试大尺寸 JPEG 降采样解码，且不小于目标尺寸"""
+    decoded = decode_image(_encode(".jpg", 2160, 3840), (640, 640))
+
+    assert decoded.factor == 4
+    assert decoded.orig_shape == (2160, 3840)
+    assert decoded.image is not None
+    assert decoded.image.shape[:2] == (540, 960)
+
+
+def test_decode_image_keeps_small_images_full_resolution():
+    """测试小图像与未指定目标尺寸时全分辨率解码"""
+    small = decode_image(_encode(".jpg", 480, 640), (640, 640))
+    assert small.factor == 1
+    assert small.image is not None
+    assert small.image.shape[:2] == (480, 640)
+
+    full = decode_image(_encode(".jpg", 2160, 3840))
+    assert full.factor == 1
+    assert full.orig_shape == (2160, 3840)
+
+
+def test_decode_image_invalid_bytes():
+    """测试无效字节流返回空图像"""
+    assert decode_image(b"garbage", (640, 640)).image is None
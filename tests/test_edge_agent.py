@@ -1,5 +1,7 @@
 """边缘 Agent 核心模块单元测试"""
 
+import json
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
@@ -21,7 +23,7 @@ from vision_analysis_pro.edge_agent import (
 )
 from vision_analysis_pro.edge_agent.agent import EdgeAgent
 from vision_analysis_pro.edge_agent.reporters.cache import CacheManager
-from vision_analysis_pro.edge_agent.sources import create_source
+from vision_analysis_pro.edge_agent.sources import FramePrefetcher, create_source
 from vision_analysis_pro.edge_agent.sources.folder import FolderSource
 from vision_analysis_pro.edge_agent.sources.video import VideoSource
 
@@ -34,6 +36,7 @@ EDGE_AGENT_ENV_KEYS = [
     "EDGE_AGENT_SOURCE_FPS_LIMIT",
     "EDGE_AGENT_SOURCE_LOOP",
     "EDGE_AGENT_SOURCE_SKIP_FRAMES",
+    "EDGE_AGENT_SOURCE_PREFETCH",
     "EDGE_AGENT_SOURCE_KEYFRAMES_ENABLED",
     "EDGE_AGENT_SOURCE_KEYFRAMES_INTERVAL_SECONDS",
     "EDGE_AGENT_SOURCE_KEYFRAMES_MIN_SCENE_DELTA",
@@ -44,12 +47,19 @@ EDGE_AGENT_ENV_KEYS = [
     "EDGE_AGENT_INFERENCE_CONFIDENCE",
     "EDGE_AGENT_INFERENCE_IOU",
     "EDGE_AGENT_INFERENCE_DEVICE",
+    "EDGE_AGENT_INFERENCE_MAX_BATCH_SIZE",
+    "EDGE_AGENT_INFERENCE_MAX_WAIT_MS",
+    "EDGE_AGENT_INFERENCE_CPU_AFFINITY",
+    "EDGE_AGENT_INFERENCE_QUANTIZE",
     "EDGE_AGENT_REPORTER_TYPE",
     "EDGE_AGENT_REPORTER_URL",
     "EDGE_AGENT_REPORTER_API_KEY",
     "EDGE_AGENT_REPORTER_TIMEOUT",
     "EDGE_AGENT_REPORTER_RETRY_MAX",
     "EDGE_AGENT_REPORTER_BATCH_SIZE",
+    "EDGE_AGENT_REPORTER_MAX_INFLIGHT",
+    "EDGE_AGENT_REPORTER_COMPRESSION",
+    "EDGE_AGENT_REPORTER_CPU_AFFINITY",
     "EDGE_AGENT_CACHE_ENABLED",
     "EDGE_AGENT_CACHE_DB_PATH",
     "EDGE_AGENT_CACHE_MAX_ENTRIES",
@@ -116,6 +126,16 @@ class TestFrameData:
         dt = frame.datetime
         assert dt.timestamp() == timestamp
 
+    def test_frame_data_image_is_c_contiguous(self) -> None:
+        """测试非连续视图转为 C 连续数组，连续数组不拷贝"""
+        image = np.zeros((100, 100, 3), dtype=np.uint8)
+        assert FrameData(image=image, timestamp=0.0, source_id="t").image is image
+
+        view = image[:, ::-1, ::-1]
+        frame = FrameData(image=view, timestamp=0.0, source_id="t")
+        assert frame.image.flags.c_contiguous
+        np.testing.assert_array_equal(frame.image, view)
+
 
 class TestDetection:
     """Detection 数据模型测试"""
@@ -345,6 +365,14 @@ class TestInferenceConfig:
         assert config.engine == "yolo"
         assert config.model_path == "models/custom.pt"
         assert config.confidence == 0.7
+        assert config.max_batch_size == 1
+
+    def test_from_dict_batching(self) -> None:
+        """测试合批参数"""
+        config = InferenceConfig.from_dict({"max_batch_size": 4, "max_wait_ms": 20})
+
+        assert config.max_batch_size == 4
+        assert config.max_wait_ms == 20.0
 
 
 class TestEdgeAgentConfig:
@@ -418,6 +446,29 @@ inference:
         assert config.source.keyframes.blur_threshold == 12
         assert config.source.keyframes.max_frames == 8
 
+    def test_cpu_affinity_from_env_and_validation(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """测试 CPU 亲和性从环境变量解析，负数核心编号校验失败"""
+        monkeypatch.setenv("EDGE_AGENT_INFERENCE_CPU_AFFINITY", "4, 5,6,7")
+        monkeypatch.setenv("EDGE_AGENT_REPORTER_CPU_AFFINITY", "0")
+
+        config = EdgeAgentConfig.from_env()
+        assert config.inference.cpu_affinity == [4, 5, 6, 7]
+        assert config.reporter.cpu_affinity == [0]
+
+        config.reporter.cpu_affinity = [-1]
+        assert any("cpu_affinity" in error for error in config.validate())
+
+    def test_quantize_mode_validation(self) -> None:
+        """测试量化模式：支持 none / dynamic，静态量化需离线导出"""
+        config = EdgeAgentConfig.from_dict({"inference": {"quantize": "Dynamic"}})
+        assert config.inference.quantize == "dynamic"
+        assert not any("量化模式" in error for error in config.validate())
+
+        config.inference.quantize = "static"
+        assert any("量化模式" in error for error in config.validate())
+
     def test_load_preserves_yaml_values_without_env(
         self,
         tmp_path: Path,
@@ -632,6 +683,74 @@ class TestCacheManager:
         assert entry is not None
         assert entry.payload.device_id == "test-device"
 
+    def test_open_configures_wal_journal(self, cache_manager: CacheManager) -> None:
+        """测试缓存数据库默认使用 WAL 日志与 NORMAL 同步级别"""
+        conn = cache_manager._connection()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        # NORMAL = 1
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+    def test_threads_use_separate_connections(
+        self, cache_manager: CacheManager
+    ) -> None:
+        """测试各线程使用独立连接读取，关闭时一并释放"""
+        cache_manager.add(ReportPayload(device_id="dev", results=[], batch_id="t"))
+
+        counts: list[int] = []
+        thread = threading.Thread(target=lambda: counts.append(cache_manager.count()))
+        thread.start()
+        thread.join()
+
+        assert counts == [1]
+        assert len(cache_manager._conns) == 2
+
+        cache_manager.close()
+        assert cache_manager._conns == {}
+
+    def test_payload_stored_compressed_and_legacy_text_readable(
+        self, cache_manager: CacheManager
+    ) -> None:
+        """测试载荷以压缩 BLOB 存储，旧版本写入的 JSON 文本仍可读取"""
+        payload = ReportPayload(device_id="test-device", results=[], batch_id="new")
+        entry_id = cache_manager.add(payload)
+
+        conn = cache_manager._connection()
+        stored = conn.execute(
+            "SELECT payload_json FROM cache_entries WHERE id = ?", (entry_id,)
+        ).fetchone()[0]
+        assert isinstance(stored, bytes)
+
+        legacy = ReportPayload(device_id="test-device", results=[], batch_id="legacy")
+        conn.execute(
+            "INSERT INTO cache_entries (batch_id, device_id, payload_json, created_at) "
+            "VALUES (?, ?, ?, ?)",
+            ("legacy", "test-device", json.dumps(legacy.to_dict()), time.time()),
+        )
+        conn.commit()
+
+        batch_ids = {entry.payload.batch_id for entry in cache_manager.get_pending()}
+        assert batch_ids == {"new", "legacy"}
+
+    def test_add_many_returns_ids_in_order(self, cache_manager: CacheManager) -> None:
+        """测试批量添加返回与载荷对应的 ID，重复 batch_id 覆盖旧条目"""
+        payloads = [
+            ReportPayload(device_id="test-device", results=[], batch_id=f"batch-{i}")
+            for i in range(3)
+        ]
+
+        entry_ids = cache_manager.add_many(payloads)
+
+        assert len(set(entry_ids)) == 3
+        for entry_id, payload in zip(entry_ids, payloads, strict=True):
+            entry = cache_manager.get(entry_id)
+            assert entry is not None
+            assert entry.payload.batch_id == payload.batch_id
+
+        replaced_id = cache_manager.add_many([payloads[0]])[0]
+        assert cache_manager.get(entry_ids[0]) is None
+        assert cache_manager.get(replaced_id) is not None
+        assert cache_manager.add_many([]) == []
+
     def test_get_pending(self, cache_manager: CacheManager) -> None:
         """测试获取待处理条目"""
         # 添加多个条目
@@ -645,6 +764,17 @@ class TestCacheManager:
         entries = cache_manager.get_pending(limit=3)
         assert len(entries) == 3
 
+    def test_get_pending_raw(self, cache_manager: CacheManager) -> None:
+        """测试获取未解析的待处理条目"""
+        payload = ReportPayload(device_id="dev", batch_id="raw-batch", results=[])
+        entry_id = cache_manager.add(payload)
+
+        (raw,) = cache_manager.get_pending_raw()
+        assert raw.id == entry_id
+        assert raw.batch_id == "raw-batch"
+        assert raw.retry_count == 0
+        assert json.loads(raw.payload_json) == payload.to_dict()
+
     def test_remove(self, cache_manager: CacheManager) -> None:
         """测试移除"""
         payload = ReportPayload(device_id="test", results=[])
@@ -654,6 +784,19 @@ class TestCacheManager:
         assert cache_manager.remove(entry_id) is True
         assert cache_manager.count() == 0
 
+    def test_remove_many(self, cache_manager: CacheManager) -> None:
+        """测试批量移除"""
+        ids = cache_manager.add_many(
+            [
+                ReportPayload(device_id="test", results=[], batch_id=f"b{i}")
+                for i in range(3)
+            ]
+        )
+
+        assert cache_manager.remove_many([ids[0], ids[2], 9999]) == 2
+        assert [e.id for e in cache_manager.get_pending()] == [ids[1]]
+        assert cache_manager.remove_many([]) == 0
+
     def test_update_retry(self, cache_manager: CacheManager) -> None:
         """测试更新重试计数"""
         payload = ReportPayload(device_id="test", results=[])
@@ -794,6 +937,37 @@ class TestFolderSource:
             source.read_frame()
             assert source.progress == 1.0
 
+    def test_prefetcher_yields_frames_in_order(self, image_folder: Path) -> None:
+        """测试预取器按数据源顺序返回全部帧"""
+        config = SourceConfig(type=SourceType.FOLDER, path=str(image_folder))
+        source = FolderSource(config, "test-folder")
+
+        with source, FramePrefetcher(source, depth=1) as frames:
+            frame_ids = [frame.frame_id for frame in frames]
+
+        assert frame_ids == sorted(frame_ids)
+        assert len(frame_ids) == 3
+
+    def test_prefetcher_stops_worker_on_early_exit(self, image_folder: Path) -> None:
+        """测试提前退出时预取线程停止，数据源异常在消费方重新抛出"""
+        config = SourceConfig(type=SourceType.FOLDER, path=str(image_folder), loop=True)
+        source = FolderSource(config)
+        prefetcher = FramePrefetcher(source, depth=2)
+
+        with source, prefetcher as frames:
+            thread = prefetcher._thread
+            next(iter(frames))
+        assert thread is not None and not thread.is_alive()
+
+        def broken_read() -> FrameData | None:
+            raise RuntimeError("decode failed")
+
+        with source:
+            source.read_frame = broken_read  # type: ignore[method-assign]
+            with FramePrefetcher(source) as frames:
+                with pytest.raises(RuntimeError, match="decode failed"):
+                    list(frames)
+
 
 class TestVideoSource:
     """VideoSource 数据源测试"""
@@ -949,7 +1123,8 @@ class TestEdgeAgentStats:
         """测试 get_stats 会返回平均推理耗时和 reporter 统计。"""
         monkeypatch.setattr(EdgeAgent, "_setup_signal_handlers", lambda self: None)
         agent = EdgeAgent(config=EdgeAgentConfig())
-        agent._stats["start_time"] = datetime.now().isoformat()
+        agent._stats["start_time"] = time.time() - 2.0
+        agent._start_monotonic = time.monotonic() - 2.0
         agent._stats["frames_processed"] = 4
         agent._stats["inference_count"] = 4
         agent._stats["inference_time_ms_total"] = 100.0
@@ -969,3 +1144,125 @@ class TestEdgeAgentStats:
         assert stats["reporter_success_rate"] == 0.6667
         assert stats["cache_entries"] == 2
         assert stats["report_queue_max"] == 5
+        assert isinstance(datetime.fromisoformat(stats["start_time"]), datetime)
+        assert stats["last_frame_time"] is None
+        assert stats["elapsed_seconds"] >= 2.0
+        assert stats["fps"] <= 2.0
+
+
+class TestEdgeAgentBatching:
+    """EdgeAgent 动态合批测试"""
+
+    def test_submitted_frames_resolve_in_order(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """测试帧逐个提交给批处理引擎，并按提交顺序回填结果与统计"""
+        from concurrent.futures import Future
+        from unittest.mock import MagicMock
+
+        from vision_analysis_pro.core.inference import BatchingInferenceEngine
+
+        monkeypatch.setattr(EdgeAgent, "_setup_signal_handlers", lambda self: None)
+        agent = EdgeAgent(config=EdgeAgentConfig(report_only_detections=True))
+
+        futures: list[Future] = []
+
+        def submit(image, conf, iou):
+            future: Future = Future()
+            futures.append(future)
+            return future
+
+        engine = MagicMock(spec=BatchingInferenceEngine)
+        engine.max_batch_size = 4
+        engine.submit.side_effect = submit
+        agent._inference_engine = engine
+
+        frames = [
+            FrameData(
+                image=np.full((4, 4, 3), i, dtype=np.uint8),
+                frame_id=i,
+                timestamp=float(i),
+                source_id="test",
+            )
+            for i in range(4)
+        ]
+        inflight = [agent._submit_inference(frame) for frame in frames]
+
+        assert engine.submit.call_count == 4
+        assert agent._stats["frames_processed"] == 0
+
+        # 批次完成：结果在引擎线程回填，与提交顺序无关
+        for i in reversed(range(4)):
+            futures[i].set_result(
+                [{"label": "crack", "confidence": 0.9, "bbox": [0, 0, i, i]}]
+                if i % 2
+                else []
+            )
+        results = [agent._finish_inference(item) for item in inflight]
+
+        assert agent._batch_capacity() == 4
+        engine.predict.assert_not_called()
+        assert results[0] is None and results[2] is None
+        assert [r.frame_id for r in results if r is not None] == [1, 3]
+        assert results[3].detections[0].bbox == [0, 0, 3, 3]
+        assert all(item.finished >= item.submitted for item in inflight)
+        assert agent._stats["frames_processed"] == 4
+        assert agent._stats["detections_total"] == 2
+
+
+class TestEdgeAgentReportQueue:
+    """EdgeAgent 上报队列测试"""
+
+    def test_reporter_overlaps_requests_and_drains_before_exit(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """测试上报请求按 max_inflight 并发在途，关闭时处理完剩余数据再退出"""
+        import asyncio
+
+        from vision_analysis_pro.edge_agent import ReportStatus
+        from vision_analysis_pro.edge_agent import agent as agent_module
+        from vision_analysis_pro.edge_agent.reporters import BaseReporter
+
+        reported: list[str] = []
+        inflight = {"now": 0, "peak": 0}
+
+        class _Reporter(BaseReporter):
+            def connect(self) -> None:
+                self._is_connected = True
+
+            def disconnect(self) -> None:
+                self._is_connected = False
+
+            async def report(self, payload: ReportPayload) -> ReportStatus:
+                inflight["now"] += 1
+                inflight["peak"] = max(inflight["peak"], inflight["now"])
+                await asyncio.sleep(0.05)
+                inflight["now"] -= 1
+                reported.append(payload.batch_id)
+                self._record_result(success=True)
+                return ReportStatus.SUCCESS
+
+        monkeypatch.setattr(EdgeAgent, "_setup_signal_handlers", lambda self: None)
+        monkeypatch.setattr(
+            agent_module, "create_reporter", lambda config, cache: _Reporter(config)
+        )
+        agent = EdgeAgent(
+            config=EdgeAgentConfig(reporter=ReporterConfig(max_inflight=2))
+        )
+
+        agent._start_reporter()
+        for i in range(5):
+            agent._enqueue_report(
+                ReportPayload(device_id="d", results=[], batch_id=f"b{i}")
+            )
+        agent._stop_reporter()
+
+        assert agent._reporter_thread is not None
+        assert not agent._reporter_thread.is_alive()
+        assert sorted(reported) == [f"b{i}" for i in range(5)]
+        assert inflight["peak"] == 2
+        assert agent.get_stats()["queue_size"] == 0
+        assert agent._stats["reports_sent"] == 5
+        assert agent._stats["reporter_report_count"] == 5
@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
+import gzip
+import json
 from pathlib import Path
 
 import httpx
+import pytest
 
 from vision_analysis_pro.edge_agent import (
     CacheConfig,
@@ -15,14 +19,18 @@ from vision_analysis_pro.edge_agent import (
     ReportStatus,
 )
 from vision_analysis_pro.edge_agent.reporters import HTTPReporter
+from vision_analysis_pro.edge_agent.reporters import http as http_reporter
+from vision_analysis_pro.edge_agent.reporters.base import serialize_payload
 
 
 class _FakeSyncClient:
     def __init__(self, responses: list[httpx.Response | Exception]) -> None:
         self._responses = responses
         self._index = 0
+        self.bodies: list[bytes] = []
 
-    def post(self, _url: str, json: dict) -> httpx.Response:
+    def post(self, _url: str, content: bytes) -> httpx.Response:
+        self.bodies.append(content)
         response = self._responses[min(self._index, len(self._responses) - 1)]
         self._index += 1
         if isinstance(response, Exception):
@@ -36,6 +44,17 @@ class _FakeSyncClient:
         return None
 
 
+class _FakeAsyncClient:
+    def __init__(self, error: Exception) -> None:
+        self._error = error
+
+    async def post(self, _url: str, content: bytes) -> httpx.Response:
+        raise self._error
+
+    async def aclose(self) -> None:
+        return None
+
+
 def _build_payload(batch_id: str = "edge-agent-001-batch") -> ReportPayload:
     return ReportPayload(
         device_id="edge-agent-001",
@@ -89,13 +108,35 @@ def test_http_reporter_caches_payload_when_network_is_unavailable(
     """测试断网时上报结果会落入离线缓存。"""
     reporter = _build_reporter(tmp_path)
     request = httpx.Request("POST", reporter.config.url)
-    reporter._sync_client = _FakeSyncClient(  # type: ignore[assignment]
-        [httpx.ConnectError("offline", request=request)]
-    )
+    client = _FakeSyncClient([httpx.ConnectError("offline", request=request)])
+    reporter._sync_client = client  # type: ignore[assignment]
 
     try:
         status = reporter.report_sync(_build_payload())
 
+        assert status == ReportStatus.CACHED
+        assert reporter.get_cache_stats()["count"] == 1
+        # 缓存的 JSON 即上报时序列化的请求体，不重复序列化
+        assert reporter._cache is not None
+        (entry,) = reporter._cache.get_pending_raw()
+        assert entry.payload_json == client.bodies[0]
+    finally:
+        reporter.disconnect()
+
+
+def test_http_reporter_async_report_caches_payload_off_event_loop(
+    tmp_path: Path,
+) -> None:
+    """测试异步上报失败时结果经线程池写入离线缓存。"""
+    reporter = _build_reporter(tmp_path)
+    request = httpx.Request("POST", reporter.config.url)
+    reporter._client = _FakeAsyncClient(  # type: ignore[assignment]
+        httpx.ConnectError("offline", request=request)
+    )
+
+    try:
+        status = asyncio.run(reporter.report(_build_payload()))
+
         assert status == ReportStatus.CACHED
         assert reporter.get_cache_stats()["count"] == 1
     finally:
@@ -167,3 +208,69 @@ def test_http_reporter_treats_duplicate_batch_as_successful_replay(
         assert reporter.get_cache_stats()["count"] == 0
     finally:
         reporter.disconnect()
+
+
+def test_http_reporter_flush_forwards_cached_json_body(tmp_path: Path) -> None:
+    """测试刷新缓存时直接转发缓存的 JSON，而不重建载荷。"""
+    reporter = _build_reporter(tmp_path)
+    payload = _build_payload(batch_id="edge-agent-001-raw")
+    client = _FakeSyncClient(
+        [httpx.Response(200, request=httpx.Request("POST", reporter.config.url))]
+    )
+
+    try:
+        assert reporter._cache is not None
+        reporter._cache.add(payload)
+        reporter._sync_client = client  # type: ignore[assignment]
+
+        assert reporter.flush_cache_sync() == 1
+        assert json.loads(client.bodies[0]) == payload.to_dict()
+    finally:
+        reporter.disconnect()
+
+
+def test_http_reporter_compresses_request_body() -> None:
+    """测试启用 gzip 压缩时请求体与 Content-Encoding 头一致且可还原"""
+    reporter = HTTPReporter(
+        ReporterConfig(url="http://example.com/api/v1/report", compression="gzip")
+    )
+    reporter.connect()
+    payload = _build_payload()
+
+    try:
+        assert reporter._sync_client is not None
+        assert reporter._sync_client.headers["Content-Encoding"] == "gzip"
+        fake = _FakeSyncClient(
+            [httpx.Response(202, request=httpx.Request("POST", reporter.config.url))]
+        )
+        reporter._sync_client = fake  # type: ignore[assignment]
+
+        assert reporter.report_sync(payload) == ReportStatus.SUCCESS
+        assert json.loads(gzip.decompress(fake.bodies[0])) == payload.to_dict()
+    finally:
+        reporter.disconnect()
+
+
+def test_http_reporter_zstd_falls_back_to_gzip_without_zstandard(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """测试未安装 zstandard 时 zstd 压缩回退为 gzip"""
+    monkeypatch.setattr(http_reporter, "zstandard", None)
+    reporter = HTTPReporter(ReporterConfig(compression="zstd"))
+
+    body = reporter._compress_body(serialize_payload(_build_payload()))
+
+    assert reporter._compression == "gzip"
+    assert json.loads(gzip.decompress(body)) == _build_payload().to_dict()
+
+
+def test_http_reporter_uncompressed_body_is_compact_json() -> None:
+    """测试未压缩请求体为紧凑 UTF-8 JSON，与所用序列化库无关"""
+    reporter = HTTPReporter(ReporterConfig())
+    payload = _build_payload()
+
+    body = reporter._compress_body(serialize_payload(payload))
+
+    assert json.loads(body) == payload.to_dict()
+    assert b", " not in body
+    assert b": " not in body
@@ -1,8 +1,14 @@
 """推理引擎测试"""
 
+import os
+
 import numpy as np
 import pytest
 
+from vision_analysis_pro.core.inference.base import (
+    InferenceEngine,
+    configure_kernel_caches,
+)
 from vision_analysis_pro.core.inference.stub_engine import StubInferenceEngine
 
 
@@ -49,3 +55,73 @@ def test_stub_inference_engine_error_mode_raises_runtime_error() -> None:
 
     with pytest.raises(RuntimeError, match="模拟：推理失败"):
         engine.predict(image)
+
+
+@pytest.mark.unit
+def test_configure_kernel_caches_sets_defaults_without_overriding(
+    tmp_path, monkeypatch
+) -> None:
+    """测试内核缓存配置只补充缺失的环境变量并创建目录"""
+    for name in (
+        "CUDA_CACHE_PATH",
+        "CUDA_CACHE_MAXSIZE",
+        "MIOPEN_USER_DB_PATH",
+        "ORT_TENSORRT_CACHE_PATH",
+        "ORT_TENSORRT_ENGINE_CACHE_ENABLE",
+    ):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("CUDA_CACHE_PATH", "/custom/cuda")
+
+    configure_kernel_caches(tmp_path)
+
+    assert os.environ["CUDA_CACHE_PATH"] == "/custom/cuda"
+    assert os.environ["MIOPEN_USER_DB_PATH"] == str(tmp_path / "miopen")
+    assert os.environ["ORT_TENSORRT_CACHE_PATH"] == str(tmp_path / "trt")
+    assert os.environ["ORT_TENSORRT_ENGINE_CACHE_ENABLE"] == "1"
+    assert (tmp_path / "miopen").is_dir()
+    assert not (tmp_path / "cuda").exists()
+
+
+@pytest.mark.unit
+def test_inference_engine_io_binding_hooks_default_to_passthrough(tmp_path) -> None:
+    """测试未实现 IO 绑定的引擎使用默认钩子"""
+
+    class _MinimalEngine(InferenceEngine):
+        def predict(self, image, conf=0.5, iou=0.5):
+            return []
+
+        def warmup(self, imgsz=640):
+            pass
+
+    model_path = tmp_path / "model.bin"
+    model_path.write_bytes(b"")
+    engine = _MinimalEngine(model_path)
+    blob = np.zeros((1, 3, 8, 8), dtype=np.float32)
+
+    assert engine.create_io_binding() is None
+    assert engine.prepare_input(blob) is blob
+    assert not hasattr(engine, "predict_bound")
+
+
+def test_inference_engine_label_lookup_handles_sparse_ids(tmp_path) -> None:
+    """测试类别名称查找表：缺失与越界的 ID 回退为 class_{id}"""
+
+    class _MinimalEngine(InferenceEngine):
+        def predict(self, image, conf=0.5, iou=0.5):
+            return []
+
+        def warmup(self, imgsz=640):
+            pass
+
+    model_path = tmp_path / "model.bin"
+    model_path.write_bytes(b"")
+    engine = _MinimalEngine(model_path)
+    engine._build_label_table({0: "crack", 2: "deformation"})
+
+    assert engine._lookup_labels(np.array([2, 0, 1])) == [
+        "deformation",
+        "crack",
+        "class_1",
+    ]
+    assert engine._lookup_labels(np.array([0, 7])) == ["crack", "class_7"]
+    assert engine._lookup_labels(np.array([], dtype=np.int64)) == []
@@ -291,3 +291,74 @@ class TestONNXEngineCustomClassNames:
 
         engine = ONNXInferenceEngine(ONNX_MODEL_PATH, class_names=custom_names)
         assert engine.class_names == custom_names
+
+
+class TestONNXEngineCudaGraph:
+    """CUDA Graph 提供者配置测试（无需模型文件）"""
+
+    def test_with_cuda_graph_enables_option_for_cuda_only(self):
+        """测试仅为 CUDA 提供者追加 enable_cuda_graph，并保留已有选项"""
+        providers = [
+            ("CUDAExecutionProvider", {"device_id": "0"}),
+            "CPUExecutionProvider",
+        ]
+
+        result = ONNXInferenceEngine._with_cuda_graph(providers)
+
+        assert result == [
+            (
+                "CUDAExecutionProvider",
+                {"device_id": "0", "enable_cuda_graph": "1"},
+            ),
+            "CPUExecutionProvider",
+        ]
+        # 原始配置不被修改
+        assert providers[0][1] == {"device_id": "0"}
+
+
+class TestNMSBackends:
+    """NMS 各实现一致性测试（无需模型文件）"""
+
+    def test_backends_agree_on_random_boxes(self):
+        """测试 OpenCV / 逐对循环 / NumPy 三种 NMS 实现结果一致（含零面积框）"""
+        from vision_analysis_pro.core.inference import onnx_engine
+
+        rng = np.random.default_rng(0)
+        xy = rng.uniform(0, 600, (200, 2))
+        wh = rng.uniform(0, 120, (200, 2))
+        wh[::7] = 0  # 零面积框
+        boxes = np.clip(np.hstack([xy, xy + wh]), 0, 640).astype(np.float32)
+        scores = rng.uniform(0.3, 1.0, 200).astype(np.float32)
+
+        areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+
+        results = [
+            impl(boxes, scores, areas, 0.45).tolist()
+            for impl in (
+                onnx_engine._nms_cv2,
+                onnx_engine._nms_greedy,
+                onnx_engine._nms_numpy,
+            )
+        ]
+
+        assert results[0] == results[1] == results[2]
+
+
+class TestPreprocessBackends:
+    """预处理通道重排/归一化实现一致性测试（无需模型文件）"""
+
+    def test_loop_matches_numpy(self):
+        """测试逐像素循环（Numba 编译前的原函数）与 NumPy 实现结果一致"""
+        from vision_analysis_pro.core.inference import onnx_engine
+
+        src = np.random.default_rng(0).integers(0, 256, (6, 5, 3), dtype=np.uint8)
+        expected = np.empty((3, 6, 5), dtype=np.float32)
+        actual = np.empty((3, 6, 5), dtype=np.float32)
+
+        onnx_engine._bgr_to_chw_numpy(src, expected)
+        onnx_engine._bgr_to_chw_loop(src, actual)
+
+        np.testing.assert_array_equal(actual, expected)
+        np.testing.assert_array_equal(
+            expected, src[:, :, ::-1].transpose(2, 0, 1) / np.float32(255.0)
+        )
@@ -183,3 +183,16 @@ class TestDrawDetections:
         nparr = np.frombuffer(result_bytes, np.uint8)
         img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
         assert img is not None
+
+    def test_label_background_outside_image_leaves_frame_untouched(self):
+        """测试标签背景完全位于图像外时不影响画面其余区域"""
+        image_bytes = _create_test_image()
+        detections = [
+            {"label": "crack", "confidence": 0.95, "bbox": [-100, -50, -10, -5]},
+        ]
+
+        result_bytes = draw_detections(image_bytes, detections)
+
+        img = cv2.imdecode(np.frombuffer(result_bytes, np.uint8), cv2.IMREAD_COLOR)
+        # 灰色背景保持不变（允许 JPEG 压缩误差）
+        assert np.abs(img[100:, 100:].astype(int) - 128).max() <= 3